@@ -17,11 +17,86 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing - bcrypt cost factor (run calibrate_bcrypt.py to pick one)
+    BCRYPT_ROUNDS: int = 12
+    
     # Thomson Reuters GPT API
     TR_GPT_TOKEN: str = ""
+    OPEN_ARENA_BASE_URL: str = "https://aiopenarena.gcs.int.thomsonreuters.com"
+    
+    # Open Arena token validation cache
+    TOKEN_VALIDATION_TTL_SECONDS: float = 300.0
+    TOKEN_VALIDATION_ERROR_TTL_SECONDS: float = 15.0
+    TOKEN_VALIDATION_REFRESH_SECONDS: float = 60.0
+    TOKEN_VALIDATION_IDLE_SECONDS: float = 1800.0
     
     # Google AI API (Gemini) - same pattern as TR_GPT_TOKEN
     GOOGLE_AI_API: str = ""
+    GEMINI_API_ENDPOINT: str = ""  # Override the Gemini REST endpoint (e.g. benchmarks/fake_llm_server.py)
+    GEMINI_MAX_CONCURRENCY: int = 4
+    GEMINI_TIMEOUT_SECONDS: float = 90.0
+    
+    # Provider rate limits (token bucket: requests per minute + burst)
+    OPEN_ARENA_RATE_PER_MINUTE: float = 20.0
+    OPEN_ARENA_RATE_BURST: int = 3
+    GEMINI_RATE_PER_MINUTE: float = 10.0
+    GEMINI_RATE_BURST: int = 2
+    
+    # Circuit breakers and retries for upstream calls (Open Arena, Gemini, Google OAuth)
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_RECOVERY_SECONDS: float = 30.0
+    BREAKER_HALF_OPEN_MAX_CALLS: int = 1
+    RETRY_MAX_ATTEMPTS: int = 3
+    RETRY_BUDGET_PER_REQUEST: int = 2
+    RETRY_BASE_DELAY_SECONDS: float = 0.5
+    RETRY_MAX_DELAY_SECONDS: float = 8.0
+    
+    # Provider routing for model "auto" (rolling window per provider)
+    LLM_ROUTER_WINDOW: int = 50
+    LLM_ROUTER_MIN_SAMPLES: int = 5
+    LLM_ROUTER_MAX_ERROR_RATE: float = 0.5
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = 30.0
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 2.0
+    
+    # Sectioned generation (outline + parallel sections) for long posts
+    SECTIONED_TARGET_WORDS: int = 2000
+    SECTIONED_MAX_SECTIONS: int = 8
+    SECTIONED_CONCURRENCY: int = 4
+    SECTIONED_SECTION_ATTEMPTS: int = 3  # For empty output only; transport errors use RETRY_MAX_ATTEMPTS
+    
+    # Near-duplicate detection (MinHash/LSH over posts)
+    DUPLICATE_NUM_PERM: int = 128
+    DUPLICATE_BANDS: int = 32
+    DUPLICATE_THRESHOLD: float = 0.5  # Draft content vs post content
+    DUPLICATE_IDEA_THRESHOLD: float = 0.4  # Idea/title vs post titles
+    DUPLICATE_SYNC_SECONDS: float = 30.0  # Rebuild when another worker changed the posts
+    
+    # Batch generation
+    AI_BATCH_MAX_ITEMS: int = 20
+    AI_BATCH_CONCURRENCY: int = 4
+    
+    # Image URL validation for generated posts
+    IMAGE_CHECK_TIMEOUT_SECONDS: float = 4.0
+    IMAGE_CHECK_DEADLINE_SECONDS: float = 6.0
+    IMAGE_CHECK_OK_TTL_SECONDS: float = 3600.0
+    IMAGE_CHECK_NEGATIVE_TTL_SECONDS: float = 600.0
+    IMAGE_HOST_BREAKER_THRESHOLD: int = 2
+    IMAGE_CHECK_CACHE_MAX_URLS: int = 5000
+    IMAGE_HOST_BREAKER_MAX_HOSTS: int = 500
+    
+    # Generation result cache
+    GENERATION_CACHE_TTL_SECONDS: float = 86400.0
+    GENERATION_CACHE_MAX_ENTRIES: int = 200
+    GENERATION_CACHE_MAX_BYTES: int = 20_000_000
+    
+    # Background AI jobs
+    AI_JOB_WORKERS: int = 2
+    AI_JOB_LEASE_SECONDS: float = 60.0
+    AI_JOB_MAX_ATTEMPTS: int = 2
+    AI_JOB_POLL_SECONDS: float = 2.0
+    AI_JOB_RETRY_BASE_SECONDS: float = 10.0  # Backoff before a failed job is retried (doubles per attempt)
+    AI_JOB_RETRY_MAX_SECONDS: float = 300.0
     
     # CORS - accepts comma-separated string from .env
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:3000"]
@@ -31,8 +106,60 @@ class Settings(BaseSettings):
     SMTP_PORT: int = 587
     SMTP_USER: str = ""
     SMTP_PASSWORD: str = ""
+    SMTP_USE_TLS: bool = True  # STARTTLS after connecting (disable for a local SMTP sink)
     FRONTEND_URL: str = "http://localhost:5174"
     
+    # Email outbox (background SMTP sender)
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5.0  # Idle poll interval; enqueue wakes the local worker immediately
+    EMAIL_MAX_ATTEMPTS: int = 5  # Then the message is dead-lettered
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    EMAIL_LEASE_SECONDS: int = 120  # A claimed message is requeued if not finished by then
+    EMAIL_SMTP_TIMEOUT_SECONDS: float = 30.0
+    EMAIL_SMTP_IDLE_SECONDS: float = 60.0  # Close the SMTP session after this long without mail
+    EMAIL_SENT_RETENTION_DAYS: int = 7  # Sent messages are removed by a TTL index
+    EMAIL_SMTP_CONNECTIONS: int = 2  # Sender workers per process, each with its own SMTP session
+    EMAIL_SEND_RATE_PER_MINUTE: float = 600.0  # Per process; keep under the SMTP provider's limit (0 = unlimited)
+    EMAIL_SEND_BURST: int = 20
+    
+    # Portfolio cache (other workers pick up edits within this interval)
+    PORTFOLIO_CACHE_CHECK_SECONDS: float = 2.0
+    
+    # Newsletter fan-out
+    NEWSLETTER_BATCH_SIZE: int = 500  # Subscribers rendered and queued per insert_many
+    NEWSLETTER_POLL_SECONDS: float = 30.0
+    NEWSLETTER_LEASE_SECONDS: int = 120
+    
+    # Static snapshots of the public portfolio/posts payloads
+    SNAPSHOT_ENABLED: bool = True
+    SNAPSHOT_DIR: str = "snapshots"  # Share between workers (same host) so one build serves all
+    SNAPSHOT_PAGE_SIZE: int = 10  # Page size of the prebuilt first page of GET /api/posts
+    SNAPSHOT_DEBOUNCE_SECONDS: float = 1.0
+    SNAPSHOT_RETRY_SECONDS: float = 30.0
+    SNAPSHOT_GRACE_SECONDS: float = 300.0  # Unreferenced files are kept this long for lagging workers
+    SNAPSHOT_REBUILD_GZIP_LEVEL: int = 6  # Write-triggered rebuilds; the startup build uses 9
+    SNAPSHOT_REBUILD_BROTLI_QUALITY: int = 5  # Write-triggered rebuilds; the startup build uses 11
+    SNAPSHOT_VIEWS_REFRESH_SECONDS: float = 60.0  # How stale view counts in post snapshots may get
+    SNAPSHOT_MAX_AGE_SECONDS: int = 60
+    SNAPSHOT_STALE_SECONDS: int = 86400
+    VIEW_FLUSH_SECONDS: float = 5.0  # Post views are buffered and written in bulk
+    HOME_CACHE_TTL_SECONDS: float = 30.0  # In-process /api/home bundle; bounds staleness from other workers' writes
+    
+    # Response compression (br/zstd/gzip)
+    COMPRESSION_MINIMUM_SIZE: int = 1000  # Smaller bodies are sent uncompressed
+    COMPRESSION_CACHE_MAX_MB: int = 32  # Compressed bodies kept per process, keyed by ETag or body hash
+    COMPRESSION_CPU_BUSY: float = 0.5  # Process CPU share above which lower levels are used
+    COMPRESSION_CPU_OVERLOADED: float = 0.8  # ... and above which the fastest level is used
+    
+    # Outbound HTTP client (shared pool for AI, OAuth and image checks)
+    HTTP_CLIENT_HTTP2: bool = True
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CLIENT_MAX_PER_HOST: int = 20
+    HTTP_CLIENT_MAX_HOSTS: int = 256  # Per-host semaphores and counters kept
+    HTTP_CLIENT_DEFAULT_TIMEOUT: float = 10.0
+    
     # OAuth Configuration
     OAUTH_CLIENT_ID: str = ""
     OAUTH_CLIENT_SECRET: str = ""
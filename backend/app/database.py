@@ -58,6 +58,8 @@ async def create_indexes():
     await posts_collection.create_index("tags")
     await posts_collection.create_index([("title", "text"), ("excerpt", "text")])  # Text search index
     await posts_collection.create_index([("published", 1), ("created_at", -1)])  # Compound index for common query
+    await posts_collection.create_index("source_job_id", sparse=True)  # Job that generated an AI post
+    await posts_collection.create_index("updated_at")  # Duplicate index change detection
     
     # Users collection indexes
     users_collection = db["users"]
@@ -68,6 +70,39 @@ async def create_indexes():
     portfolio_collection = db["portfolio"]
     # Portfolio typically has one document, but we can add indexes if needed
     
+    # Background jobs collection indexes
+    jobs_collection = db["jobs"]
+    await jobs_collection.create_index([("status", 1), ("created_at", 1), ("next_attempt_at", 1)])  # Claiming the oldest due job
+    await jobs_collection.create_index([("status", 1), ("lease_expires_at", 1)])  # Recovering stale jobs
+    await jobs_collection.create_index(
+        "idempotency_key",
+        unique=True,
+        partialFilterExpression={"idempotency_key": {"$type": "string"}}
+    )
+    
+    # Email outbox indexes
+    outbox_collection = db[EMAIL_OUTBOX_COLLECTION]
+    await outbox_collection.create_index([("status", 1), ("priority", 1), ("next_attempt_at", 1)])  # Claiming due messages
+    await outbox_collection.create_index([("status", 1), ("lease_expires_at", 1)])  # Recovering stale sends
+    await outbox_collection.create_index(
+        "sent_at",
+        expireAfterSeconds=settings.EMAIL_SENT_RETENTION_DAYS * 86400  # Dead letters have no sent_at and are kept
+    )
+    await outbox_collection.create_index(
+        [("campaign_id", 1), ("to", 1)],
+        unique=True,  # A resumed fan-out never queues the same newsletter twice
+        partialFilterExpression={"campaign_id": {"$type": "objectId"}}
+    )
+    
+    # Newsletter indexes
+    subscribers_collection = db[SUBSCRIBERS_COLLECTION]
+    await subscribers_collection.create_index("email", unique=True)
+    await subscribers_collection.create_index("unsubscribe_token", unique=True)
+    await subscribers_collection.create_index([("status", 1), ("_id", 1)])  # Fan-out walks active subscribers
+    campaigns_collection = db[CAMPAIGNS_COLLECTION]
+    await campaigns_collection.create_index("post_id", unique=True)  # One announcement per post
+    await campaigns_collection.create_index([("status", 1), ("created_at", 1)])
+    
     print("✅ Database indexes created")
 
 
@@ -88,4 +123,8 @@ def get_database() -> AsyncIOMotorDatabase:
 USERS_COLLECTION = "users"
 POSTS_COLLECTION = "posts"
 PORTFOLIO_COLLECTION = "portfolio"
+JOBS_COLLECTION = "jobs"
+EMAIL_OUTBOX_COLLECTION = "email_outbox"
+SUBSCRIBERS_COLLECTION = "subscribers"
+CAMPAIGNS_COLLECTION = "newsletter_campaigns"
 
@@ -1,12 +1,22 @@
 """FastAPI application entry point"""
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 
 from .config import settings
 from .database import connect_to_mongo, close_mongo_connection
-from .routes import auth, posts, portfolio, ai_blog, token_management
+from .middleware.compression import CompressionMiddleware
+from .middleware.retry_budget import RetryBudgetMiddleware
+from .services.http_client import http_client
+from .services.token_validation import token_validator
+from .services.job_queue import job_queue
+from .services.duplicate_index import duplicate_index
+from .services.email_outbox import email_outbox
+from .services.newsletter import newsletter_service
+from .services.portfolio_cache import portfolio_cache
+from .services.snapshot import snapshot_store
+from .services.view_counter import view_counter
+from .routes import auth, posts, portfolio, ai_blog, token_management, metrics, newsletter, snapshots, home
 
 
 @asynccontextmanager
@@ -14,8 +24,26 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     await connect_to_mongo()
+    await http_client.start()
+    await token_validator.start()
+    await duplicate_index.start()
+    await portfolio_cache.start()
+    await view_counter.start()
+    await snapshot_store.start()
+    await job_queue.start()
+    await email_outbox.start()
+    await newsletter_service.start()
     yield
     # Shutdown
+    await newsletter_service.stop()
+    await email_outbox.stop()
+    await job_queue.stop()
+    await snapshot_store.stop()
+    await view_counter.stop()
+    await portfolio_cache.stop()
+    await duplicate_index.stop()
+    await token_validator.stop()
+    await http_client.close()
     await close_mongo_connection()
 
 
@@ -30,8 +58,11 @@ app = FastAPI(
     redoc_url="/redoc" if settings.DEBUG else None,
 )
 
-# Add compression middleware for faster responses
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Add compression middleware for faster responses (br/zstd/gzip, compressed bodies cached)
+app.add_middleware(CompressionMiddleware)
+
+# One upstream retry budget per request
+app.add_middleware(RetryBudgetMiddleware)
 
 # Add CORS middleware
 # Get allowed origins from settings
@@ -71,6 +102,10 @@ app.include_router(posts.router, prefix="/api/posts", tags=["Blog Posts"])
 app.include_router(portfolio.router, prefix="/api/portfolio", tags=["Portfolio"])
 app.include_router(ai_blog.router, prefix="/api/ai", tags=["AI Blog Generation"])
 app.include_router(token_management.router, prefix="/api/token", tags=["Token Management"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
+app.include_router(newsletter.router, prefix="/api/newsletter", tags=["Newsletter"])
+app.include_router(snapshots.router, prefix="/api/snapshots", tags=["Snapshots"])
+app.include_router(home.router, prefix="/api/home", tags=["Home"])
 
 
 @app.get("/")
@@ -0,0 +1,260 @@
+"""Response compression with br/zstd/gzip negotiation and a compressed-bytes cache"""
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ..config import settings
+
+try:
+    import brotli
+except ImportError:  # br is then not offered
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstd is then not offered
+    zstandard = None
+
+# Server preference when the client rates several encodings equally
+PREFERENCE = ("br", "zstd", "gzip")
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+# Compression level per CPU tier: (idle, busy, overloaded)
+LEVELS = {
+    "br": (5, 4, 1),
+    "zstd": (9, 3, 1),
+    "gzip": (6, 4, 1),
+}
+
+
+def available_encodings() -> Tuple[str, ...]:
+    return tuple(
+        name for name in PREFERENCE
+        if name == "gzip" or (name == "br" and brotli is not None) or (name == "zstd" and zstandard is not None)
+    )
+
+
+def negotiate(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """Best encoding from an Accept-Encoding header, honouring q-values (None = send identity)"""
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        qualities[token] = quality
+    
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for name in available:
+        quality = qualities.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def compress(encoding: str, data: bytes, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class ResponseCompressor:
+    """
+    Compresses response bodies and caches the results
+    
+    The cache is keyed by (path, ETag, encoding), or by a hash of the body
+    for responses without an ETag, and bounded by total compressed size.
+    The level drops when this process is busy: CPU use is sampled once a
+    second from time.process_time().
+    """
+    
+    def __init__(self, minimum_size: Optional[int] = None, cache_max_bytes: Optional[int] = None):
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+        self.cache_max_bytes = (
+            settings.COMPRESSION_CACHE_MAX_MB * 1024 * 1024 if cache_max_bytes is None else cache_max_bytes
+        )
+        self.available = available_encodings()
+        self._cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._sampled_at = time.monotonic()
+        self._sampled_cpu = time.process_time()
+        self.utilization = 0.0
+        self._counters = {
+            "compressed": 0, "cache_hits": 0, "skipped": 0,
+            "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0,
+        }
+        self._by_encoding = {name: 0 for name in self.available}
+    
+    def tier(self) -> int:
+        """0 = idle, 1 = busy, 2 = overloaded"""
+        now = time.monotonic()
+        if now - self._sampled_at >= 1.0:
+            cpu = time.process_time()
+            self.utilization = (cpu - self._sampled_cpu) / (now - self._sampled_at)
+            self._sampled_at, self._sampled_cpu = now, cpu
+        if self.utilization >= settings.COMPRESSION_CPU_OVERLOADED:
+            return 2
+        if self.utilization >= settings.COMPRESSION_CPU_BUSY:
+            return 1
+        return 0
+    
+    def should_compress(self, headers: List[Tuple[bytes, bytes]]) -> bool:
+        content_type = b""
+        for name, value in headers:
+            name = name.lower()
+            if name in (b"content-encoding", b"content-range"):
+                return False  # Already encoded (e.g. snapshot files) or a partial response
+            if name == b"content-type":
+                content_type = value.lower()
+        content_type = content_type.decode("latin-1")
+        if content_type.startswith("text/event-stream"):
+            return False  # Streamed events must not be buffered
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+    
+    def compress_body(self, path: str, encoding: str, body: bytes, etag: Optional[bytes], cacheable: bool) -> bytes:
+        key = None
+        if cacheable and self.cache_max_bytes > 0:
+            tag = etag or hashlib.blake2b(body, digest_size=16).digest()
+            key = (path, tag, encoding)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._counters["cache_hits"] += 1
+                return cached
+        
+        started = time.process_time()
+        compressed = compress(encoding, body, LEVELS[encoding][self.tier()])
+        self._counters["cpu_seconds"] += time.process_time() - started
+        self._counters["compressed"] += 1
+        self._counters["bytes_in"] += len(body)
+        self._counters["bytes_out"] += len(compressed)
+        self._by_encoding[encoding] += 1
+        
+        if key is not None and len(compressed) <= self.cache_max_bytes // 8:
+            self._cache[key] = compressed
+            self._cache_bytes += len(compressed)
+            while self._cache_bytes > self.cache_max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+        return compressed
+    
+    def skipped(self):
+        """Count a compressible response sent as is (streaming or below minimum_size)"""
+        self._counters["skipped"] += 1
+    
+    def get_stats(self) -> Dict:
+        return {
+            "encodings": list(self.available),
+            "cpu_utilization": round(self.utilization, 3),
+            "tier": self.tier(),
+            "cache_entries": len(self._cache),
+            "cache_bytes": self._cache_bytes,
+            "by_encoding": dict(self._by_encoding),
+            **{key: round(value, 4) if isinstance(value, float) else value for key, value in self._counters.items()},
+        }
+
+
+# Singleton instance
+response_compressor = ResponseCompressor()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware replacing GZipMiddleware
+    
+    Buffers complete (non-streaming) responses of compressible types at
+    least minimum_size long and sends them in the client's preferred
+    encoding. Streaming bodies, text/event-stream and responses that already
+    carry a Content-Encoding pass through untouched.
+    """
+    
+    def __init__(self, app, compressor: Optional[ResponseCompressor] = None):
+        self.app = app
+        self.compressor = compressor or response_compressor
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate(accept_encoding, self.compressor.available)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        compressor = self.compressor
+        start_message = None
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                if compressor.should_compress(message.get("headers", [])):
+                    start_message = message  # Held until the body shows whether to compress
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            passthrough = True  # Only the first body message is ever rewritten
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < compressor.minimum_size:
+                compressor.skipped()
+                await send(start_message)
+                await send(message)
+                return
+            
+            headers = start_message.get("headers", [])
+            etag = None
+            cacheable = scope["method"] == "GET" and start_message["status"] == 200
+            for name, value in headers:
+                name = name.lower()
+                if name == b"etag":
+                    etag = value
+                elif name == b"cache-control" and (b"no-store" in value or b"private" in value):
+                    cacheable = False
+            
+            path = scope["path"] + ("?" + scope["query_string"].decode("latin-1") if scope.get("query_string") else "")
+            compressed = compressor.compress_body(path, encoding, body, etag, cacheable)
+            if len(compressed) >= len(body):
+                await send(start_message)
+                await send(message)
+                return
+            
+            vary = [value for name, value in headers if name.lower() == b"vary"]
+            new_headers = [
+                (name, value) for name, value in headers
+                if name.lower() not in (b"content-length", b"vary")
+            ]
+            if not any(b"accept-encoding" in value.lower() for value in vary):
+                vary.append(b"Accept-Encoding")
+            new_headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", b", ".join(vary)),
+            ]
+            await send({**start_message, "headers": new_headers})
+            await send({**message, "body": compressed})
+        
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,19 @@
+"""Per-request retry budget"""
+from ..utils.resilience import start_retry_budget
+
+
+class RetryBudgetMiddleware:
+    """
+    Start one retry budget per HTTP request
+    
+    Pure ASGI, so the endpoint runs in the same task and every task it
+    spawns (hedged providers, section gathers, image checks) shares it.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            start_retry_budget()
+        await self.app(scope, receive, send)
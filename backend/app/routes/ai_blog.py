@@ -1,15 +1,22 @@
 """AI blog generation routes"""
-from fastapi import APIRouter, HTTPException, Depends, status
-from pydantic import BaseModel
-from typing import Optional, Literal
+from fastapi import APIRouter, HTTPException, Depends, status, Header, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, Literal, List
+import asyncio
 
-from ..services.ai_service import ai_blog_generator, gemini_blog_generator, validate_token
+from ..services.ai_service import ai_blog_generator, gemini_blog_generator, parse_blog_response
+from ..services.blog_pipeline import (
+    generate_blog, resolve_providers, publish_generated_post, publish_generated_posts
+)
+from ..services.job_queue import job_queue, serialize_job
+from ..services.generation_cache import generation_cache
+from ..services.duplicate_index import duplicate_index
 from ..middleware.auth_middleware import get_current_admin_user
 from ..schemas.auth import TokenData
-from ..database import get_database, USERS_COLLECTION
-from datetime import datetime
-import re
-from bson import ObjectId
+from ..utils.llm_json import StreamingFieldParser, sse_event
+from ..config import settings
+import sys
 
 router = APIRouter()
 
@@ -17,7 +24,23 @@ router = APIRouter()
 class AIBlogRequest(BaseModel):
     """AI blog generation request"""
     idea: str
-    model: Literal["gpt", "gemini"] = "gpt"  # Default to GPT for backward compatibility
+    model: Literal["gpt", "gemini", "auto"] = "gpt"  # Default to GPT for backward compatibility
+    force_refresh: bool = False  # Bypass the generation cache
+    mode: Literal["single", "sectioned"] = "single"  # "sectioned" writes long posts section by section
+    duplicate_policy: Literal["ignore", "warn", "refuse"] = "warn"  # Checked before publishing endpoints call the LLM
+
+
+class AIBatchItem(BaseModel):
+    """One idea in a batch generation request"""
+    idea: str
+    model: Literal["gpt", "gemini", "auto"] = "gpt"
+    mode: Literal["single", "sectioned"] = "single"
+
+
+class AIBatchRequest(BaseModel):
+    """Batch AI generation request"""
+    items: List[AIBatchItem] = Field(..., min_length=1)
+    force_refresh: bool = False
 
 
 class AIBlogResponse(BaseModel):
@@ -31,22 +54,6 @@ class AIBlogResponse(BaseModel):
     error: Optional[str] = None
 
 
-def create_slug(title: str) -> str:
-    """Create URL-friendly slug from title"""
-    slug = title.lower()
-    slug = re.sub(r'[^\w\s-]', '', slug)
-    slug = re.sub(r'[-\s]+', '-', slug)
-    return slug[:100]
-
-
-async def get_user_token(user_id: str) -> Optional[str]:
-    """Get user's saved Open Arena token from database"""
-    db = get_database()
-    users_collection = db[USERS_COLLECTION]
-    user = await users_collection.find_one({"_id": ObjectId(user_id)})
-    return user.get("tr_gpt_token") if user else None
-
-
 @router.post("/generate", response_model=AIBlogResponse)
 async def generate_blog_post(
     request: AIBlogRequest,
@@ -58,29 +65,17 @@ async def generate_blog_post(
     - **idea**: The topic or concept for the blog post
     """
     try:
-        # Get user's token
-        token = await get_user_token(current_user.user_id)
-        
-        if not token:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No Open Arena token found. Please add your ESSO token in the admin panel."
-            )
+        # Generate blog post using AI (Open Arena GPT, served from cache when possible)
+        result = await generate_blog(
+            request.idea, "gpt", current_user.user_id, force_refresh=request.force_refresh, mode=request.mode
+        )
         
-        # Validate token before use
-        validation = await validate_token(token)
-        if not validation.get("valid"):
+        if not result.get("success"):
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Your token is expired or invalid. Please update it. Error: {validation.get('error')}"
+                status_code=result.get("status_code", 500),
+                detail=result.get("error", "Failed to generate blog post")
             )
         
-        # Generate blog post using AI
-        result = await ai_blog_generator.generate_blog_post(request.idea, token)
-        
-        if not result.get("success"):
-            raise HTTPException(status_code=500, detail=result.get("error", "Failed to generate blog post"))
-        
         return AIBlogResponse(
             success=True,
             title=result.get("title"),
@@ -89,11 +84,30 @@ async def generate_blog_post(
             tags=result.get("tags"),
             category=result.get("category")
         )
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _check_duplicate_idea(request: AIBlogRequest) -> list:
+    """Apply the request's duplicate_policy to its idea; returns matches to warn about"""
+    if request.duplicate_policy == "ignore":
+        return []
+    
+    matches = duplicate_index.check(request.idea)
+    if matches and request.duplicate_policy == "refuse":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "This idea looks like a near-duplicate of an existing post",
+                "matches": matches
+            }
+        )
+    return matches
+
+
 @router.post("/generate-and-post")
 async def generate_and_post_blog(
     request: AIBlogRequest,
@@ -103,129 +117,29 @@ async def generate_and_post_blog(
     Generate a blog post using AI and automatically post it
     
     - **idea**: The topic or concept for the blog post
-    - **model**: AI model to use ("gpt" or "gemini")
+    - **model**: AI model to use ("gpt", "gemini" or "auto")
+    - **mode**: "single" (default) or "sectioned" for long posts
+    - **duplicate_policy**: "warn" (default), "refuse" (409 before calling the LLM) or "ignore"
     """
+    duplicates = _check_duplicate_idea(request)
+    
     try:
-        import traceback
-        import sys
-        
-        # If using Gemini
-        if request.model == "gemini":
-            if not gemini_blog_generator:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="Gemini AI is not configured. Please set GOOGLE_AI_API environment variable."
-                )
-            
-            # Generate blog post with Gemini (no token needed)
-            try:
-                print(f"🔵 DEBUG: Calling Gemini generator with idea: {request.idea[:100]}", file=sys.stderr)
-                result = await gemini_blog_generator.generate_blog_post(request.idea)
-                print(f"🟢 DEBUG: Gemini result keys: {list(result.keys())}", file=sys.stderr)
-                print(f"🟢 DEBUG: Result success: {result.get('success')}", file=sys.stderr)
-                if result.get('success'):
-                    print(f"🟢 DEBUG: Title: {result.get('title', 'N/A')}", file=sys.stderr)
-                    print(f"🟢 DEBUG: Content length: {len(result.get('content', ''))}", file=sys.stderr)
-                    print(f"🟢 DEBUG: Content preview (first 200): {result.get('content', '')[:200]}", file=sys.stderr)
-            except Exception as e:
-                print(f"ERROR in Gemini generation: {str(e)}", file=sys.stderr)
-                traceback.print_exc()
-                raise HTTPException(status_code=500, detail=f"Gemini error: {str(e)}")
-        else:
-            # Using GPT - requires token
-            token = await get_user_token(current_user.user_id)
-            
-            if not token:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="No Open Arena token found. Please add your ESSO token in the admin panel or use Gemini model."
-                )
-            
-            # Validate token before use
-            validation = await validate_token(token)
-            if not validation.get("valid"):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail=f"Your token is expired or invalid. Please update it or use Gemini model. Error: {validation.get('error')}"
-                )
-            
-            # Generate blog post with GPT
-            try:
-                result = await ai_blog_generator.generate_blog_post(request.idea, token)
-            except Exception as e:
-                print(f"ERROR in GPT generation: {str(e)}", file=sys.stderr)
-                traceback.print_exc()
-                raise HTTPException(status_code=500, detail=f"GPT error: {str(e)}")
+        print(f"🔵 DEBUG: Generating with {request.model}, idea: {request.idea[:100]}", file=sys.stderr)
+        result = await generate_blog(
+            request.idea, request.model, current_user.user_id, force_refresh=request.force_refresh, mode=request.mode
+        )
         
         if not result.get("success"):
             print(f"🔴 DEBUG: Generation failed: {result.get('error')}", file=sys.stderr)
-            raise HTTPException(status_code=500, detail=result.get("error", "Failed to generate blog post"))
+            raise HTTPException(
+                status_code=result.get("status_code", 500),
+                detail=result.get("error", "Failed to generate blog post")
+            )
         
         # Create the blog post in database
-        db = get_database()
-        posts_collection = db["posts"]
-        
-        # Calculate read time (rough estimate: 200 words per minute)
-        word_count = len(result.get("content", "").split())
-        read_time = max(1, word_count // 200)
-        
-        print(f"📊 DEBUG: Word count: {word_count}, Read time: {read_time} min", file=sys.stderr)
-        
-        # Handle tags - can be string or list
-        tags_data = result.get("tags", [])
-        if isinstance(tags_data, str):
-            tags = [tag.strip() for tag in tags_data.split(",") if tag.strip()]
-        elif isinstance(tags_data, list):
-            tags = [str(tag).strip() for tag in tags_data if str(tag).strip()]
-        else:
-            tags = []
-        
-        # Handle images - can be string or list
-        images_data = result.get("images", [])
-        if isinstance(images_data, str):
-            images = [img.strip() for img in images_data.split(",") if img.strip()]
-        elif isinstance(images_data, list):
-            images = [str(img).strip() for img in images_data if str(img).strip()]
-        else:
-            images = []
-        
-        # Add model tag to identify which AI generated it
-        model_used = result.get("model", request.model)
-        tags.append(f"Generated by {model_used}")
-        
-        post_data = {
-            "title": result.get("title"),
-            "slug": create_slug(result.get("title", "untitled")),
-            "excerpt": result.get("excerpt"),
-            "content": result.get("content"),
-            "author": "Yohans Bekele",
-            "author_id": None,
-            "featured_image": result.get("featured_image", None),
-            "images": images,
-            "tags": tags,
-            "category": result.get("category", "general"),
-            "published": True,
-            "views": 0,
-            "read_time": read_time,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
-        
-        # Insert the post
-        inserted = await posts_collection.insert_one(post_data)
-        
-        print(f"✅ DEBUG: Post created with ID: {inserted.inserted_id}", file=sys.stderr)
-        print(f"✅ DEBUG: Post slug: {post_data['slug']}", file=sys.stderr)
-        print(f"✅ DEBUG: Post content length in DB: {len(post_data['content'])}", file=sys.stderr)
-        
-        return_data = {
-            "success": True,
-            "message": f"Blog post generated with {model_used.upper()} and published successfully!",
-            "post_id": str(inserted.inserted_id),
-            "slug": post_data["slug"],
-            "title": post_data["title"],
-            "model": model_used
-        }
+        return_data = await publish_generated_post(result, request.model)
+        if duplicates:
+            return_data["duplicate_warning"] = duplicates
         
         print(f"📤 DEBUG: Returning to frontend:", return_data, file=sys.stderr)
         
@@ -235,8 +149,250 @@ async def generate_and_post_blog(
         raise
     except Exception as e:
         import traceback
-        import sys
         print(f"ERROR in generate_and_post_blog: {str(e)}", file=sys.stderr)
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+
+async def _open_generation_stream(request: AIBlogRequest, current_user: TokenData):
+    """Resolve the provider up front so configuration/token errors are normal HTTP errors"""
+    if request.mode != "single":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sectioned generation is not available for streaming; use /generate-and-post or /jobs"
+        )
+    
+    if not request.force_refresh:
+        cached = generation_cache.get(request.idea, request.model)
+        if cached:
+            return None, None, cached
+    
+    # "auto" streams from the top-ranked usable provider (no hedging mid-stream)
+    providers, error = await resolve_providers(request.model, current_user.user_id)
+    if error:
+        raise HTTPException(status_code=error["status_code"], detail=error["error"])
+    
+    provider = providers[0]
+    if provider["provider"] == "gemini":
+        return gemini_blog_generator.stream_blog_post(request.idea), gemini_blog_generator.model_name, None
+    model_name = "gpt" if request.model == "auto" else None
+    return ai_blog_generator.stream_blog_post(request.idea, provider["token"]), model_name, None
+
+
+async def _generation_events(
+    request: AIBlogRequest,
+    stream,
+    model_name,
+    cached,
+    publish: bool,
+    duplicates: Optional[list] = None
+):
+    """
+    Relay model output as SSE events (a cached result skips straight to 'result')
+    
+    - duplicates: similar existing posts (sent first, when there are any)
+    - token: raw text as it arrives from the model
+    - content: decoded markdown of the "content" field, parsed incrementally
+    - result: final structured title/excerpt/tags/... once generation ends
+    - post: the published post (generate-and-post only)
+    - error: generation or publishing failed
+    """
+    parser = StreamingFieldParser("content")
+    chunks = []
+    
+    if duplicates:
+        yield sse_event("duplicates", {"matches": duplicates})
+    
+    try:
+        if cached:
+            result = cached
+            result["cached"] = True
+        else:
+            async for text in stream:
+                chunks.append(text)
+                yield sse_event("token", {"text": text})
+                content_delta = parser.feed(text)
+                if content_delta:
+                    yield sse_event("content", {"text": content_delta})
+            
+            ai_response = "".join(chunks)
+            if not ai_response:
+                yield sse_event("error", {"detail": "No response from AI"})
+                return
+            
+            result = await parse_blog_response(ai_response, request.idea, model_name)
+            generation_cache.set(request.idea, request.model, result)
+        
+        yield sse_event("result", {k: v for k, v in result.items() if k != "success"})
+        
+        if publish:
+            yield sse_event("post", await publish_generated_post(result, request.model))
+    except Exception as e:
+        print(f"ERROR in streaming generation: {str(e)}", file=sys.stderr)
+        yield sse_event("error", {"detail": str(e)})
+    
+    yield sse_event("done")
+
+
+def _sse_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+        }
+    )
+
+
+@router.post("/generate/stream")
+async def generate_blog_post_stream(
+    request: AIBlogRequest,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """
+    Generate a blog post and stream it as Server-Sent Events
+    
+    - **idea**: The topic or concept for the blog post
+    - **model**: AI model to use ("gpt", "gemini" or "auto")
+    """
+    stream, model_name, cached = await _open_generation_stream(request, current_user)
+    return _sse_response(_generation_events(request, stream, model_name, cached, publish=False))
+
+
+@router.post("/generate-and-post/stream")
+async def generate_and_post_blog_stream(
+    request: AIBlogRequest,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """
+    Generate a blog post, stream it as Server-Sent Events, then publish it
+    
+    - **idea**: The topic or concept for the blog post
+    - **model**: AI model to use ("gpt", "gemini" or "auto")
+    - **duplicate_policy**: "warn" (default), "refuse" or "ignore"
+    """
+    duplicates = _check_duplicate_idea(request)
+    stream, model_name, cached = await _open_generation_stream(request, current_user)
+    return _sse_response(
+        _generation_events(request, stream, model_name, cached, publish=True, duplicates=duplicates)
+    )
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_generate_and_post(
+    request: AIBlogRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """
+    Queue a generate-and-post job and return its id immediately
+    
+    - **idea**: The topic or concept for the blog post
+    - **model**: AI model to use ("gpt", "gemini" or "auto")
+    - **Idempotency-Key** header: retries with the same key return the original job
+    - **duplicate_policy**: "warn" (default), "refuse" or "ignore" - checked before queueing
+    """
+    duplicates = _check_duplicate_idea(request)
+    job = await job_queue.enqueue(
+        "generate_and_post",
+        {"idea": request.idea, "model": request.model, "force_refresh": request.force_refresh, "mode": request.mode},
+        current_user.user_id,
+        idempotency_key=idempotency_key
+    )
+    response = serialize_job(job)
+    if duplicates:
+        response["duplicate_warning"] = duplicates
+    return response
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Long-poll up to this many seconds for completion"),
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Get job status and result (optionally long-polling until it finishes)"""
+    job = await job_queue.wait(job_id, wait) if wait else await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return serialize_job(job)
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(
+    job_id: str,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Cancel a queued or running job"""
+    job = await job_queue.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return serialize_job(job)
+
+
+@router.post("/generate-batch")
+async def generate_and_post_batch(
+    request: AIBatchRequest,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """
+    Generate and publish several posts in one call
+    
+    - **items**: list of {idea, model}
+    - Generations run with bounded concurrency under per-provider rate limits
+    - Successful posts are inserted with a single insert_many
+    - Each item reports its own status; failures don't abort the batch
+    """
+    if len(request.items) > settings.AI_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can contain at most {settings.AI_BATCH_MAX_ITEMS} ideas"
+        )
+    
+    semaphore = asyncio.Semaphore(settings.AI_BATCH_CONCURRENCY)
+    
+    async def run(item: AIBatchItem) -> dict:
+        async with semaphore:
+            try:
+                return await generate_blog(
+                    item.idea, item.model, current_user.user_id, force_refresh=request.force_refresh, mode=item.mode
+                )
+            except Exception as e:
+                print(f"ERROR in batch generation: {str(e)}", file=sys.stderr)
+                return {"success": False, "error": str(e), "status_code": 500}
+    
+    results = await asyncio.gather(*(run(item) for item in request.items))
+    
+    # Publish everything that generated successfully in one round trip
+    generated = [idx for idx, result in enumerate(results) if result.get("success")]
+    published = await publish_generated_posts(
+        [(results[idx], request.items[idx].model) for idx in generated]
+    )
+    published_by_index = dict(zip(generated, published))
+    
+    items = []
+    for idx, (item, result) in enumerate(zip(request.items, results)):
+        entry = {"index": idx, "idea": item.idea, "model": item.model}
+        summary = published_by_index.get(idx)
+        if summary and summary.get("success"):
+            entry.update({
+                "status": "published",
+                "post_id": summary["post_id"],
+                "slug": summary["slug"],
+                "title": summary["title"],
+                "cached": bool(result.get("cached")),
+            })
+        else:
+            error = summary.get("error") if summary else result.get("error", "Failed to generate blog post")
+            entry.update({"status": "failed", "error": error})
+        items.append(entry)
+    
+    succeeded = sum(1 for entry in items if entry["status"] == "published")
+    return {
+        "success": succeeded > 0,
+        "total": len(items),
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded,
+        "items": items,
+    }
@@ -10,11 +10,14 @@ from ..database import get_database, USERS_COLLECTION
 from ..schemas.auth import UserCreate, UserLogin, Token, UserResponse, RefreshTokenRequest
 from ..utils.security import (
     get_password_hash, verify_password, create_access_token, create_refresh_token, 
-    decode_token, create_password_reset_token, verify_password_reset_token
+    decode_token, create_password_reset_token, verify_password_reset_token,
+    password_needs_rehash
 )
 from ..middleware.auth_middleware import get_current_user
 from ..schemas.auth import TokenData
 from ..services.email_service import email_service
+from ..services.http_client import http_client
+from ..utils.resilience import breakers, resilient_call, is_transient_response, CircuitOpenError
 from ..config import settings
 
 
@@ -102,6 +105,13 @@ async def login(credentials: UserLogin):
             detail="Invalid email or password"
         )
     
+    # Transparently upgrade/downgrade the hash if BCRYPT_ROUNDS changed
+    if password_needs_rehash(user["password"]):
+        await users_collection.update_one(
+            {"_id": user["_id"], "password": user["password"]},
+            {"$set": {"password": get_password_hash(credentials.password)}}
+        )
+    
     # Generate tokens
     token_data = {
         "sub": str(user["_id"]),
@@ -252,7 +262,7 @@ async def forgot_password(request: PasswordResetRequest):
     )
     
     # Send email
-    email_sent = email_service.send_password_reset_email(
+    email_sent = await email_service.send_password_reset_email(
         to_email=user["email"],
         reset_token=reset_token,
         username=user["username"]
@@ -319,7 +329,7 @@ async def reset_password(request: PasswordReset):
     )
     
     # Send confirmation email
-    email_service.send_password_changed_email(
+    await email_service.send_password_changed_email(
         to_email=user["email"],
         username=user["username"]
     )
@@ -380,7 +390,7 @@ async def change_password(
     )
     
     # Send confirmation email
-    email_service.send_password_changed_email(
+    await email_service.send_password_changed_email(
         to_email=user["email"],
         username=user["username"]
     )
@@ -421,10 +431,14 @@ async def oauth_google_callback(code: str = Query(...)):
     
     redirect_uri = settings.OAUTH_REDIRECT_URI or f"{settings.FRONTEND_URL}/oauth/callback"
     
+    google_breaker = breakers.get("google_oauth")
+    
     # Exchange code for tokens
     try:
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
+        # Authorization codes are single-use, so the exchange is never retried
+        token_response = await resilient_call(
+            google_breaker,
+            lambda: http_client.post(
                 "https://oauth2.googleapis.com/token",
                 data={
                     "code": code,
@@ -433,17 +447,31 @@ async def oauth_google_callback(code: str = Query(...)):
                     "redirect_uri": redirect_uri,
                     "grant_type": "authorization_code",
                 },
-            )
-            token_response.raise_for_status()
-            tokens = token_response.json()
-            
-            # Get user info
-            user_response = await client.get(
+                timeout=10.0,
+            ),
+            attempts=1,
+            retry_result=is_transient_response
+        )
+        token_response.raise_for_status()
+        tokens = token_response.json()
+        
+        # Get user info
+        user_response = await resilient_call(
+            google_breaker,
+            lambda: http_client.get(
                 "https://www.googleapis.com/oauth2/v2/userinfo",
                 headers={"Authorization": f"Bearer {tokens['access_token']}"},
-            )
-            user_response.raise_for_status()
-            google_user = user_response.json()
+                timeout=10.0,
+            ),
+            retry_result=is_transient_response
+        )
+        user_response.raise_for_status()
+        google_user = user_response.json()
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Google sign-in is temporarily unavailable: {e}"
+        )
     except httpx.HTTPStatusError as e:
         error_detail = "Failed to authenticate with Google"
         try:
@@ -0,0 +1,25 @@
+"""Home page bundle route"""
+from fastapi import APIRouter, Request, status
+from fastapi.responses import Response
+
+from ..schemas.home import HomeResponse
+from ..services.home import home_cache
+from ..services.snapshot import snapshot_store, snapshot_response
+from ..utils.serializers import json_response
+
+router = APIRouter()
+
+
+@router.get("", response_model=HomeResponse)
+async def get_home(request: Request):
+    """Portfolio, latest posts, tags and categories in one round trip"""
+    snapshot = snapshot_response(request, snapshot_store.lookup("home"))
+    if snapshot is not None:
+        return snapshot
+    
+    # No current snapshot (disabled, or content just changed): serve the in-process bundle
+    data, etag = await home_cache.get()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return json_response(data, headers=headers)
@@ -0,0 +1,124 @@
+"""Operational metrics routes (admin only)"""
+from fastapi import APIRouter, Depends
+
+from ..middleware.auth_middleware import get_current_admin_user
+from ..middleware.compression import response_compressor
+from ..schemas.auth import TokenData
+from ..services.http_client import http_client
+from ..services.token_validation import token_validator
+from ..services.job_queue import job_queue
+from ..services.generation_cache import generation_cache
+from ..services.image_check import image_checker
+from ..services.llm_router import llm_router
+from ..services.duplicate_index import duplicate_index
+from ..services.home import home_cache
+from ..services.email_outbox import email_outbox
+from ..services.portfolio_cache import portfolio_cache
+from ..services.snapshot import snapshot_store
+from ..services.view_counter import view_counter
+from ..utils.resilience import breakers
+
+router = APIRouter()
+
+
+@router.get("/http")
+async def get_http_client_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Connection reuse statistics for the shared outbound HTTP client"""
+    return http_client.get_stats()
+
+
+@router.get("/token-validation")
+async def get_token_validation_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Hit/miss counters for the Open Arena token validation cache"""
+    return token_validator.get_stats()
+
+
+@router.get("/jobs")
+async def get_job_queue_metrics(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Background job throughput, queue wait and current queue depth"""
+    return {
+        **job_queue.get_metrics(),
+        "queue_depth": await job_queue.get_queue_depth(),
+    }
+
+
+@router.get("/generation-cache")
+async def get_generation_cache_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Hit/miss/eviction counters for the AI generation cache"""
+    return generation_cache.get_stats()
+
+
+@router.get("/image-checks")
+async def get_image_check_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Cache counters for image URL validation"""
+    return image_checker.get_stats()
+
+
+@router.get("/llm-router")
+async def get_llm_router_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Per-provider latency histograms, error rates and recent routing decisions"""
+    return llm_router.get_stats()
+
+
+@router.get("/circuit-breakers")
+async def get_circuit_breaker_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """State of the circuit breaker for each upstream service"""
+    return breakers.get_stats()
+
+
+@router.get("/duplicate-index")
+async def get_duplicate_index_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Size and build time of the near-duplicate index"""
+    return duplicate_index.get_stats()
+
+
+@router.get("/email-outbox")
+async def get_email_outbox_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Outbox depth by status and SMTP sender counters"""
+    return await email_outbox.get_stats()
+
+
+@router.get("/portfolio-cache")
+async def get_portfolio_cache_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Version and section sizes of the in-process portfolio cache"""
+    return portfolio_cache.get_stats()
+
+
+@router.get("/snapshots")
+async def get_snapshot_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Snapshot builds, hit rate, the in-process home bundle and buffered post views"""
+    return {
+        "snapshots": snapshot_store.get_stats(),
+        "home_cache": home_cache.get_stats(),
+        "views": view_counter.get_stats(),
+    }
+
+
+@router.get("/compression")
+async def get_compression_stats(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Compression ratio, CPU time, cache hits and current level tier"""
+    return response_compressor.get_stats()
@@ -0,0 +1,76 @@
+"""Newsletter subscription and campaign routes"""
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from bson import ObjectId
+from pydantic import BaseModel, EmailStr
+
+from ..middleware.auth_middleware import get_current_admin_user
+from ..schemas.auth import TokenData
+from ..services.newsletter import newsletter_service
+
+router = APIRouter()
+
+
+class SubscribeRequest(BaseModel):
+    """Newsletter signup"""
+    email: EmailStr
+
+
+class UnsubscribeRequest(BaseModel):
+    """Token from the unsubscribe link in every newsletter"""
+    token: str
+
+
+@router.post("/subscribe")
+async def subscribe(request: SubscribeRequest):
+    """Subscribe an email address to new-post announcements"""
+    await newsletter_service.subscribe(request.email)
+    return {"message": "Subscribed to new posts"}
+
+
+@router.post("/unsubscribe")
+async def unsubscribe(request: UnsubscribeRequest):
+    """Unsubscribe using the token from a newsletter link"""
+    if not await newsletter_service.unsubscribe(request.token):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invalid unsubscribe link"
+        )
+    return {"message": "Unsubscribed"}
+
+
+@router.get("/subscribers")
+async def get_subscriber_counts(
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Subscriber counts by status (admin only)"""
+    return await newsletter_service.get_subscriber_counts()
+
+
+@router.get("/campaigns")
+async def list_campaigns(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Most recent new-post campaigns (admin only)"""
+    return await newsletter_service.list_campaigns(limit)
+
+
+@router.get("/campaigns/{campaign_id}")
+async def get_campaign(
+    campaign_id: str,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Fan-out and delivery progress of one campaign (admin only)"""
+    if not ObjectId.is_valid(campaign_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid campaign ID"
+        )
+    
+    campaign = await newsletter_service.get_campaign(campaign_id)
+    if campaign is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campaign not found"
+        )
+    return campaign
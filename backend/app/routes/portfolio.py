@@ -1,6 +1,9 @@
 """Portfolio routes"""
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi.responses import Response
+from typing import List, Optional
+from pydantic import ValidationError
+from pymongo import ReturnDocument
 
 from ..database import get_database, PORTFOLIO_COLLECTION
 from ..schemas.portfolio import (
@@ -10,119 +13,71 @@ from ..schemas.portfolio import (
     ProjectResponse,
     ExperienceResponse,
     PortfolioUpdate,
-    PersonalInfoUpdate
+    PersonalInfoUpdate,
+    SkillCategoryUpdate,
+    SkillCategoryPatch,
+    ProjectUpdate,
+    ProjectPatch,
+    ExperienceUpdate,
+    ExperiencePatch
 )
 from ..middleware.auth_middleware import get_current_admin_user
 from ..schemas.auth import TokenData
+from ..services.portfolio_cache import portfolio_cache
+from ..services.snapshot import snapshot_store, snapshot_response
+from ..utils.portfolio import (
+    normalize_project,
+    normalize_portfolio,
+    ensure_item_id,
+    ITEM_SECTIONS,
+    PORTFOLIO_SCHEMA_VERSION,
+)
 
 
 router = APIRouter()
 
 
-@router.get("", response_model=PortfolioResponse)
-async def get_portfolio():
-    """Get complete portfolio data"""
-    db = get_database()
-    portfolio_collection = db[PORTFOLIO_COLLECTION]
-    
-    portfolio = await portfolio_collection.find_one({})
-    
-    if not portfolio:
+def _cached_json(data: Optional[bytes]) -> Response:
+    """Serve a pre-serialized portfolio section"""
+    if data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Portfolio data not found"
         )
-    
-    # Ensure projects have images array for backward compatibility
-    if "projects" in portfolio:
-        for project in portfolio["projects"]:
-            # Initialize images array if it doesn't exist
-            if "images" not in project:
-                project["images"] = []
-            
-            # If images array is empty but image field exists, use it
-            if (not project["images"] or len(project["images"]) == 0) and "image" in project and project["image"]:
-                project["images"] = [project["image"]]
-            
-            # Filter out empty/null images
-            if project["images"]:
-                project["images"] = [img for img in project["images"] if img and str(img).strip()]
-            
-            # Ensure image field exists for backward compatibility (use first image)
-            if project.get("images") and len(project["images"]) > 0:
-                project["image"] = project["images"][0]
-            elif "image" not in project:
-                project["image"] = None
-    
-    return PortfolioResponse(**portfolio)
+    return Response(content=data, media_type="application/json")
+
+
+@router.get("", response_model=PortfolioResponse)
+async def get_portfolio(request: Request):
+    """Get complete portfolio data"""
+    snapshot = snapshot_response(request, snapshot_store.lookup("portfolio"))
+    if snapshot is not None:
+        return snapshot
+    return _cached_json(await portfolio_cache.get("full"))
 
 
 @router.get("/info", response_model=PersonalInfoResponse)
 async def get_personal_info():
     """Get personal information"""
-    db = get_database()
-    portfolio_collection = db[PORTFOLIO_COLLECTION]
-    
-    portfolio = await portfolio_collection.find_one({})
-    
-    if not portfolio:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Portfolio data not found"
-        )
-    
-    return PersonalInfoResponse(**portfolio["personal_info"])
+    return _cached_json(await portfolio_cache.get("info"))
 
 
 @router.get("/skills", response_model=List[SkillCategoryResponse])
 async def get_skills():
     """Get all skills"""
-    db = get_database()
-    portfolio_collection = db[PORTFOLIO_COLLECTION]
-    
-    portfolio = await portfolio_collection.find_one({})
-    
-    if not portfolio:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Portfolio data not found"
-        )
-    
-    return [SkillCategoryResponse(**skill) for skill in portfolio["skills"]]
+    return _cached_json(await portfolio_cache.get("skills"))
 
 
 @router.get("/projects", response_model=List[ProjectResponse])
 async def get_projects():
     """Get all projects"""
-    db = get_database()
-    portfolio_collection = db[PORTFOLIO_COLLECTION]
-    
-    portfolio = await portfolio_collection.find_one({})
-    
-    if not portfolio:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Portfolio data not found"
-        )
-    
-    return [ProjectResponse(**project) for project in portfolio["projects"]]
+    return _cached_json(await portfolio_cache.get("projects"))
 
 
 @router.get("/experience", response_model=List[ExperienceResponse])
 async def get_experience():
     """Get work experience"""
-    db = get_database()
-    portfolio_collection = db[PORTFOLIO_COLLECTION]
-    
-    portfolio = await portfolio_collection.find_one({})
-    
-    if not portfolio:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Portfolio data not found"
-        )
-    
-    return [ExperienceResponse(**exp) for exp in portfolio["experience"]]
+    return _cached_json(await portfolio_cache.get("experience"))
 
 
 @router.put("", response_model=PortfolioResponse)
@@ -131,54 +86,41 @@ async def update_portfolio(
     current_user: TokenData = Depends(get_current_admin_user)
 ):
     """Update portfolio data (admin only)"""
-    db = get_database()
-    portfolio_collection = db[PORTFOLIO_COLLECTION]
-    
-    portfolio = await portfolio_collection.find_one({})
-    
-    if not portfolio:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Portfolio data not found"
-        )
-    
     # Update fields if provided
     update_dict = {}
     
     if update_data.personal_info:
-        personal_info = portfolio.get("personal_info", {})
-        personal_info.update({k: v for k, v in update_data.personal_info.model_dump(exclude_none=True).items()})
-        update_dict["personal_info"] = personal_info
+        for key, value in update_data.personal_info.model_dump(exclude_none=True).items():
+            update_dict[f"personal_info.{key}"] = value
     
     if update_data.skills:
-        update_dict["skills"] = [skill.model_dump() for skill in update_data.skills]
+        update_dict["skills"] = [ensure_item_id(skill.model_dump()) for skill in update_data.skills]
     
     if update_data.projects:
-        # Ensure each project has images array and image field for backward compatibility
-        projects_data = []
-        for project in update_data.projects:
-            project_dict = project.model_dump()
-            # If images array is provided, use it; otherwise keep existing or use image field
-            if not project_dict.get("images") and project_dict.get("image"):
-                project_dict["images"] = [project_dict["image"]]
-            # Ensure image field is set from first image for backward compatibility
-            if project_dict.get("images") and len(project_dict["images"]) > 0:
-                project_dict["image"] = project_dict["images"][0]
-            projects_data.append(project_dict)
-        update_dict["projects"] = projects_data
+        # Store canonical images/image fields so reads need no fix-ups
+        update_dict["projects"] = [
+            ensure_item_id(normalize_project(project.model_dump())) for project in update_data.projects
+        ]
     
     if update_data.experience:
-        update_dict["experience"] = [exp.model_dump() for exp in update_data.experience]
+        update_dict["experience"] = [ensure_item_id(exp.model_dump()) for exp in update_data.experience]
+    
+    if any(section in update_dict for section in ITEM_SECTIONS):
+        # The sections are written in the current shape - stamp it in the same $set,
+        # bringing any section this request leaves alone up to date as well
+        db = get_database()
+        current = await db[PORTFOLIO_COLLECTION].find_one({}, [*ITEM_SECTIONS, "schema_version"])
+        if current and current.get("schema_version", 0) < PORTFOLIO_SCHEMA_VERSION:
+            normalized = normalize_portfolio(current)
+            for section in ITEM_SECTIONS:
+                update_dict.setdefault(section, normalized[section])
+        update_dict["schema_version"] = PORTFOLIO_SCHEMA_VERSION
     
     if update_dict:
-        await portfolio_collection.update_one(
-            {"_id": portfolio["_id"]},
-            {"$set": update_dict}
-        )
+        await _update_portfolio_document({}, {"$set": update_dict})
     
     # Return updated portfolio
-    updated = await portfolio_collection.find_one({"_id": portfolio["_id"]})
-    return PortfolioResponse(**updated)
+    return _cached_json(await portfolio_cache.get("full"))
 
 
 @router.put("/info", response_model=PersonalInfoResponse)
@@ -187,24 +129,199 @@ async def update_personal_info(
     current_user: TokenData = Depends(get_current_admin_user)
 ):
     """Update personal information (admin only)"""
+    changes = {f"personal_info.{k}": v for k, v in update_data.model_dump(exclude_none=True).items()}
+    if not changes:
+        return _cached_json(await portfolio_cache.get("info"))
+    
+    updated = await _update_portfolio_document({}, {"$set": changes})
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio data not found"
+        )
+    
+    return PersonalInfoResponse(**updated["personal_info"])
+
+
+async def _update_portfolio_document(query: dict, update: dict) -> Optional[dict]:
+    """
+    Apply one atomic update to the portfolio document and refresh the cache
+    
+    Returns:
+        The updated document, or None if no portfolio document matched
+    """
     db = get_database()
     portfolio_collection = db[PORTFOLIO_COLLECTION]
     
-    portfolio = await portfolio_collection.find_one({})
-    
-    if not portfolio:
+    update.setdefault("$inc", {})["cache_version"] = 1
+    updated = await portfolio_collection.find_one_and_update(
+        query,
+        update,
+        return_document=ReturnDocument.AFTER
+    )
+    if not updated:
+        return None
+    portfolio_cache.load(updated)
+    snapshot_store.schedule()
+    return updated
+
+
+def _find_item(portfolio: dict, section: str, item_id: str) -> Optional[dict]:
+    return next((item for item in portfolio.get(section) or [] if item.get("id") == item_id), None)
+
+
+async def _create_item(section: str, item: dict) -> dict:
+    """Append a new entry to a portfolio array with $push"""
+    ensure_item_id(item)
+    updated = await _update_portfolio_document({}, {"$push": {section: item}})
+    if not updated:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Portfolio data not found"
         )
+    return _find_item(updated, section, item["id"])
+
+
+async def _patch_item(section: str, item_id: str, changes: dict, model) -> dict:
+    """Update fields of one entry in place with the positional $ operator"""
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
+        )
     
-    personal_info = portfolio.get("personal_info", {})
-    personal_info.update({k: v for k, v in update_data.model_dump(exclude_none=True).items()})
+    # Validate the merged entry before writing: a stored portfolio that no longer
+    # validates would break every portfolio read and the snapshot build
+    db = get_database()
+    current = await db[PORTFOLIO_COLLECTION].find_one({f"{section}.id": item_id}, {f"{section}.$": 1})
+    if not current:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found"
+        )
+    try:
+        model(**{**current[section][0], **changes})
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_context=False, include_input=False)
+        )
     
-    await portfolio_collection.update_one(
-        {"_id": portfolio["_id"]},
-        {"$set": {"personal_info": personal_info}}
+    updated = await _update_portfolio_document(
+        {f"{section}.id": item_id},
+        {"$set": {f"{section}.$.{key}": value for key, value in changes.items()}}
     )
-    
-    return PersonalInfoResponse(**personal_info)
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found"
+        )
+    return _find_item(updated, section, item_id)
+
 
+async def _delete_item(section: str, item_id: str):
+    """Remove one entry with $pull"""
+    updated = await _update_portfolio_document(
+        {f"{section}.id": item_id},
+        {"$pull": {section: {"id": item_id}}}
+    )
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found"
+        )
+
+
+@router.post("/skills", response_model=SkillCategoryResponse, status_code=status.HTTP_201_CREATED)
+async def create_skill_category(
+    skill: SkillCategoryUpdate,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Add a skill category (admin only)"""
+    return await _create_item("skills", skill.model_dump(exclude={"id"}))
+
+
+@router.patch("/skills/{item_id}", response_model=SkillCategoryResponse)
+async def update_skill_category(
+    item_id: str,
+    changes: SkillCategoryPatch,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Update one skill category (admin only)"""
+    return await _patch_item("skills", item_id, changes.model_dump(exclude_unset=True), SkillCategoryResponse)
+
+
+@router.delete("/skills/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_skill_category(
+    item_id: str,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Delete one skill category (admin only)"""
+    await _delete_item("skills", item_id)
+    return None
+
+
+@router.post("/projects", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
+async def create_project(
+    project: ProjectUpdate,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Add a project (admin only)"""
+    return await _create_item("projects", normalize_project(project.model_dump(exclude={"id"})))
+
+
+@router.patch("/projects/{item_id}", response_model=ProjectResponse)
+async def update_project(
+    item_id: str,
+    changes: ProjectPatch,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Update one project (admin only)"""
+    project_changes = changes.model_dump(exclude_unset=True)
+    if "images" in project_changes or "image" in project_changes:
+        # Keep images/image canonical; image alone replaces the image list
+        images = normalize_project({
+            "images": project_changes.pop("images", None),
+            "image": project_changes.pop("image", None),
+        })
+        project_changes.update(images)
+    return await _patch_item("projects", item_id, project_changes, ProjectResponse)
+
+
+@router.delete("/projects/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_project(
+    item_id: str,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Delete one project (admin only)"""
+    await _delete_item("projects", item_id)
+    return None
+
+
+@router.post("/experience", response_model=ExperienceResponse, status_code=status.HTTP_201_CREATED)
+async def create_experience(
+    experience: ExperienceUpdate,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Add a work experience entry (admin only)"""
+    return await _create_item("experience", experience.model_dump(exclude={"id"}))
+
+
+@router.patch("/experience/{item_id}", response_model=ExperienceResponse)
+async def update_experience(
+    item_id: str,
+    changes: ExperiencePatch,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Update one work experience entry (admin only)"""
+    return await _patch_item("experience", item_id, changes.model_dump(exclude_unset=True), ExperienceResponse)
+
+
+@router.delete("/experience/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_experience(
+    item_id: str,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """Delete one work experience entry (admin only)"""
+    await _delete_item("experience", item_id)
+    return None
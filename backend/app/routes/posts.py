@@ -1,15 +1,23 @@
 """Blog posts routes"""
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
-import math
+from pydantic import BaseModel, Field
 
+from ..config import settings
 from ..database import get_database, POSTS_COLLECTION
-from ..schemas.post import PostCreate, PostUpdate, PostResponse, PostListItem, PostsListResponse
+from ..schemas.post import PostCreate, PostUpdate, PostResponse, PostsListResponse
 from ..middleware.auth_middleware import get_current_admin_user, get_optional_user
 from ..schemas.auth import TokenData
 from ..utils.slugify import slugify, calculate_read_time
+from ..services.duplicate_index import duplicate_index
+from ..services.newsletter import newsletter_service
+from ..services.home import home_cache
+from ..services.snapshot import snapshot_store, snapshot_response, post_key
+from ..services.view_counter import view_counter
+from ..utils.posts import LIST_PROJECTION, post_response
+from ..utils.serializers import dumps, json_response, dump_posts_list, dump_post
 
 
 router = APIRouter()
@@ -17,6 +25,7 @@ router = APIRouter()
 
 @router.get("", response_model=PostsListResponse)
 async def get_posts(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=50),
     published_only: bool = Query(True),
@@ -56,65 +65,39 @@ async def get_posts(
             {"excerpt": {"$regex": search, "$options": "i"}}
         ]
     
+    # The default landing page is served from the prebuilt snapshot
+    if query == {"published": True} and page == 1 and page_size == settings.SNAPSHOT_PAGE_SIZE:
+        snapshot = snapshot_response(request, snapshot_store.lookup("posts"))
+        if snapshot is not None:
+            return snapshot
+    
     # Get total count
     total = await posts_collection.count_documents(query)
     
     # Calculate pagination
     skip = (page - 1) * page_size
-    total_pages = math.ceil(total / page_size)
     
     # Get posts with projection to only fetch needed fields (faster queries)
-    projection = {
-        "_id": 1,
-        "title": 1,
-        "slug": 1,
-        "excerpt": 1,
-        "author": 1,
-        "featured_image": 1,
-        "tags": 1,
-        "category": 1,
-        "published": 1,
-        "views": 1,
-        "read_time": 1,
-        "created_at": 1
-    }
-    cursor = posts_collection.find(query, projection).sort("created_at", -1).skip(skip).limit(page_size)
+    cursor = posts_collection.find(query, LIST_PROJECTION).sort("created_at", -1).skip(skip).limit(page_size)
     posts = await cursor.to_list(length=page_size)
     
-    # Format response
-    post_items = [
-        PostListItem(
-            _id=str(post["_id"]),
-            title=post["title"],
-            slug=post["slug"],
-            excerpt=post["excerpt"],
-            author=post["author"],
-            featured_image=post.get("featured_image"),
-            tags=post["tags"],
-            category=post["category"],
-            published=post["published"],
-            views=post["views"],
-            read_time=post["read_time"],
-            created_at=post["created_at"].isoformat()
-        )
-        for post in posts
-    ]
-    
-    return PostsListResponse(
-        posts=post_items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    return json_response(dump_posts_list(posts, total, page, page_size))
 
 
 @router.get("/{slug}", response_model=PostResponse)
 async def get_post_by_slug(
     slug: str,
+    request: Request,
     current_user: Optional[TokenData] = Depends(get_optional_user)
 ):
     """Get single blog post by slug"""
+    # Published posts come from the snapshot (views refreshed every SNAPSHOT_VIEWS_REFRESH_SECONDS)
+    entry = snapshot_store.lookup(post_key(slug))
+    snapshot = snapshot_response(request, entry)
+    if snapshot is not None:
+        view_counter.record(entry["post_id"])
+        return snapshot
+    
     db = get_database()
     posts_collection = db[POSTS_COLLECTION]
     
@@ -133,28 +116,10 @@ async def get_post_by_slug(
             detail="Post not found"
         )
     
-    # Increment view count
-    await posts_collection.update_one(
-        {"_id": post["_id"]},
-        {"$inc": {"views": 1}}
-    )
+    # Increment view count (buffered, written in bulk)
+    view_counter.record(post["_id"])
     
-    return PostResponse(
-        _id=str(post["_id"]),
-        title=post["title"],
-        slug=post["slug"],
-        excerpt=post["excerpt"],
-        content=post["content"],
-        author=post["author"],
-        featured_image=post.get("featured_image"),
-        tags=post["tags"],
-        category=post["category"],
-        published=post["published"],
-        views=post["views"] + 1,
-        read_time=post["read_time"],
-        created_at=post["created_at"].isoformat(),
-        updated_at=post["updated_at"].isoformat()
-    )
+    return json_response(dump_post(post, views=post["views"] + 1))
 
 
 @router.post("", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
@@ -201,24 +166,13 @@ async def create_post(
     }
     
     result = await posts_collection.insert_one(post_dict)
+    duplicate_index.add(post_dict)
+    await newsletter_service.announce_post(post_dict)
+    home_cache.invalidate()
+    snapshot_store.schedule()
     post_dict["_id"] = str(result.inserted_id)
     
-    return PostResponse(
-        _id=post_dict["_id"],
-        title=post_dict["title"],
-        slug=post_dict["slug"],
-        excerpt=post_dict["excerpt"],
-        content=post_dict["content"],
-        author=post_dict["author"],
-        featured_image=post_dict["featured_image"],
-        tags=post_dict["tags"],
-        category=post_dict["category"],
-        published=post_dict["published"],
-        views=post_dict["views"],
-        read_time=post_dict["read_time"],
-        created_at=post_dict["created_at"].isoformat(),
-        updated_at=post_dict["updated_at"].isoformat()
-    )
+    return post_response(post_dict)
 
 
 @router.put("/{slug}", response_model=PostResponse)
@@ -280,23 +234,11 @@ async def update_post(
     
     # Get updated post
     updated_post = await posts_collection.find_one({"_id": post["_id"]})
+    duplicate_index.add(updated_post)
+    home_cache.invalidate()
+    snapshot_store.schedule()
     
-    return PostResponse(
-        _id=str(updated_post["_id"]),
-        title=updated_post["title"],
-        slug=updated_post["slug"],
-        excerpt=updated_post["excerpt"],
-        content=updated_post["content"],
-        author=updated_post["author"],
-        featured_image=updated_post.get("featured_image"),
-        tags=updated_post["tags"],
-        category=updated_post["category"],
-        published=updated_post["published"],
-        views=updated_post["views"],
-        read_time=updated_post["read_time"],
-        created_at=updated_post["created_at"].isoformat(),
-        updated_at=updated_post["updated_at"].isoformat()
-    )
+    return post_response(updated_post)
 
 
 @router.delete("/{slug}", status_code=status.HTTP_204_NO_CONTENT)
@@ -308,17 +250,46 @@ async def delete_post(
     db = get_database()
     posts_collection = db[POSTS_COLLECTION]
     
-    result = await posts_collection.delete_one({"slug": slug})
+    post = await posts_collection.find_one_and_delete({"slug": slug}, {"_id": 1})
     
-    if result.deleted_count == 0:
+    if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
     
+    duplicate_index.remove(post["_id"])
+    home_cache.invalidate()
+    snapshot_store.schedule()
     return None
 
 
+class DuplicateCheckRequest(BaseModel):
+    """Candidate idea or draft to check against existing posts"""
+    text: str = Field(..., min_length=1)
+    title: Optional[str] = None
+    limit: int = Field(5, ge=1, le=20)
+
+
+@router.post("/duplicates/check")
+async def check_duplicates(
+    request: DuplicateCheckRequest,
+    current_user: TokenData = Depends(get_current_admin_user)
+):
+    """
+    Find existing posts similar to an idea or draft (admin only)
+    
+    - **text**: An idea (short text is compared with titles/excerpts) or full draft content
+    - **title**: Draft title, if any
+    """
+    matches = duplicate_index.check(request.text, title=request.title, limit=request.limit)
+    return {
+        "duplicate": bool(matches),
+        "matches": matches,
+        "index_ready": duplicate_index.ready,
+    }
+
+
 @router.get("/tags/all", response_model=List[str])
 async def get_all_tags():
     """Get all unique tags"""
@@ -326,7 +297,7 @@ async def get_all_tags():
     posts_collection = db[POSTS_COLLECTION]
     
     tags = await posts_collection.distinct("tags", {"published": True})
-    return sorted(tags)
+    return json_response(dumps(sorted(tags)))
 
 
 @router.get("/categories/all", response_model=List[str])
@@ -336,5 +307,5 @@ async def get_all_categories():
     posts_collection = db[POSTS_COLLECTION]
     
     categories = await posts_collection.distinct("category", {"published": True})
-    return sorted(categories)
+    return json_response(dumps(sorted(categories)))
 
@@ -0,0 +1,34 @@
+"""Static snapshot files (content-hashed, safe to cache forever)"""
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+
+from ..services.snapshot import snapshot_store, encoded_file_response
+
+router = APIRouter()
+
+
+@router.get("/manifest")
+async def get_manifest():
+    """Current snapshot URLs by key ("portfolio", "posts", "post:<slug>")"""
+    return JSONResponse(
+        content=snapshot_store.urls(),
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.get("/{file_name}")
+async def get_snapshot_file(file_name: str, request: Request):
+    """Serve one snapshot file; its name changes whenever its content does"""
+    files = snapshot_store.files_for(file_name)
+    response = None
+    if files is not None:
+        response = encoded_file_response(request, files, {
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "Vary": "Accept-Encoding",
+        })
+    if response is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Snapshot not found"
+        )
+    return response
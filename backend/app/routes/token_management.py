@@ -2,17 +2,15 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel
 from typing import Optional
-import httpx
 from datetime import datetime
 
 from ..middleware.auth_middleware import get_current_admin_user
 from ..schemas.auth import TokenData
 from ..database import get_database, USERS_COLLECTION
+from ..services.token_validation import token_validator
 
 router = APIRouter()
 
-TR_API_BASE = "https://aiopenarena.gcs.int.thomsonreuters.com"
-
 
 class TokenRequest(BaseModel):
     """Token save request"""
@@ -26,38 +24,6 @@ class TokenResponse(BaseModel):
     message: Optional[str] = None
 
 
-async def validate_token(token: str) -> dict:
-    """
-    Validate Open Arena ESSO token by calling GET /v1/user endpoint
-    
-    Returns:
-        dict with 'valid' (bool) and 'error' (str if invalid)
-    """
-    try:
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{TR_API_BASE}/v1/user",
-                headers=headers
-            )
-            
-            if response.status_code == 200:
-                return {"valid": True, "data": response.json()}
-            elif response.status_code == 401:
-                return {"valid": False, "error": "Token is expired or invalid"}
-            else:
-                return {"valid": False, "error": f"Token validation failed: {response.status_code}"}
-                
-    except httpx.TimeoutException:
-        return {"valid": False, "error": "Token validation request timed out"}
-    except Exception as e:
-        return {"valid": False, "error": f"Error validating token: {str(e)}"}
-
-
 @router.post("/save", response_model=TokenResponse)
 async def save_token(
     request: TokenRequest,
@@ -77,8 +43,8 @@ async def save_token(
     
     token = request.token.strip()
     
-    # Validate token first
-    validation_result = await validate_token(token)
+    # Validate token first (always against the API, then cached)
+    validation_result = await token_validator.validate(token, force=True)
     
     if not validation_result.get("valid"):
         raise HTTPException(
@@ -135,8 +101,8 @@ async def get_token_status(
     
     token = user.get("tr_gpt_token")
     
-    # Validate the token
-    validation_result = await validate_token(token)
+    # Validate the token (answered from memory while the cache is warm)
+    validation_result = await token_validator.validate(token)
     
     if validation_result.get("valid"):
         return TokenResponse(
@@ -163,6 +129,13 @@ async def remove_token(
     users_collection = db[USERS_COLLECTION]
     
     from bson import ObjectId
+    user = await users_collection.find_one(
+        {"_id": ObjectId(current_user.user_id)},
+        {"tr_gpt_token": 1}
+    )
+    if user and user.get("tr_gpt_token"):
+        token_validator.invalidate(user["tr_gpt_token"])
+    
     await users_collection.update_one(
         {"_id": ObjectId(current_user.user_id)},
         {
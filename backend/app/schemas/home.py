@@ -0,0 +1,14 @@
+"""Home page bundle schema"""
+from pydantic import BaseModel
+from typing import List, Optional
+
+from .portfolio import PortfolioResponse
+from .post import PostsListResponse
+
+
+class HomeResponse(BaseModel):
+    """Everything the home page needs in one response"""
+    portfolio: Optional[PortfolioResponse] = None
+    posts: PostsListResponse
+    tags: List[str]
+    categories: List[str]
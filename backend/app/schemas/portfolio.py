@@ -1,8 +1,15 @@
 """Portfolio schemas"""
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import List, Optional
 
 
+def _reject_null(value):
+    """Patch fields may be omitted, but required fields cannot be cleared with null"""
+    if value is None:
+        raise ValueError("Field cannot be null")
+    return value
+
+
 class PersonalInfoResponse(BaseModel):
     """Personal information response"""
     name: str
@@ -43,6 +50,7 @@ class SkillItemUpdate(BaseModel):
 
 class SkillCategoryResponse(BaseModel):
     """Skill category response"""
+    id: Optional[str] = None
     category: str
     icon: str
     skills: List[SkillItemResponse]
@@ -50,13 +58,24 @@ class SkillCategoryResponse(BaseModel):
 
 class SkillCategoryUpdate(BaseModel):
     """Skill category update"""
+    id: Optional[str] = None  # Omit for new categories
     category: str
     icon: str
     skills: List[SkillItemUpdate]
 
 
+class SkillCategoryPatch(BaseModel):
+    """Partial skill category update"""
+    category: Optional[str] = None
+    icon: Optional[str] = None
+    skills: Optional[List[SkillItemUpdate]] = None
+    
+    _not_null = field_validator("category", "icon", "skills")(_reject_null)
+
+
 class ProjectResponse(BaseModel):
     """Project response"""
+    id: Optional[str] = None
     title: str
     subtitle: str
     description: str
@@ -72,6 +91,7 @@ class ProjectResponse(BaseModel):
 
 class ProjectUpdate(BaseModel):
     """Project update"""
+    id: Optional[str] = None  # Omit for new projects
     title: str
     subtitle: str
     description: str
@@ -85,8 +105,26 @@ class ProjectUpdate(BaseModel):
     featured: Optional[bool] = False
 
 
+class ProjectPatch(BaseModel):
+    """Partial project update"""
+    title: Optional[str] = None
+    subtitle: Optional[str] = None
+    description: Optional[str] = None
+    image: Optional[str] = None
+    images: Optional[List[str]] = None
+    tech_stack: Optional[List[str]] = None
+    demo_url: Optional[str] = None
+    repo_url: Optional[str] = None
+    year: Optional[str] = None
+    impact: Optional[List[str]] = None
+    featured: Optional[bool] = None
+    
+    _not_null = field_validator("title", "subtitle", "description", "tech_stack", "year", "impact")(_reject_null)
+
+
 class ExperienceResponse(BaseModel):
     """Experience response"""
+    id: Optional[str] = None
     company: str
     role: str
     type: str
@@ -97,6 +135,35 @@ class ExperienceResponse(BaseModel):
     technologies: List[str]
 
 
+class ExperienceUpdate(BaseModel):
+    """Experience update"""
+    id: Optional[str] = None  # Omit for new entries
+    company: str
+    role: str
+    type: str
+    duration: str
+    location: str
+    description: str
+    achievements: List[str]
+    technologies: List[str]
+
+
+class ExperiencePatch(BaseModel):
+    """Partial experience update"""
+    company: Optional[str] = None
+    role: Optional[str] = None
+    type: Optional[str] = None
+    duration: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    achievements: Optional[List[str]] = None
+    technologies: Optional[List[str]] = None
+    
+    _not_null = field_validator(
+        "company", "role", "type", "duration", "location", "description", "achievements", "technologies"
+    )(_reject_null)
+
+
 class FooterInfo(BaseModel):
     """Footer information"""
     name: str
@@ -133,5 +200,5 @@ class PortfolioUpdate(BaseModel):
     personal_info: Optional[PersonalInfoUpdate] = None
     skills: Optional[List[SkillCategoryUpdate]] = None
     projects: Optional[List[ProjectUpdate]] = None
-    experience: Optional[List[ExperienceResponse]] = None
+    experience: Optional[List[ExperienceUpdate]] = None
     footer: Optional[FooterInfoUpdate] = None
@@ -1,19 +1,51 @@
 """AI Service for blog post generation"""
+import asyncio
 import httpx
 import google.generativeai as genai
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, AsyncIterator
 from ..config import settings
+from .http_client import http_client
+from .image_check import image_checker
+from ..utils.rate_limit import TokenBucket
+from ..utils.llm_json import extract_json_object
+from ..utils.resilience import breakers, resilient_call, is_transient_response, CircuitOpenError
 import sys
 
-TR_API_BASE = "https://aiopenarena.gcs.int.thomsonreuters.com"
+TR_API_BASE = settings.OPEN_ARENA_BASE_URL.rstrip("/")
+
+# Bump whenever the blog prompts change so cached generations are not reused
+PROMPT_TEMPLATE_VERSION = "2"
+
+# Per-provider request pacing (shared by every caller in this worker)
+provider_rate_limits = {
+    "gpt": TokenBucket(settings.OPEN_ARENA_RATE_PER_MINUTE, settings.OPEN_ARENA_RATE_BURST),
+    "gemini": TokenBucket(settings.GEMINI_RATE_PER_MINUTE, settings.GEMINI_RATE_BURST),
+}
+
+# Per-provider circuit breakers (fail fast while an upstream is down)
+provider_breakers = {
+    "gpt": breakers.get("open_arena"),
+    "gemini": breakers.get("gemini"),
+}
 
 # Configure Gemini API from settings
 GOOGLE_API_KEY = settings.GOOGLE_AI_API
 print(f"DEBUG: GOOGLE_API_KEY loaded = {bool(GOOGLE_API_KEY)}", file=sys.stderr)
 print(f"DEBUG: GOOGLE_API_KEY value (first 10 chars) = {GOOGLE_API_KEY[:10] if GOOGLE_API_KEY else 'EMPTY'}", file=sys.stderr)
 
+# A custom endpoint is spoken to over REST (the gRPC transport needs Google's hosts)
+GEMINI_USE_REST = bool(settings.GEMINI_API_ENDPOINT)
+
 if GOOGLE_API_KEY:
-    genai.configure(api_key=GOOGLE_API_KEY)
+    if GEMINI_USE_REST:
+        genai.configure(
+            api_key=GOOGLE_API_KEY,
+            transport="rest",
+            client_options={"api_endpoint": settings.GEMINI_API_ENDPOINT}
+        )
+        print(f"DEBUG: Gemini API endpoint overridden: {settings.GEMINI_API_ENDPOINT}", file=sys.stderr)
+    else:
+        genai.configure(api_key=GOOGLE_API_KEY)
     print("DEBUG: Gemini API configured successfully", file=sys.stderr)
 else:
     print("DEBUG: Gemini API NOT configured - key is empty", file=sys.stderr)
@@ -32,19 +64,21 @@ async def validate_token(token: str) -> Dict:
             "Content-Type": "application/json"
         }
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{TR_API_BASE}/v1/user",
-                headers=headers
-            )
-            
-            if response.status_code == 200:
-                return {"valid": True, "data": response.json()}
-            elif response.status_code == 401:
-                return {"valid": False, "error": "Token is expired or invalid"}
-            else:
-                return {"valid": False, "error": f"Token validation failed: {response.status_code}"}
+        response = await resilient_call(
+            provider_breakers["gpt"],
+            lambda: http_client.get(f"{TR_API_BASE}/v1/user", headers=headers, timeout=10.0),
+            retry_result=is_transient_response
+        )
+        
+        if response.status_code == 200:
+            return {"valid": True, "data": response.json()}
+        elif response.status_code == 401:
+            return {"valid": False, "error": "Token is expired or invalid"}
+        else:
+            return {"valid": False, "error": f"Token validation failed: {response.status_code}"}
                 
+    except CircuitOpenError as e:
+        return {"valid": False, "error": str(e), "unavailable": True}
     except httpx.TimeoutException:
         return {"valid": False, "error": "Token validation request timed out"}
     except Exception as e:
@@ -71,41 +105,28 @@ async def validate_and_fix_images(featured_image: Optional[str], images: List[st
         clean_query = query.replace(" ", "-").lower()[:50]
         return f"https://source.unsplash.com/{width}x{height}/?{clean_query}&sig={index}"
     
-    async def check_image_url(url: str) -> bool:
-        """Check if image URL is accessible"""
-        if not url:
-            return False
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.head(url, follow_redirects=True)
-                return response.status_code == 200
-        except:
-            return False
+    # Validate the featured image and all extra images concurrently
+    checks = await image_checker.check_many([featured_image or ""] + list(images))
+    featured_ok, images_ok = checks[0], checks[1:]
+    
+    import os
+    debug = os.getenv("DEBUG", "False").lower() == "true"
     
     # Validate featured image
     validated_featured = featured_image
-    if featured_image:
-        is_valid = await check_image_url(featured_image)
-        if not is_valid:
-            # Only log in debug mode
-            import os
-            if os.getenv("DEBUG", "False").lower() == "true":
-                print("⚠️ Featured image not accessible, generating fallback...")
-            validated_featured = generate_fallback_image(topic, 1200, 600, 0)
-    else:
-        # No featured image provided, generate one
+    if not featured_image or not featured_ok:
+        if featured_image and debug:
+            print("⚠️ Featured image not accessible, generating fallback...")
         validated_featured = generate_fallback_image(topic, 1200, 600, 0)
     
     # Validate additional images
     validated_images = []
-    for idx, img_url in enumerate(images):
-        is_valid = await check_image_url(img_url)
+    for idx, (img_url, is_valid) in enumerate(zip(images, images_ok)):
         if is_valid:
             validated_images.append(img_url)
         else:
             # Only log in debug mode
-            import os
-            if os.getenv("DEBUG", "False").lower() == "true":
+            if debug:
                 print(f"⚠️ Image {idx+1} not accessible, generating fallback...")
             validated_images.append(generate_fallback_image(topic, 800, 600, idx + 1))
     
@@ -119,29 +140,93 @@ async def validate_and_fix_images(featured_image: Optional[str], images: List[st
     return validated_featured, validated_images
 
 
+def _normalize_list(raw, default: List[str]) -> List[str]:
+    """Normalize a comma-separated string or list from the model into a clean list"""
+    if isinstance(raw, str):
+        return [item.strip() for item in raw.split(",") if item.strip()]
+    if isinstance(raw, list):
+        return [str(item).strip() for item in raw if str(item).strip()]
+    return list(default)
+
+
+async def parse_blog_response(ai_response: str, user_idea: str, model: Optional[str] = None) -> dict:
+    """
+    Turn raw model output into the structured blog result
+    
+    Args:
+        ai_response: Full text returned by the model
+        user_idea: The original idea (used for fallback title and images)
+        model: Model identifier to attach to the result (optional)
+        
+    Returns:
+        dict with success, title, excerpt, content, tags, category and images
+    """
+    try:
+        blog_data, repaired = extract_json_object(ai_response)
+        if repaired:
+            print(f"⚠️  Model output was truncated; recovered fields: {list(blog_data)}", file=sys.stderr)
+        
+        if not isinstance(blog_data, dict):
+            raise ValueError("Response JSON is not an object")
+        
+        # Handle tags and images - can be string, list, or missing
+        tags = _normalize_list(blog_data.get("tags", "AI Generated,Blog"), ["AI Generated", "Blog"])
+        images = _normalize_list(blog_data.get("images", []), [])
+        
+        # Validate and fix images
+        validated_featured, validated_images = await validate_and_fix_images(
+            blog_data.get("featured_image", None),
+            images,
+            user_idea
+        )
+        
+        result = {
+            "success": True,
+            "title": blog_data.get("title", "Untitled Blog Post"),
+            "excerpt": blog_data.get("excerpt", ""),
+            "content": blog_data.get("content", ai_response),
+            "tags": tags,
+            "category": blog_data.get("category", "general"),
+            "featured_image": validated_featured,
+            "images": validated_images
+        }
+    except ValueError as e:
+        print(f"DEBUG: Failed to parse JSON: {str(e)}", file=sys.stderr)
+        print(f"DEBUG: Response preview: {ai_response[:200]}...", file=sys.stderr)
+        
+        # Fallback: return raw response as content
+        excerpt = ai_response[:200] + "..." if len(ai_response) > 200 else ai_response
+        
+        # Generate fallback images
+        featured_image, images = await validate_and_fix_images(None, [], user_idea)
+        
+        result = {
+            "success": True,
+            "title": f"Blog Post: {user_idea[:50]}",
+            "excerpt": excerpt,
+            "content": ai_response,
+            "tags": ["AI Generated", "Blog"],
+            "category": "general",
+            "featured_image": featured_image,
+            "images": images
+        }
+    
+    if model:
+        result["model"] = model
+    return result
+
+
 class AIBlogGenerator:
     """Service to generate blog posts using Thomson Reuters GPT API"""
     
     def __init__(self):
-        self.api_url = "https://aiopenarena.gcs.int.thomsonreuters.com/v1/inference"
+        self.api_url = f"{TR_API_BASE}/v1/inference"
         self.workflow_id = "80f448d2-fd59-440f-ba24-ebc3014e1fdf"
+        self.model_key = "openai_gpt-4-turbo"
     
-    async def generate_blog_post(self, user_idea: str, token: str) -> dict:
-        """
-        Generate a blog post from user's idea
-        
-        Args:
-            user_idea: The topic or idea for the blog post
-            token: Open Arena ESSO token for authentication
-            
-        Returns:
-            dict with generated blog content
-        """
-        if not token:
-            raise ValueError("Open Arena ESSO token is required")
-        
-        # Create a detailed prompt for blog generation
-        prompt = f"""Write a blog post about: {user_idea}
+    def _build_prompt(self, user_idea: str) -> str:
+        """Create a detailed prompt for blog generation"""
+        return f"""Write a blog post about: {user_idea}
 
 WRITING STYLE:
 - Write like you're explaining to a friend over coffee ☕
@@ -188,7 +273,13 @@ Format as JSON:
 }}
 
 Write as Yohans (John) - a Software Engineer who loves tech but keeps it real."""
-
+    
+    def _build_request(self, user_idea: str, token: str, stream: bool = False) -> tuple:
+        """Build headers and payload for the Open Arena inference endpoint"""
+        return self._inference_request(self._build_prompt(user_idea), token, stream=stream)
+    
+    def _inference_request(self, query: str, token: str, max_tokens: int = 2000, stream: bool = False) -> tuple:
+        """Headers and payload for an arbitrary query to the blog workflow"""
         headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
@@ -197,109 +288,97 @@ Write as Yohans (John) - a Software Engineer who loves tech but keeps it real.""
         # According to Open Arena API documentation
         payload = {
             "workflow_id": self.workflow_id,
-            "query": prompt,
+            "query": query,
             "is_persistence_allowed": False,
             "modelparams": {
-                "openai_gpt-4-turbo": {
+                self.model_key: {
                     "system_prompt": "You are Yohans (John) Bekele, a Software Engineer who writes casual, personal tech blogs. Write like you're talking to a friend - conversational, short paragraphs, personal experiences, real opinions. Keep it SHORT (400-600 words max), engaging and easy to read. Use 'I', 'you', 'we'. No corporate jargon. Be human. Get to the point quickly.",
                     "temperature": "0.8",
-                    "max_tokens": "2000"
+                    "max_tokens": str(max_tokens)
                 }
             }
         }
+        if stream:
+            payload["stream"] = True
+        
+        return headers, payload
+    
+    def _extract_answer(self, data: dict) -> str:
+        """Extract the AI text from an Open Arena response: result.answer["openai_gpt-4-turbo"]"""
+        result = data.get("result", {}) or {}
+        answer = result.get("answer", {}) or {}
+        if isinstance(answer, dict):
+            return answer.get(self.model_key, "") or ""
+        return str(answer)
+    
+    async def _post_inference(self, headers: dict, payload: dict) -> str:
+        """POST to the inference endpoint (rate limited, behind the breaker) and return the answer text"""
+        async def attempt():
+            await provider_rate_limits["gpt"].acquire()
+            return await http_client.post(
+                self.api_url,
+                json=payload,
+                headers=headers,
+                timeout=120.0
+            )
+        
+        response = await resilient_call(
+            provider_breakers["gpt"],
+            attempt,
+            retry_result=is_transient_response,
+            retry_timeouts=False
+        )
+        response.raise_for_status()
+        return self._extract_answer(response.json())
+    
+    async def complete(self, prompt: str, token: str, json_output: bool = False, max_tokens: int = 2000) -> str:
+        """
+        Raw completion for a custom prompt (used by sectioned generation)
+        
+        Open Arena has no JSON mode, so json_output only documents intent; the
+        prompt itself must ask for JSON.
+        
+        Raises:
+            ValueError: if the model returns nothing
+        """
+        answer = await self._post_inference(*self._inference_request(prompt, token, max_tokens=max_tokens))
+        if not answer:
+            raise ValueError("No response from AI")
+        return answer
+    
+    async def generate_blog_post(self, user_idea: str, token: str) -> dict:
+        """
+        Generate a blog post from user's idea
+        
+        Args:
+            user_idea: The topic or idea for the blog post
+            token: Open Arena ESSO token for authentication
+            
+        Returns:
+            dict with generated blog content
+        """
+        if not token:
+            raise ValueError("Open Arena ESSO token is required")
+        
+        headers, payload = self._build_request(user_idea, token)
         
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    self.api_url,
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Extract the AI response from TR GPT API according to documentation
-                # Response structure: result.answer["openai_gpt-4-turbo"]
-                result = data.get("result", {})
-                answer = result.get("answer", {})
-                ai_response = answer.get("openai_gpt-4-turbo", "")
-                
-                if not ai_response:
-                    return {
-                        "success": False,
-                        "error": "No response from AI"
-                    }
-                
-                # Try to parse as JSON if it looks like JSON
-                import json
-                try:
-                    # Find JSON in the response
-                    if "{" in ai_response and "}" in ai_response:
-                        start = ai_response.find("{")
-                        end = ai_response.rfind("}") + 1
-                        json_str = ai_response[start:end]
-                        blog_data = json.loads(json_str)
-                        
-                        # Handle tags properly - can be string, list, or missing
-                        tags_raw = blog_data.get("tags", "AI Generated,Blog")
-                        if isinstance(tags_raw, str):
-                            tags = [t.strip() for t in tags_raw.split(",") if t.strip()]
-                        elif isinstance(tags_raw, list):
-                            tags = [str(t).strip() for t in tags_raw if str(t).strip()]
-                        else:
-                            tags = ["AI Generated", "Blog"]
-                        
-                        # Handle images - can be string, list, or missing
-                        images_raw = blog_data.get("images", [])
-                        if isinstance(images_raw, str):
-                            images = [img.strip() for img in images_raw.split(",") if img.strip()]
-                        elif isinstance(images_raw, list):
-                            images = [str(img).strip() for img in images_raw if str(img).strip()]
-                        else:
-                            images = []
-                        
-                        # Validate and fix images
-                        featured_image = blog_data.get("featured_image", None)
-                        validated_featured, validated_images = await validate_and_fix_images(
-                            featured_image, 
-                            images, 
-                            user_idea
-                        )
-                        
-                        return {
-                            "success": True,
-                            "title": blog_data.get("title", "Untitled Blog Post"),
-                            "excerpt": blog_data.get("excerpt", ""),
-                            "content": blog_data.get("content", ai_response),
-                            "tags": tags,
-                            "category": blog_data.get("category", "general"),
-                            "featured_image": validated_featured,
-                            "images": validated_images
-                        }
-                except (json.JSONDecodeError, ValueError) as e:
-                    # Log parsing error in debug mode
-                    import sys
-                    print(f"DEBUG: Failed to parse JSON from Gemini response: {str(e)}", file=sys.stderr)
-                    print(f"DEBUG: Response preview: {ai_response[:200]}...", file=sys.stderr)
-                    
-                    # Fallback: return raw response as content
-                    excerpt = ai_response[:200] + "..." if len(ai_response) > 200 else ai_response
-                    
-                    # Generate fallback images
-                    featured_image, images = await validate_and_fix_images(None, [], user_idea)
-                    
-                    return {
-                        "success": True,
-                        "title": f"Blog Post: {user_idea[:50]}",
-                        "excerpt": excerpt,
-                        "content": ai_response,
-                        "tags": ["AI Generated", "Blog"],
-                        "category": "general",
-                        "featured_image": featured_image,
-                        "images": images
-                    }
-                
+            ai_response = await self._post_inference(headers, payload)
+            
+            if not ai_response:
+                return {
+                    "success": False,
+                    "error": "No response from AI"
+                }
+            
+            return await parse_blog_response(ai_response, user_idea)
+            
+        except CircuitOpenError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "status_code": 503
+            }
         except httpx.HTTPError as e:
             return {
                 "success": False,
@@ -310,6 +389,81 @@ Write as Yohans (John) - a Software Engineer who loves tech but keeps it real.""
                 "success": False,
                 "error": f"Error generating blog post: {str(e)}"
             }
+    
+    async def stream_blog_post(self, user_idea: str, token: str) -> AsyncIterator[str]:
+        """
+        Stream raw model output as it is generated
+        
+        Yields text deltas. If the endpoint answers with a plain JSON body
+        instead of an event stream, the whole answer is yielded at once.
+        """
+        if not token:
+            raise ValueError("Open Arena ESSO token is required")
+        
+        import json
+        headers, payload = self._build_request(user_idea, token, stream=True)
+        headers["Accept"] = "text/event-stream"
+        
+        await provider_rate_limits["gpt"].acquire()
+        async with provider_breakers["gpt"].guard(), http_client.stream(
+            "POST",
+            self.api_url,
+            json=payload,
+            headers=headers,
+            timeout=120.0
+        ) as response:
+            response.raise_for_status()
+            
+            if "text/event-stream" not in response.headers.get("content-type", ""):
+                body = await response.aread()
+                answer = self._extract_answer(json.loads(body))
+                if answer:
+                    yield answer
+                return
+            
+            seen = ""
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if not data or data == "[DONE]":
+                    continue
+                try:
+                    event = json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+                
+                text = self._extract_answer(event) if isinstance(event, dict) else ""
+                if not text and isinstance(event, dict):
+                    text = event.get("delta") or event.get("content") or ""
+                if not text:
+                    continue
+                
+                # Some workflows send the cumulative answer, others only the delta
+                if seen and text.startswith(seen):
+                    delta = text[len(seen):]
+                    seen = text
+                else:
+                    delta = text
+                    seen += text
+                if delta:
+                    yield delta
+
+
+# Schema for Gemini's JSON mode - matches the envelope described in the prompt
+BLOG_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "title": {"type": "STRING"},
+        "excerpt": {"type": "STRING"},
+        "content": {"type": "STRING"},
+        "tags": {"type": "STRING"},
+        "category": {"type": "STRING"},
+        "featured_image": {"type": "STRING"},
+        "images": {"type": "ARRAY", "items": {"type": "STRING"}},
+    },
+    "required": ["title", "excerpt", "content", "tags", "category"],
+}
 
 
 class GeminiBlogGenerator:
@@ -324,25 +478,30 @@ class GeminiBlogGenerator:
             self.available = False
         else:
             self.available = True
-    
-    async def generate_blog_post(self, user_idea: str) -> dict:
-        """
-        Generate a blog post from user's idea using Gemini
         
-        Args:
-            user_idea: The topic or idea for the blog post
-            
-        Returns:
-            dict with generated blog content
-        """
-        if not self.available or not self.google_api_key:
-            return {
-                "success": False,
-                "error": "Gemini API is not configured. Please set GOOGLE_AI_API environment variable."
-            }
+        # Reuse one model instance across requests
+        self.model = genai.GenerativeModel(
+            self.model_name,
+            generation_config=genai.types.GenerationConfig(
+                temperature=0.8,
+                max_output_tokens=4000,  # Increased for longer content
+                response_mime_type="application/json",
+                response_schema=BLOG_RESPONSE_SCHEMA,
+            )
+        ) if self.available else None
+        
+        # Schema-free model for raw completions (outlines, sections)
+        self.text_model = genai.GenerativeModel(
+            self.model_name,
+            generation_config=genai.types.GenerationConfig(temperature=0.8, max_output_tokens=4000)
+        ) if self.available else None
         
-        # Create the same detailed prompt used for GPT
-        prompt = f"""Write a blog post about: {user_idea}
+        # Bound concurrent Gemini calls per worker
+        self._semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+    
+    def _build_prompt(self, user_idea: str) -> str:
+        """Create the same detailed prompt used for GPT, with stricter JSON rules"""
+        return f"""Write a blog post about: {user_idea}
 
 WRITING STYLE:
 - Write like you're explaining to a friend over coffee ☕
@@ -399,157 +558,124 @@ IMPORTANT RULES:
 5. Start with {{ and end with }}
 
 Write as Yohans (John) - a Software Engineer who loves tech but keeps it real."""
-
-        try:
-            # Initialize Gemini model
-            model = genai.GenerativeModel(
-                self.model_name,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.8,
-                    max_output_tokens=4000,  # Increased for longer content
+    
+    def _call_model(self, prompt: str, stream: bool = False, model=None, **kwargs):
+        """Awaitable model call - the SDK's async client only speaks gRPC, so REST runs in a thread"""
+        model = model or self.model
+        if GEMINI_USE_REST:
+            return asyncio.to_thread(model.generate_content, prompt, stream=stream, **kwargs)
+        return model.generate_content_async(prompt, stream=stream, **kwargs)
+    
+    async def _generate_content(self, prompt: str, model=None, **kwargs):
+        """Call Gemini without blocking the event loop, with a concurrency limit, timeout and retries"""
+        async def attempt():
+            await provider_rate_limits["gemini"].acquire()
+            async with self._semaphore:
+                return await asyncio.wait_for(
+                    self._call_model(prompt, model=model, **kwargs),
+                    timeout=settings.GEMINI_TIMEOUT_SECONDS
                 )
-            )
+        
+        return await resilient_call(provider_breakers["gemini"], attempt, retry_timeouts=False)
+    
+    async def complete(self, prompt: str, json_output: bool = False, max_tokens: int = 2000) -> str:
+        """
+        Raw completion for a custom prompt (used by sectioned generation)
+        
+        Raises:
+            ValueError: if the model returns nothing
+        """
+        response = await self._generate_content(
+            prompt,
+            model=self.text_model,
+            generation_config={
+                "max_output_tokens": max_tokens,
+                "response_mime_type": "application/json" if json_output else "text/plain",
+            }
+        )
+        if not response.text:
+            raise ValueError("No response from Gemini AI")
+        return response.text
+    
+    async def generate_blog_post(self, user_idea: str) -> dict:
+        """
+        Generate a blog post from user's idea using Gemini
+        
+        Args:
+            user_idea: The topic or idea for the blog post
             
-            # Generate content
-            response = model.generate_content(prompt)
+        Returns:
+            dict with generated blog content
+        """
+        if not self.available or not self.google_api_key:
+            return {
+                "success": False,
+                "error": "Gemini API is not configured. Please set GOOGLE_AI_API environment variable."
+            }
+        
+        try:
+            # Generate content (async SDK call - keeps the event loop free)
+            response = await self._generate_content(self._build_prompt(user_idea))
             
             ai_response = response.text
             
             # DEBUG: Print the raw response
-            import sys
             print(f"DEBUG: Gemini raw response preview: {ai_response[:500]}", file=sys.stderr)
             print(f"DEBUG: Response length: {len(ai_response)}", file=sys.stderr)
             
-            # Also write to a debug file
-            try:
-                with open('/tmp/gemini_debug.log', 'w') as f:
-                    f.write("="*80 + "\n")
-                    f.write("FULL GEMINI RESPONSE:\n")
-                    f.write("="*80 + "\n")
-                    f.write(ai_response)
-                    f.write("\n" + "="*80 + "\n")
-                print(f"DEBUG: Full response written to /tmp/gemini_debug.log", file=sys.stderr)
-            except Exception as log_err:
-                print(f"DEBUG: Could not write debug log: {log_err}", file=sys.stderr)
-            
             if not ai_response:
                 return {
                     "success": False,
                     "error": "No response from Gemini AI"
                 }
             
-            # Try to parse as JSON if it looks like JSON
-            import json
-            import re
-            
-            try:
-                # Try parsing the response as JSON
-                print(f"DEBUG: Attempting JSON parse", file=sys.stderr)
-                print(f"DEBUG: Response first 500 chars: {ai_response[:500]}", file=sys.stderr)
-                
-                try:
-                    # Try direct parse first
-                    blog_data = json.loads(ai_response)
-                    print(f"DEBUG: ✅ Direct JSON parse successful!", file=sys.stderr)
-                except json.JSONDecodeError as direct_error:
-                    print(f"DEBUG: Direct parse failed: {str(direct_error)}", file=sys.stderr)
-                    print(f"DEBUG: Trying to extract JSON from response", file=sys.stderr)
-                    
-                    # Fallback: Find JSON in the response - look for JSON code block first
-                    # Use greedy match to capture full JSON (not lazy .*?)
-                    json_match = re.search(r'```json\s*(\{.*\})\s*```', ai_response, re.DOTALL)
-                    if json_match:
-                        json_str = json_match.group(1)
-                        print(f"DEBUG: Found JSON in code block", file=sys.stderr)
-                    elif "{" in ai_response and "}" in ai_response:
-                        # Find the first complete JSON object
-                        # Use rfind to get the LAST closing brace to capture the full JSON
-                        start = ai_response.find("{")
-                        end = ai_response.rfind("}") + 1
-                        json_str = ai_response[start:end]
-                        print(f"DEBUG: Extracted JSON from text (chars {start} to {end})", file=sys.stderr)
-                    else:
-                        print(f"DEBUG: No braces found in response", file=sys.stderr)
-                        raise ValueError("No JSON found in response")
-                    
-                    # Clean the JSON string (remove markdown formatting if present)
-                    json_str = json_str.strip()
-                    
-                    print(f"DEBUG: About to parse JSON, length: {len(json_str)}", file=sys.stderr)
-                    print(f"DEBUG: JSON first 300 chars: {json_str[:300]}", file=sys.stderr)
-                    print(f"DEBUG: JSON last 100 chars: {json_str[-100:]}", file=sys.stderr)
-                    
-                    blog_data = json.loads(json_str)
-                    print(f"DEBUG: ✅ Extracted JSON parse successful!", file=sys.stderr)
-                
-                print(f"DEBUG: ✅ Successfully parsed JSON! Keys: {list(blog_data.keys())}", file=sys.stderr)
-                print(f"DEBUG: Content type: {type(blog_data.get('content'))}, length: {len(str(blog_data.get('content', '')))}", file=sys.stderr)
-                print(f"DEBUG: Content preview: {str(blog_data.get('content', ''))[:200]}", file=sys.stderr)
-                
-                # Handle tags properly - can be string, list, or missing
-                tags_raw = blog_data.get("tags", "AI Generated,Blog")
-                if isinstance(tags_raw, str):
-                    tags = [t.strip() for t in tags_raw.split(",") if t.strip()]
-                elif isinstance(tags_raw, list):
-                    tags = [str(t).strip() for t in tags_raw if str(t).strip()]
-                else:
-                    tags = ["AI Generated", "Blog"]
-                
-                # Handle images - can be string, list, or missing
-                images_raw = blog_data.get("images", [])
-                if isinstance(images_raw, str):
-                    images = [img.strip() for img in images_raw.split(",") if img.strip()]
-                elif isinstance(images_raw, list):
-                    images = [str(img).strip() for img in images_raw if str(img).strip()]
-                else:
-                    images = []
-                
-                # Validate and fix images
-                featured_image = blog_data.get("featured_image", None)
-                validated_featured, validated_images = await validate_and_fix_images(
-                    featured_image, 
-                    images, 
-                    user_idea
-                )
-                
-                return {
-                    "success": True,
-                    "title": blog_data.get("title", "Untitled Blog Post"),
-                    "excerpt": blog_data.get("excerpt", ""),
-                    "content": blog_data.get("content", ai_response),
-                    "tags": tags,
-                    "category": blog_data.get("category", "general"),
-                    "featured_image": validated_featured,
-                    "images": validated_images,
-                    "model": "gemini-2.5-flash"
-                }
-            except (json.JSONDecodeError, ValueError) as e:
-                print(f"DEBUG: Failed to parse JSON: {str(e)}", file=sys.stderr)
-                print(f"DEBUG: Falling back to raw response", file=sys.stderr)
-            
-            # Fallback: return raw response as content
-            excerpt = ai_response[:200] + "..." if len(ai_response) > 200 else ai_response
-            
-            # Generate fallback images
-            featured_image, images = await validate_and_fix_images(None, [], user_idea)
+            return await parse_blog_response(ai_response, user_idea, self.model_name)
             
+        except CircuitOpenError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "status_code": 503
+            }
+        except asyncio.TimeoutError:
             return {
-                "success": True,
-                "title": f"Blog Post: {user_idea[:50]}",
-                "excerpt": excerpt,
-                "content": ai_response,
-                "tags": ["AI Generated", "Blog"],
-                "category": "general",
-                "featured_image": featured_image,
-                "images": images,
-                "model": "gemini-2.0-flash"
+                "success": False,
+                "error": f"Gemini did not respond within {settings.GEMINI_TIMEOUT_SECONDS:.0f} seconds"
             }
-            
         except Exception as e:
             return {
                 "success": False,
                 "error": f"Error generating blog post with Gemini: {str(e)}"
             }
+    
+    async def stream_blog_post(self, user_idea: str) -> AsyncIterator[str]:
+        """
+        Stream raw Gemini output as it is generated
+        
+        Each chunk must arrive within GEMINI_TIMEOUT_SECONDS of the previous one.
+        """
+        if not self.available:
+            raise RuntimeError("Gemini API is not configured. Please set GOOGLE_AI_API environment variable.")
+        
+        await provider_rate_limits["gemini"].acquire()
+        async with provider_breakers["gemini"].guard(), self._semaphore:
+            response = await asyncio.wait_for(
+                self._call_model(self._build_prompt(user_idea), stream=True),
+                timeout=settings.GEMINI_TIMEOUT_SECONDS
+            )
+            if GEMINI_USE_REST:
+                chunks = iter(response)
+                next_chunk = lambda: asyncio.to_thread(next, chunks, None)
+            else:
+                chunks = response.__aiter__()
+                next_chunk = lambda: anext(chunks, None)
+            while True:
+                chunk = await asyncio.wait_for(next_chunk(), timeout=settings.GEMINI_TIMEOUT_SECONDS)
+                if chunk is None:
+                    break
+                text = getattr(chunk, "text", "")
+                if text:
+                    yield text
 
 
 # Singleton instances
@@ -0,0 +1,325 @@
+"""Publishing pipeline for AI-generated blog posts"""
+import re
+import sys
+from datetime import datetime
+from typing import Optional, List, Tuple
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from ..database import get_database, POSTS_COLLECTION, USERS_COLLECTION
+from .ai_service import ai_blog_generator, gemini_blog_generator, provider_breakers
+from .token_validation import token_validator
+from .generation_cache import generation_cache
+from .llm_router import llm_router, PROVIDERS
+from .sectioned_generation import generate_sectioned
+from .duplicate_index import duplicate_index
+from .newsletter import newsletter_service
+from .home import home_cache
+from .snapshot import snapshot_store
+
+
+def create_slug(title: str) -> str:
+    """Create URL-friendly slug from title"""
+    slug = title.lower()
+    slug = re.sub(r'[^\w\s-]', '', slug)
+    slug = re.sub(r'[-\s]+', '-', slug)
+    return slug[:100]
+
+
+async def get_user_token(user_id: str) -> Optional[str]:
+    """Get user's saved Open Arena token from database"""
+    db = get_database()
+    users_collection = db[USERS_COLLECTION]
+    user = await users_collection.find_one({"_id": ObjectId(user_id)}, {"tr_gpt_token": 1})
+    return user.get("tr_gpt_token") if user else None
+
+
+async def resolve_provider(model: str, user_id: str) -> dict:
+    """
+    Check that a provider can be used by this user
+    
+    Returns:
+        {"success": True, "provider": ..., "token": ...} or an error dict with
+        'status_code' (Gemini not configured, circuit open, missing or invalid token)
+    """
+    if model == "gemini":
+        if not gemini_blog_generator:
+            return {
+                "success": False,
+                "error": "Gemini AI is not configured. Please set GOOGLE_AI_API environment variable.",
+                "status_code": 503
+            }
+    
+    # Fail fast while the provider's circuit is open
+    breaker = provider_breakers[model]
+    if breaker.is_open:
+        return {
+            "success": False,
+            "error": f"{model.upper()} is temporarily unavailable, retry in {breaker.retry_after:.0f}s",
+            "status_code": 503
+        }
+    
+    if model == "gemini":
+        return {"success": True, "provider": "gemini", "token": None}
+    
+    token = await get_user_token(user_id)
+    if not token:
+        return {
+            "success": False,
+            "error": "No Open Arena token found. Please add your ESSO token in the admin panel or use Gemini model.",
+            "status_code": 400
+        }
+    
+    # Validate token before use
+    validation = await token_validator.validate(token)
+    if validation.get("unavailable"):
+        return {"success": False, "error": validation.get("error"), "status_code": 503}
+    if not validation.get("valid"):
+        return {
+            "success": False,
+            "error": f"Your token is expired or invalid. Please update it or use Gemini model. Error: {validation.get('error')}",
+            "status_code": 401
+        }
+    return {"success": True, "provider": "gpt", "token": token}
+
+
+async def resolve_providers(model: str, user_id: str) -> Tuple[List[dict], Optional[dict]]:
+    """
+    Resolve the usable providers for a request, best first
+    
+    "auto" considers every provider in router order and keeps the usable ones;
+    an explicit model resolves to just that provider.
+    
+    Returns:
+        (providers, error) - error is set only when no provider is usable
+    """
+    names = llm_router.rank(list(PROVIDERS)) if model == "auto" else [model]
+    ready = []
+    first_error = None
+    for name in names:
+        resolved = await resolve_provider(name, user_id)
+        if resolved.get("success"):
+            ready.append(resolved)
+        else:
+            first_error = first_error or resolved
+    return ready, (None if ready else first_error)
+
+
+def _generation_call(provider: dict, idea: str, mode: str = "single"):
+    """Zero-argument coroutine factory for one provider"""
+    if provider["provider"] == "gemini":
+        if mode == "sectioned":
+            return lambda: generate_sectioned(idea, gemini_blog_generator.complete, gemini_blog_generator.model_name)
+        return lambda: gemini_blog_generator.generate_blog_post(idea)
+    
+    if mode == "sectioned":
+        token = provider["token"]
+        
+        async def complete(prompt: str, **kwargs) -> str:
+            return await ai_blog_generator.complete(prompt, token, **kwargs)
+        return lambda: generate_sectioned(idea, complete)
+    return lambda: ai_blog_generator.generate_blog_post(idea, provider["token"])
+
+
+async def generate_blog(
+    idea: str,
+    model: str,
+    user_id: str,
+    force_refresh: bool = False,
+    mode: str = "single"
+) -> dict:
+    """
+    Generate a blog post with the requested model
+    
+    Args:
+        idea: The topic or concept for the blog post
+        model: "gpt" (Open Arena, uses the user's saved token), "gemini", or
+            "auto" to let the provider router choose (and hedge, if enabled)
+        user_id: Admin user requesting the generation
+        force_refresh: Skip the generation cache lookup
+        mode: "single" (one call) or "sectioned" (outline, then sections in
+            parallel - faster for long posts)
+    
+    Returns:
+        Generator result dict; on failure 'success' is False and 'status_code'
+        carries the HTTP status the caller should report
+    """
+    cache_model = model if mode == "single" else f"{model}/{mode}"
+    if not force_refresh:
+        cached = generation_cache.get(idea, cache_model)
+        if cached:
+            cached["cached"] = True
+            return cached
+    
+    providers, error = await resolve_providers(model, user_id)
+    if error:
+        return error
+    
+    if model == "auto":
+        result = await llm_router.run([(p["provider"], _generation_call(p, idea, mode)) for p in providers])
+    else:
+        result = await llm_router.call(model, _generation_call(providers[0], idea, mode))
+    
+    if not result.get("success"):
+        result.setdefault("status_code", 500)
+    else:
+        generation_cache.set(idea, cache_model, result)
+    return result
+
+
+def build_post_document(result: dict, requested_model: str) -> dict:
+    """
+    Build the posts collection document for a generation result
+    
+    Args:
+        result: Parsed generator output (title, excerpt, content, tags...)
+        requested_model: Model the admin asked for ("gpt" or "gemini")
+    
+    Returns:
+        dict ready for insertion (slug uniqueness is checked on publish)
+    """
+    # Calculate read time (rough estimate: 200 words per minute)
+    word_count = len(result.get("content", "").split())
+    read_time = max(1, word_count // 200)
+    
+    # Handle tags - can be string or list
+    tags_data = result.get("tags", [])
+    if isinstance(tags_data, str):
+        tags = [tag.strip() for tag in tags_data.split(",") if tag.strip()]
+    elif isinstance(tags_data, list):
+        tags = [str(tag).strip() for tag in tags_data if str(tag).strip()]
+    else:
+        tags = []
+    
+    # Handle images - can be string or list
+    images_data = result.get("images", [])
+    if isinstance(images_data, str):
+        images = [img.strip() for img in images_data.split(",") if img.strip()]
+    elif isinstance(images_data, list):
+        images = [str(img).strip() for img in images_data if str(img).strip()]
+    else:
+        images = []
+    
+    # Add model tag to identify which AI generated it
+    model_used = result.get("model", requested_model)
+    tags.append(f"Generated by {model_used}")
+    
+    return {
+        "title": result.get("title"),
+        "slug": create_slug(result.get("title", "untitled")),
+        "excerpt": result.get("excerpt"),
+        "content": result.get("content"),
+        "author": "Yohans Bekele",
+        "author_id": None,
+        "featured_image": result.get("featured_image", None),
+        "images": images,
+        "tags": tags,
+        "category": result.get("category", "general"),
+        "published": True,
+        "views": 0,
+        "read_time": read_time,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+
+
+async def ensure_unique_slug(post_data: dict) -> dict:
+    """Append a timestamp to the slug if it is already used (same rule as create_post)"""
+    db = get_database()
+    posts_collection = db[POSTS_COLLECTION]
+    
+    slug = post_data["slug"]
+    if await posts_collection.find_one({"slug": slug}, {"_id": 1}):
+        post_data["slug"] = f"{slug}-{int(datetime.utcnow().timestamp())}"
+    return post_data
+
+
+def post_summary(post_data: dict, post_id, model_used: str) -> dict:
+    """API summary returned after a generated post is published"""
+    return {
+        "success": True,
+        "message": f"Blog post generated with {model_used.upper()} and published successfully!",
+        "post_id": str(post_id),
+        "slug": post_data["slug"],
+        "title": post_data["title"],
+        "model": model_used
+    }
+
+
+async def publish_generated_post(result: dict, requested_model: str, extra: Optional[dict] = None) -> dict:
+    """
+    Insert a generated post and return the API summary for it
+    
+    Args:
+        result: Parsed generator output
+        requested_model: Model the admin asked for ("gpt" or "gemini")
+        extra: Additional fields stored on the post (e.g. source_job_id)
+    """
+    db = get_database()
+    posts_collection = db[POSTS_COLLECTION]
+    
+    post_data = await ensure_unique_slug(build_post_document(result, requested_model))
+    if extra:
+        post_data.update(extra)
+    model_used = result.get("model", requested_model)
+    
+    inserted = await posts_collection.insert_one(post_data)
+    duplicate_index.add(post_data)
+    await newsletter_service.announce_post(post_data)
+    home_cache.invalidate()
+    snapshot_store.schedule()
+    
+    print(f"✅ DEBUG: Post created with ID: {inserted.inserted_id}", file=sys.stderr)
+    print(f"✅ DEBUG: Post slug: {post_data['slug']}", file=sys.stderr)
+    
+    return post_summary(post_data, inserted.inserted_id, model_used)
+
+
+async def publish_generated_posts(entries: List[Tuple[dict, str]]) -> List[dict]:
+    """
+    Insert several generated posts with one insert_many
+    
+    Args:
+        entries: (result, requested_model) pairs
+    
+    Returns:
+        One dict per entry, in order: the post summary on success, or
+        {"success": False, "error": ...} for posts that failed to insert
+    """
+    if not entries:
+        return []
+    
+    db = get_database()
+    posts_collection = db[POSTS_COLLECTION]
+    
+    documents = [build_post_document(result, model) for result, model in entries]
+    
+    # Resolve slug collisions against the database and within the batch in one query
+    slugs = [doc["slug"] for doc in documents]
+    taken = set(await posts_collection.distinct("slug", {"slug": {"$in": slugs}}))
+    suffix = int(datetime.utcnow().timestamp())
+    for idx, doc in enumerate(documents):
+        if doc["slug"] in taken:
+            doc["slug"] = f"{doc['slug']}-{suffix}-{idx}"
+        taken.add(doc["slug"])
+    
+    failed = {}
+    try:
+        await posts_collection.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            failed[error["index"]] = error.get("errmsg", "Insert failed")
+    
+    summaries = []
+    for idx, ((result, model), doc) in enumerate(zip(entries, documents)):
+        if idx in failed:
+            summaries.append({"success": False, "error": failed[idx]})
+        else:
+            duplicate_index.add(doc)
+            await newsletter_service.announce_post(doc)
+            summaries.append(post_summary(doc, doc["_id"], result.get("model", model)))
+    if len(failed) < len(documents):
+        home_cache.invalidate()
+        snapshot_store.schedule()
+    return summaries
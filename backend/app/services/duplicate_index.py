@@ -0,0 +1,284 @@
+"""In-memory MinHash/LSH index for near-duplicate posts and ideas"""
+import asyncio
+import hashlib
+import re
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..config import settings
+from ..database import get_database, POSTS_COLLECTION
+
+_WORD = re.compile(r"\w+")
+_MASK = (1 << 64) - 1
+
+# Below this many words a candidate is treated as an idea/title, not a draft
+SHORT_TEXT_WORDS = 40
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _shingles(words: List[str], size: int) -> Set[str]:
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _title_shingles(text: str) -> Set[str]:
+    """Words and word pairs - short texts share too few 3-word shingles"""
+    words = _words(text)
+    return set(words) | _shingles(words, 2)
+
+
+def _content_shingles(text: str) -> Set[str]:
+    return _shingles(_words(text), 3)
+
+
+def minhash(shingles: Iterable[str], num_perm: int) -> Optional[Tuple[int, ...]]:
+    """
+    One-permutation MinHash signature
+    
+    Each shingle is hashed once; the hash picks a bin and the bin keeps its
+    minimum. Empty bins borrow from the next non-empty bin (rotation
+    densification), so cost is linear in the number of shingles instead of
+    shingles x permutations.
+    """
+    bins = [None] * num_perm
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        idx = h % num_perm
+        value = (h // num_perm) & _MASK
+        if bins[idx] is None or value < bins[idx]:
+            bins[idx] = value
+    
+    if all(value is None for value in bins):
+        return None
+    
+    signature = list(bins)
+    for idx in range(num_perm):
+        offset = 1
+        while signature[idx] is None:
+            donor = bins[(idx + offset) % num_perm]
+            if donor is not None:
+                signature[idx] = donor + offset  # Offset keeps borrowed values distinguishable
+            offset += 1
+    return tuple(signature)
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class _LSHTable:
+    """Banded LSH over signatures of one kind (titles or content)"""
+    
+    def __init__(self, num_perm: int, bands: int):
+        self.rows = max(1, num_perm // bands)
+        self.bands = num_perm // self.rows
+        self.buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(self.bands)]
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+    
+    def _keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+    
+    def add(self, key: str, signature: Optional[Tuple[int, ...]]):
+        self.remove(key)
+        if signature is None:
+            return
+        self.signatures[key] = signature
+        for band, band_key in self._keys(signature):
+            self.buckets[band].setdefault(band_key, set()).add(key)
+    
+    def remove(self, key: str):
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in self._keys(signature):
+            bucket = self.buckets[band].get(band_key)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band][band_key]
+    
+    def query(self, signature: Tuple[int, ...]) -> Dict[str, float]:
+        candidates = set()
+        for band, band_key in self._keys(signature):
+            candidates |= self.buckets[band].get(band_key, set())
+        return {key: similarity(signature, self.signatures[key]) for key in candidates}
+
+
+class DuplicateIndex:
+    """
+    Near-duplicate index over all posts
+    
+    Two LSH tables are kept: titles+excerpts (word and word-pair shingles) for
+    checking short ideas, and full content (3-word shingles) for drafts.
+    Built from the posts collection at startup and kept current by the post
+    write paths of this worker. Writes made by other workers are picked up by
+    polling a cheap fingerprint of the collection (post count and latest
+    updated_at) every DUPLICATE_SYNC_SECONDS and rebuilding when it changes.
+    """
+    
+    def __init__(self):
+        self.num_perm = settings.DUPLICATE_NUM_PERM
+        self._titles = _LSHTable(self.num_perm, settings.DUPLICATE_BANDS)
+        self._content = _LSHTable(self.num_perm, settings.DUPLICATE_BANDS)
+        self._meta: Dict[str, Dict] = {}
+        self.ready = False
+        self.build_seconds = 0.0
+        self.checks = 0
+        self.rebuilds = 0
+        self._fingerprint: Optional[tuple] = None
+        self._poller: Optional[asyncio.Task] = None
+    
+    def _signatures(self, post: Dict) -> Tuple[Optional[tuple], Optional[tuple]]:
+        title_text = f"{post.get('title') or ''} {post.get('excerpt') or ''}"
+        content_text = f"{post.get('title') or ''} {post.get('content') or ''}"
+        return (
+            minhash(_title_shingles(title_text), self.num_perm),
+            minhash(_content_shingles(content_text), self.num_perm),
+        )
+    
+    def _install(self, post_id: str, post: Dict, signatures: Tuple):
+        self._titles.add(post_id, signatures[0])
+        self._content.add(post_id, signatures[1])
+        self._meta[post_id] = {"slug": post.get("slug"), "title": post.get("title")}
+    
+    async def _collection_fingerprint(self) -> tuple:
+        posts_collection = get_database()[POSTS_COLLECTION]
+        count, latest = await asyncio.gather(
+            posts_collection.count_documents({}),
+            posts_collection.find_one({}, {"updated_at": 1}, sort=[("updated_at", -1)]),
+        )
+        return count, latest.get("updated_at") if latest else None
+    
+    async def build(self):
+        """(Re)build the index from the posts collection"""
+        started = time.monotonic()
+        db = get_database()
+        fingerprint = await self._collection_fingerprint()
+        posts = await db[POSTS_COLLECTION].find(
+            {}, {"title": 1, "excerpt": 1, "content": 1, "slug": 1}
+        ).to_list(length=None)
+        
+        # Hashing is CPU work - keep it off the event loop
+        signatures = await asyncio.to_thread(lambda: [self._signatures(post) for post in posts])
+        
+        self._titles = _LSHTable(self.num_perm, settings.DUPLICATE_BANDS)
+        self._content = _LSHTable(self.num_perm, settings.DUPLICATE_BANDS)
+        self._meta = {}
+        for post, sigs in zip(posts, signatures):
+            self._install(str(post["_id"]), post, sigs)
+        
+        self.ready = True
+        self._fingerprint = fingerprint
+        self.build_seconds = time.monotonic() - started
+        print(f"✅ Duplicate index built: {len(posts)} posts in {self.build_seconds:.2f}s", file=sys.stderr)
+    
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(settings.DUPLICATE_SYNC_SECONDS)
+            try:
+                if await self._collection_fingerprint() != self._fingerprint:
+                    self.rebuilds += 1
+                    await self.build()
+            except Exception as e:
+                print(f"ERROR syncing duplicate index: {str(e)}", file=sys.stderr)
+    
+    async def start(self):
+        try:
+            await self.build()
+        except Exception as e:
+            # Not fatal - checks just find nothing until the next build
+            print(f"⚠️  Could not build duplicate index: {str(e)}", file=sys.stderr)
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._sync_loop())
+    
+    async def stop(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+    
+    def add(self, post: Dict):
+        """Index a new or updated post (needs _id, title, excerpt, content, slug)"""
+        self._install(str(post["_id"]), post, self._signatures(post))
+    
+    def remove(self, post_id):
+        post_id = str(post_id)
+        self._titles.remove(post_id)
+        self._content.remove(post_id)
+        self._meta.pop(post_id, None)
+    
+    def check(self, text: str, title: Optional[str] = None, limit: int = 5) -> List[Dict]:
+        """
+        Find posts similar to an idea or a draft
+        
+        Args:
+            text: Idea (short) or draft content (long)
+            title: Draft title, if any
+            limit: Maximum matches returned
+        
+        Returns:
+            Matches above the threshold, most similar first:
+            {post_id, slug, title, similarity, matched_on}
+        """
+        self.checks += 1
+        matches: Dict[str, Tuple[float, str]] = {}
+        
+        def collect(table: _LSHTable, signature, threshold: float, kind: str):
+            if signature is None:
+                return
+            for post_id, score in table.query(signature).items():
+                if score >= threshold and score > matches.get(post_id, (0.0, ""))[0]:
+                    matches[post_id] = (score, kind)
+        
+        short = len(_words(text)) < SHORT_TEXT_WORDS
+        if short or title:
+            collect(
+                self._titles,
+                minhash(_title_shingles(f"{title or ''} {text if short else ''}"), self.num_perm),
+                settings.DUPLICATE_IDEA_THRESHOLD,
+                "title"
+            )
+        if not short:
+            collect(
+                self._content,
+                minhash(_content_shingles(f"{title or ''} {text}"), self.num_perm),
+                settings.DUPLICATE_THRESHOLD,
+                "content"
+            )
+        
+        ranked = sorted(matches.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [
+            {
+                "post_id": post_id,
+                "slug": self._meta.get(post_id, {}).get("slug"),
+                "title": self._meta.get(post_id, {}).get("title"),
+                "similarity": round(score, 3),
+                "matched_on": kind,
+            }
+            for post_id, (score, kind) in ranked
+        ]
+    
+    def get_stats(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "posts": len(self._meta),
+            "build_seconds": round(self.build_seconds, 3),
+            "rebuilds": self.rebuilds,
+            "checks": self.checks,
+            "num_perm": self.num_perm,
+            "bands": self._content.bands,
+        }
+
+
+# Singleton instance
+duplicate_index = DuplicateIndex()
@@ -0,0 +1,319 @@
+"""Persistent email outbox drained by a background SMTP worker"""
+import asyncio
+import random
+import smtplib
+import sys
+import time
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+
+from ..config import settings
+from ..database import get_database, EMAIL_OUTBOX_COLLECTION
+from ..utils.rate_limit import TokenBucket
+
+# Lower sorts first: transactional mail is never stuck behind a newsletter
+PRIORITY_TRANSACTIONAL = 0
+PRIORITY_BULK = 1
+
+
+def build_mime_message(message: Dict) -> MIMEMultipart:
+    """Turn an outbox document into a multipart text/HTML email"""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = message["subject"]
+    msg['From'] = settings.SMTP_USER
+    msg['To'] = message["to"]
+    
+    if message.get("text_body"):
+        msg.attach(MIMEText(message["text_body"], 'plain'))
+    msg.attach(MIMEText(message["html_body"], 'html'))
+    return msg
+
+
+class SMTPSession:
+    """
+    One authenticated SMTP connection reused across messages
+    
+    Blocking (smtplib) - call from a worker thread. The connection is opened
+    lazily, re-opened once if the server dropped it, and closed after sitting
+    idle for EMAIL_SMTP_IDLE_SECONDS.
+    """
+    
+    def __init__(self):
+        self._smtp: Optional[smtplib.SMTP] = None
+        self.last_used = 0.0
+        self.connects = 0
+    
+    def _connect(self):
+        smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.EMAIL_SMTP_TIMEOUT_SECONDS)
+        try:
+            if settings.SMTP_USE_TLS:
+                smtp.starttls()
+            smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        self.connects += 1
+    
+    def send(self, msg: MIMEMultipart):
+        if self._smtp is None:
+            self._connect()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Server closed the idle connection - reconnect once
+            self.close()
+            self._connect()
+            self._smtp.send_message(msg)
+        self.last_used = time.monotonic()
+    
+    def close(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+    
+    @property
+    def is_open(self) -> bool:
+        return self._smtp is not None
+
+
+def _is_permanent(error: Exception) -> bool:
+    """5xx answers (bad recipient, rejected content) won't succeed on retry"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class EmailOutbox:
+    """
+    Mongo-backed outbox for transactional and bulk email
+    
+    Routes enqueue and return immediately; EMAIL_SMTP_CONNECTIONS workers per
+    process claim messages (find_one_and_update with a lease, transactional
+    before bulk) and send them over their own reused SMTP session, paced by a
+    shared EMAIL_SEND_RATE_PER_MINUTE bucket. Transient failures are retried
+    with exponential backoff; permanent failures and messages that exhaust
+    EMAIL_MAX_ATTEMPTS are moved to status "dead" for inspection.
+    """
+    
+    def __init__(self):
+        self._workers: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._sessions: List[SMTPSession] = []
+        self._send_rate = TokenBucket(settings.EMAIL_SEND_RATE_PER_MINUTE, settings.EMAIL_SEND_BURST)
+        self._last_recovery = 0.0
+        self._counters = {"sent": 0, "retried": 0, "dead": 0}
+    
+    @property
+    def collection(self):
+        return get_database()[EMAIL_OUTBOX_COLLECTION]
+    
+    @staticmethod
+    def is_configured() -> bool:
+        return bool(settings.SMTP_USER and settings.SMTP_PASSWORD)
+    
+    @staticmethod
+    def _document(
+        to: str,
+        subject: str,
+        html_body: str,
+        text_body: Optional[str],
+        extra: Optional[Dict],
+        priority: int
+    ) -> Dict:
+        now = datetime.utcnow()
+        doc = {
+            "to": to,
+            "subject": subject,
+            "html_body": html_body,
+            "text_body": text_body,
+            "status": "queued",
+            "priority": priority,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+            "last_error": None,
+        }
+        if extra:
+            doc.update(extra)
+        return doc
+    
+    async def enqueue(
+        self,
+        to: str,
+        subject: str,
+        html_body: str,
+        text_body: Optional[str] = None,
+        extra: Optional[Dict] = None
+    ) -> bool:
+        """
+        Queue one email
+        
+        Returns:
+            bool: False if SMTP is not configured (nothing is queued)
+        """
+        if not self.is_configured():
+            return False
+        await self.collection.insert_one(
+            self._document(to, subject, html_body, text_body, extra, PRIORITY_TRANSACTIONAL)
+        )
+        self._wakeup.set()
+        return True
+    
+    async def enqueue_many(self, messages: List[Dict], priority: int = PRIORITY_BULK) -> int:
+        """
+        Queue several emails with one insert
+        
+        Args:
+            messages: dicts with to, subject, html_body and optional text_body/extra
+            priority: PRIORITY_BULK unless the batch is transactional
+        
+        Returns:
+            int: Number of messages queued. Messages rejected by the unique
+            (campaign_id, to) index - already queued by an earlier attempt -
+            are skipped, not counted.
+        """
+        if not self.is_configured() or not messages:
+            return 0
+        docs = [
+            self._document(m["to"], m["subject"], m["html_body"], m.get("text_body"), m.get("extra"), priority)
+            for m in messages
+        ]
+        try:
+            await self.collection.insert_many(docs, ordered=False)
+            inserted = len(docs)
+        except BulkWriteError as e:
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+            inserted = e.details.get("nInserted", 0)
+        self._wakeup.set()
+        return inserted
+    
+    async def _claim(self) -> Optional[Dict]:
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {"status": "queued", "next_attempt_at": {"$lte": now}},
+            {
+                "$set": {
+                    "status": "sending",
+                    "lease_expires_at": now + timedelta(seconds=settings.EMAIL_LEASE_SECONDS),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("priority", 1), ("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def recover_stale(self) -> int:
+        """Requeue messages whose sender died mid-send"""
+        result = await self.collection.update_many(
+            {"status": "sending", "lease_expires_at": {"$lt": datetime.utcnow()}},
+            {"$set": {"status": "queued"}}
+        )
+        return result.modified_count
+    
+    async def _deliver(self, session: SMTPSession, message: Dict):
+        await self._send_rate.acquire()
+        now = datetime.utcnow()
+        try:
+            await asyncio.to_thread(session.send, build_mime_message(message))
+        except Exception as e:
+            if not isinstance(e, smtplib.SMTPResponseException):
+                # Connection-level problem - start from a fresh session next time
+                await asyncio.to_thread(session.close)
+            
+            error = f"{type(e).__name__}: {str(e)[:200]}"
+            if _is_permanent(e) or message["attempts"] >= settings.EMAIL_MAX_ATTEMPTS:
+                update = {"status": "dead", "last_error": error, "dead_at": now}
+                self._counters["dead"] += 1
+                print(f"❌ Email {message['_id']} dead-lettered: {type(e).__name__}", file=sys.stderr)
+            else:
+                delay = min(
+                    settings.EMAIL_RETRY_MAX_SECONDS,
+                    settings.EMAIL_RETRY_BASE_SECONDS * (2 ** (message["attempts"] - 1))
+                )
+                update = {
+                    "status": "queued",
+                    "last_error": error,
+                    "next_attempt_at": now + timedelta(seconds=random.uniform(delay / 2, delay)),
+                }
+                self._counters["retried"] += 1
+        else:
+            update = {"status": "sent", "sent_at": now, "last_error": None}
+            self._counters["sent"] += 1
+        
+        await self.collection.update_one({"_id": message["_id"]}, {"$set": update, "$unset": {"lease_expires_at": ""}})
+    
+    async def _idle(self, session: SMTPSession):
+        """Housekeeping while the queue is empty, then wait for new mail"""
+        now = time.monotonic()
+        if session.is_open and now - session.last_used > settings.EMAIL_SMTP_IDLE_SECONDS:
+            await asyncio.to_thread(session.close)
+        if now - self._last_recovery > settings.EMAIL_LEASE_SECONDS:
+            self._last_recovery = now
+            await self.recover_stale()
+        
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=settings.EMAIL_OUTBOX_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+    
+    async def _worker_loop(self, session: SMTPSession):
+        while True:
+            try:
+                message = await self._claim()
+                if message is None:
+                    await self._idle(session)
+                    continue
+                await self._deliver(session, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"ERROR in email outbox worker: {str(e)}", file=sys.stderr)
+                await asyncio.sleep(settings.EMAIL_OUTBOX_POLL_SECONDS)
+    
+    async def start(self):
+        """Start the senders (no-op when SMTP is not configured)"""
+        if self._workers or not self.is_configured():
+            return
+        self._wakeup = asyncio.Event()
+        self._sessions = [SMTPSession() for _ in range(max(1, settings.EMAIL_SMTP_CONNECTIONS))]
+        self._workers = [asyncio.create_task(self._worker_loop(session)) for session in self._sessions]
+    
+    async def stop(self):
+        """Stop the senders; a message being sent keeps its lease and is recovered later"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for session in self._sessions:
+            await asyncio.to_thread(session.close)
+    
+    async def get_stats(self) -> Dict:
+        by_status = {
+            row["_id"]: row["count"]
+            async for row in self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+        }
+        return {
+            "configured": self.is_configured(),
+            "by_status": by_status,
+            "worker": self._counters,
+            "smtp_connects": sum(session.connects for session in self._sessions),
+            "smtp_sessions_open": sum(1 for session in self._sessions if session.is_open),
+        }
+
+
+# Singleton instance
+email_outbox = EmailOutbox()
@@ -1,24 +1,18 @@
 """Email service for sending verification and password reset emails"""
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from typing import Optional
 from ..config import settings
+from .email_outbox import email_outbox
 
 
 class EmailService:
-    """Service for sending emails via SMTP"""
+    """Service for rendering emails and queueing them for SMTP delivery"""
     
     def __init__(self):
-        self.smtp_host = settings.SMTP_HOST
-        self.smtp_port = settings.SMTP_PORT
-        self.smtp_user = settings.SMTP_USER
-        self.smtp_password = settings.SMTP_PASSWORD
         self.frontend_url = settings.FRONTEND_URL
     
-    def _send_email(self, to_email: str, subject: str, html_body: str, text_body: str = None) -> bool:
+    async def _send_email(self, to_email: str, subject: str, html_body: str, text_body: str = None) -> bool:
         """
-        Send email via SMTP
+        Queue an email in the outbox (sent by the background SMTP worker)
         
         Args:
             to_email: Recipient email address
@@ -27,47 +21,26 @@ class EmailService:
             text_body: Plain text email body (optional)
             
         Returns:
-            bool: True if email sent successfully, False otherwise
+            bool: True if the email was queued, False otherwise
         """
-        if not self.smtp_user or not self.smtp_password:
-            # Only log in debug mode
-            import os
-            if os.getenv("DEBUG", "False").lower() == "true":
-                print("⚠️ SMTP credentials not configured. Email not sent.")
-            return False
-        
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.smtp_user
-            msg['To'] = to_email
-            
-            # Add text and HTML parts
-            if text_body:
-                text_part = MIMEText(text_body, 'plain')
-                msg.attach(text_part)
-            
-            html_part = MIMEText(html_body, 'html')
-            msg.attach(html_part)
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
-            
-            return True
-            
+            queued = await email_outbox.enqueue(to_email, subject, html_body, text_body)
         except Exception as e:
             # Only log error type, not full details (may contain sensitive info)
             import os
             if os.getenv("DEBUG", "False").lower() == "true":
                 error_type = type(e).__name__
-                print(f"❌ Error sending email: {error_type}")
+                print(f"❌ Error queueing email: {error_type}")
             return False
+        
+        if not queued:
+            # Only log in debug mode
+            import os
+            if os.getenv("DEBUG", "False").lower() == "true":
+                print("⚠️ SMTP credentials not configured. Email not sent.")
+        return queued
     
-    def send_password_reset_email(self, to_email: str, reset_token: str, username: str) -> bool:
+    async def send_password_reset_email(self, to_email: str, reset_token: str, username: str) -> bool:
         """
         Send password reset email
         
@@ -130,9 +103,9 @@ class EmailService:
         If you didn't request this password reset, please ignore this email.
         """
         
-        return self._send_email(to_email, subject, html_body, text_body)
+        return await self._send_email(to_email, subject, html_body, text_body)
     
-    def send_password_changed_email(self, to_email: str, username: str) -> bool:
+    async def send_password_changed_email(self, to_email: str, username: str) -> bool:
         """
         Send password changed confirmation email
         
@@ -180,7 +153,7 @@ class EmailService:
         If you didn't make this change, please contact support immediately.
         """
         
-        return self._send_email(to_email, subject, html_body, text_body)
+        return await self._send_email(to_email, subject, html_body, text_body)
 
 
 # Singleton instance
@@ -0,0 +1,112 @@
+"""Cache of parsed AI generation results keyed by idea, model and prompt version"""
+import copy
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from ..config import settings
+from .ai_service import PROMPT_TEMPLATE_VERSION
+
+
+def normalize_idea(idea: str) -> str:
+    """
+    Normalize an idea so trivially different phrasings share a cache entry
+    
+    Unicode-normalizes, lowercases, drops punctuation and collapses whitespace:
+    "Why Docker?  " and "why docker" map to the same key.
+    """
+    text = unicodedata.normalize("NFKC", idea).lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+class GenerationCache:
+    """
+    In-process LRU cache of successful generation results
+    
+    Entries expire after GENERATION_CACHE_TTL_SECONDS; the least recently used
+    entries are evicted once either the entry count or the approximate size in
+    bytes exceeds its limit.
+    """
+    
+    def __init__(self):
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(idea: str, model: str) -> str:
+        raw = f"{normalize_idea(idea)}|{model}|{PROMPT_TEMPLATE_VERSION}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def get(self, idea: str, model: str) -> Optional[Dict]:
+        """Return a copy of the cached result, or None on miss/expiry"""
+        key = self.make_key(idea, model)
+        entry = self._entries.get(key)
+        
+        if entry is None or entry["expires_at"] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry["result"])
+    
+    def set(self, idea: str, model: str, result: Dict):
+        """Store a successful result"""
+        if not result.get("success"):
+            return
+        
+        key = self.make_key(idea, model)
+        if key in self._entries:
+            self._remove(key)
+        
+        size = len(json.dumps(result, default=str))
+        if size > settings.GENERATION_CACHE_MAX_BYTES:
+            return
+        
+        self._entries[key] = {
+            "result": copy.deepcopy(result),
+            "size": size,
+            "expires_at": time.monotonic() + settings.GENERATION_CACHE_TTL_SECONDS,
+        }
+        self._size_bytes += size
+        
+        while (
+            len(self._entries) > settings.GENERATION_CACHE_MAX_ENTRIES
+            or self._size_bytes > settings.GENERATION_CACHE_MAX_BYTES
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+    
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._size_bytes -= entry["size"]
+    
+    def clear(self):
+        self._entries.clear()
+        self._size_bytes = 0
+    
+    def get_stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "prompt_template_version": PROMPT_TEMPLATE_VERSION,
+        }
+
+
+# Singleton instance
+generation_cache = GenerationCache()
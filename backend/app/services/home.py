@@ -0,0 +1,99 @@
+"""Home page bundle: portfolio, latest posts, tags and categories in one payload"""
+import asyncio
+import hashlib
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..config import settings
+from ..database import get_database, POSTS_COLLECTION
+from ..utils.posts import LIST_PROJECTION
+from ..utils.serializers import dumps, dump_posts_list
+from .portfolio_cache import portfolio_cache
+
+
+def compose_home_bundle(portfolio: Optional[bytes], posts: bytes, tags: List[str], categories: List[str]) -> bytes:
+    """Join already serialized parts into the GET /api/home body without re-encoding them"""
+    return b"".join([
+        b'{"portfolio":', portfolio if portfolio is not None else b"null",
+        b',"posts":', posts,
+        b',"tags":', dumps(sorted(tags)),
+        b',"categories":', dumps(sorted(categories)),
+        b"}",
+    ])
+
+
+async def build_home_bundle() -> bytes:
+    """Query all parts of the home page concurrently"""
+    posts_collection = get_database()[POSTS_COLLECTION]
+    page_size = settings.SNAPSHOT_PAGE_SIZE
+    published = {"published": True}
+    
+    portfolio, total, first_page, tags, categories = await asyncio.gather(
+        portfolio_cache.get("full"),
+        posts_collection.count_documents(published),
+        posts_collection.find(published, LIST_PROJECTION)
+        .sort("created_at", -1).limit(page_size).to_list(length=page_size),
+        posts_collection.distinct("tags", published),
+        posts_collection.distinct("category", published),
+    )
+    return compose_home_bundle(portfolio, dump_posts_list(first_page, total, 1, page_size), tags, categories)
+
+
+def bundle_etag(data: bytes) -> str:
+    return f'"{hashlib.sha256(data).hexdigest()[:20]}"'
+
+
+class HomeBundleCache:
+    """
+    The last built GET /api/home body, independent of the snapshot
+    
+    Keyed on the portfolio cache_version and a generation counter that post
+    writes bump (invalidate()). Post writes made by other workers are picked
+    up once the entry is HOME_CACHE_TTL_SECONDS old.
+    """
+    
+    def __init__(self):
+        self.generation = 0
+        self._entry: Optional[Tuple[tuple, float, bytes, str]] = None  # (key, expires_at, data, etag)
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def invalidate(self):
+        """Posts changed - rebuild on the next request"""
+        self.generation += 1
+    
+    def _current(self, key: tuple) -> Optional[Tuple[bytes, str]]:
+        entry = self._entry
+        if entry is not None and entry[0] == key and entry[1] > time.monotonic():
+            return entry[2], entry[3]
+        return None
+    
+    async def get(self) -> Tuple[bytes, str]:
+        """Bundle body and its ETag"""
+        key = (portfolio_cache.version, self.generation)
+        cached = self._current(key)
+        if cached is None:
+            # Concurrent misses wait for one build instead of each querying Mongo
+            async with self._lock:
+                cached = self._current(key)
+                if cached is None:
+                    self.misses += 1
+                    data = await build_home_bundle()
+                    cached = (data, bundle_etag(data))
+                    self._entry = (key, time.monotonic() + settings.HOME_CACHE_TTL_SECONDS, *cached)
+                    return cached
+        self.hits += 1
+        return cached
+    
+    def get_stats(self) -> Dict:
+        return {
+            "cached": self._entry is not None,
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Singleton instance
+home_cache = HomeBundleCache()
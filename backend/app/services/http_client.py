@@ -0,0 +1,197 @@
+"""Shared outbound HTTP client with connection pooling"""
+import asyncio
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, AsyncIterator
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..config import settings
+
+
+class HTTPClientManager:
+    """
+    Application-scoped httpx client for all external calls
+    
+    One pooled client (HTTP/2 + keep-alive) is opened by the FastAPI lifespan
+    and shared by every service, so repeated calls to the same upstream reuse
+    an existing TCP/TLS connection instead of paying a fresh handshake.
+    
+    Per-host state (concurrency semaphore and counters) is kept for at most
+    HTTP_CLIENT_MAX_HOSTS hosts; the least recently used idle hosts are
+    dropped (image URLs from generated posts point at arbitrary hosts) and
+    their counters are folded into the totals.
+    """
+    
+    def __init__(self):
+        self.client: Optional[httpx.AsyncClient] = None
+        self._hosts: "OrderedDict[str, Dict]" = OrderedDict()
+        self._evicted_stats: Counter = Counter()
+        self.evicted_hosts = 0
+    
+    async def start(self):
+        """Open the shared client"""
+        if self.client is not None:
+            return
+        
+        self.client = httpx.AsyncClient(
+            http2=settings.HTTP_CLIENT_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.HTTP_CLIENT_DEFAULT_TIMEOUT, connect=5.0),
+        )
+        print("✅ Shared HTTP client started")
+    
+    async def close(self):
+        """Close the shared client and its pooled connections"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        print("✅ Shared HTTP client closed")
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        # Scripts and tests may call services outside the app lifespan
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                http2=settings.HTTP_CLIENT_HTTP2,
+                timeout=httpx.Timeout(settings.HTTP_CLIENT_DEFAULT_TIMEOUT, connect=5.0),
+            )
+        return self.client
+    
+    def _host(self, host: str) -> Dict:
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = self._hosts[host] = {
+                "semaphore": asyncio.Semaphore(settings.HTTP_CLIENT_MAX_PER_HOST),
+                "active": 0,  # Requests holding or waiting for the semaphore
+                "stats": {"requests": 0, "new_connections": 0, "errors": 0},
+            }
+            self._evict(keep=host)
+        else:
+            self._hosts.move_to_end(host)
+        return entry
+    
+    def _evict(self, keep: str):
+        excess = len(self._hosts) - settings.HTTP_CLIENT_MAX_HOSTS
+        if excess <= 0:
+            return
+        # Busy hosts stay, otherwise a new semaphore would double their concurrency
+        idle = [host for host, entry in self._hosts.items() if host != keep and not entry["active"]]
+        for host in idle[:excess]:
+            self._evicted_stats.update(self._hosts.pop(host)["stats"])
+            self.evicted_hosts += 1
+    
+    @asynccontextmanager
+    async def _host_slot(self, host: str) -> AsyncIterator[Dict]:
+        """Hold one of the host's HTTP_CLIENT_MAX_PER_HOST slots; yields its counters"""
+        entry = self._host(host)
+        entry["active"] += 1
+        try:
+            async with entry["semaphore"]:
+                yield entry["stats"]
+        finally:
+            entry["active"] -= 1
+    
+    async def request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request through the shared pool
+        
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            timeout: Per-call timeout in seconds (falls back to the client default)
+            **kwargs: Passed through to httpx (headers, json, data, follow_redirects...)
+        """
+        extensions = kwargs.pop("extensions", {}) or {}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        
+        async with self._host_slot(urlsplit(url).netloc) as host_stats:
+            async def trace(event_name: str, info: dict):
+                # httpcore only emits connect_tcp when it has to open a new connection
+                if event_name == "connection.connect_tcp.complete":
+                    host_stats["new_connections"] += 1
+            
+            extensions["trace"] = trace
+            host_stats["requests"] += 1
+            try:
+                return await self._get_client().request(method, url, extensions=extensions, **kwargs)
+            except httpx.HTTPError:
+                host_stats["errors"] += 1
+                raise
+    
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[httpx.Response]:
+        """Open a streaming request through the shared pool (same accounting as request)"""
+        extensions = kwargs.pop("extensions", {}) or {}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        
+        async with self._host_slot(urlsplit(url).netloc) as host_stats:
+            async def trace(event_name: str, info: dict):
+                if event_name == "connection.connect_tcp.complete":
+                    host_stats["new_connections"] += 1
+            
+            extensions["trace"] = trace
+            host_stats["requests"] += 1
+            try:
+                async with self._get_client().stream(method, url, extensions=extensions, **kwargs) as response:
+                    yield response
+            except httpx.HTTPError:
+                host_stats["errors"] += 1
+                raise
+    
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+    
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+    
+    async def head(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("HEAD", url, **kwargs)
+    
+    def get_stats(self) -> Dict:
+        """Connection reuse statistics per upstream host"""
+        hosts = {}
+        total_requests = self._evicted_stats["requests"]
+        total_new = self._evicted_stats["new_connections"]
+        for host, entry in self._hosts.items():
+            stats = entry["stats"]
+            requests = stats["requests"]
+            new_connections = stats["new_connections"]
+            total_requests += requests
+            total_new += new_connections
+            hosts[host] = {
+                **stats,
+                "reused_connections": max(0, requests - new_connections - stats["errors"]),
+                "reuse_ratio": round(1 - new_connections / requests, 3) if requests else None,
+            }
+        
+        return {
+            "http2": settings.HTTP_CLIENT_HTTP2,
+            "total_requests": total_requests,
+            "total_new_connections": total_new,
+            "reuse_ratio": round(1 - total_new / total_requests, 3) if total_requests else None,
+            "evicted_hosts": self.evicted_hosts,
+            "hosts": hosts,
+        }
+
+
+# Singleton instance
+http_client = HTTPClientManager()
@@ -0,0 +1,157 @@
+"""Concurrent, cached image URL validation"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..config import settings
+from .http_client import http_client
+from ..utils.resilience import BreakerRegistry, CircuitOpenError, resilient_call
+
+
+class ImageURLChecker:
+    """
+    Checks whether image URLs are reachable, with a TTL cache
+    
+    - Reachable URLs are cached for IMAGE_CHECK_OK_TTL_SECONDS
+    - 404s and other non-200 answers are negatively cached per URL
+    - Each host has a circuit breaker: once it times out or refuses
+      connections IMAGE_HOST_BREAKER_THRESHOLD times in a row, every other URL
+      on that host is skipped without a request until a half-open probe
+      succeeds
+    - Both are bounded: the URL cache is an LRU of IMAGE_CHECK_CACHE_MAX_URLS
+      entries (expired entries are swept first) and at most
+      IMAGE_HOST_BREAKER_MAX_HOSTS host breakers are kept
+    """
+    
+    def __init__(self):
+        self._url_cache: "OrderedDict[str, tuple]" = OrderedDict()  # url -> (ok, expires_at)
+        self._host_breakers = BreakerRegistry(max_size=settings.IMAGE_HOST_BREAKER_MAX_HOSTS)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _host_breaker(self, url: str):
+        return self._host_breakers.get(
+            urlsplit(url).netloc,
+            failure_threshold=settings.IMAGE_HOST_BREAKER_THRESHOLD,
+            recovery_seconds=settings.IMAGE_CHECK_NEGATIVE_TTL_SECONDS
+        )
+    
+    def _cached(self, url: str) -> Optional[bool]:
+        now = time.monotonic()
+        
+        if self._host_breaker(url).is_open:
+            return False
+        
+        entry = self._url_cache.get(url)
+        if entry is not None:
+            ok, expires_at = entry
+            if expires_at > now:
+                self._url_cache.move_to_end(url)
+                return ok
+            self._url_cache.pop(url, None)
+        return None
+    
+    def _remember(self, url: str, ok: bool, ttl: float):
+        now = time.monotonic()
+        self._url_cache[url] = (ok, now + ttl)
+        self._url_cache.move_to_end(url)
+        
+        if len(self._url_cache) <= settings.IMAGE_CHECK_CACHE_MAX_URLS:
+            return
+        expired = [key for key, (_, expires_at) in self._url_cache.items() if expires_at <= now]
+        for key in expired:
+            del self._url_cache[key]
+        while len(self._url_cache) > settings.IMAGE_CHECK_CACHE_MAX_URLS:
+            self._url_cache.popitem(last=False)
+            self.evictions += 1
+    
+    async def _fetch(self, url: str) -> bool:
+        try:
+            response = await resilient_call(
+                self._host_breaker(url),
+                lambda: http_client.head(
+                    url,
+                    follow_redirects=True,
+                    timeout=settings.IMAGE_CHECK_TIMEOUT_SECONDS
+                ),
+                attempts=1
+            )
+            ok = response.status_code == 200
+            ttl = settings.IMAGE_CHECK_OK_TTL_SECONDS if ok else settings.IMAGE_CHECK_NEGATIVE_TTL_SECONDS
+            self._remember(url, ok, ttl)
+            return ok
+        except (CircuitOpenError, httpx.TimeoutException, httpx.ConnectError):
+            # Host unreachable - its breaker has counted the failure
+            return False
+        except Exception:
+            self._remember(url, False, settings.IMAGE_CHECK_NEGATIVE_TTL_SECONDS)
+            return False
+        finally:
+            self._inflight.pop(url, None)
+    
+    async def check(self, url: str) -> bool:
+        """Check if image URL is accessible"""
+        if not url or not url.startswith(("http://", "https://")):
+            return False
+        
+        cached = self._cached(url)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        
+        self.misses += 1
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._fetch(url))
+            self._inflight[url] = task
+        return await asyncio.shield(task)
+    
+    async def check_many(self, urls: List[str], deadline: Optional[float] = None) -> List[bool]:
+        """
+        Check several URLs concurrently
+        
+        Args:
+            urls: URLs to check
+            deadline: Overall time budget in seconds; URLs still pending when it
+                passes count as unreachable (their checks finish in the background
+                and still populate the cache)
+        
+        Returns:
+            list of booleans in the same order as urls
+        """
+        if not urls:
+            return []
+        
+        tasks = [asyncio.ensure_future(self.check(url)) for url in urls]
+        done, pending = await asyncio.wait(
+            tasks,
+            timeout=deadline if deadline is not None else settings.IMAGE_CHECK_DEADLINE_SECONDS
+        )
+        for task in pending:
+            task.cancel()
+        
+        return [
+            task in done and not task.cancelled() and task.exception() is None and task.result()
+            for task in tasks
+        ]
+    
+    def get_stats(self) -> Dict:
+        return {
+            "cached_urls": len(self._url_cache),
+            "tracked_hosts": len(self._host_breakers),
+            "dead_hosts": sum(1 for stats in self._host_breakers.get_stats().values() if stats["state"] == "open"),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "host_evictions": self._host_breakers.evictions,
+        }
+
+
+# Singleton instance
+image_checker = ImageURLChecker()
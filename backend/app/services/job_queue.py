@@ -0,0 +1,408 @@
+"""Persistent background job queue for long-running AI work"""
+import asyncio
+import os
+import socket
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from ..config import settings
+from ..database import get_database, JOBS_COLLECTION, POSTS_COLLECTION
+from .blog_pipeline import generate_blog, publish_generated_post, post_summary
+from ..utils.resilience import backoff_delay, start_retry_budget
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobFailed(Exception):
+    """Raised by a job handler to fail the job with a user-facing error"""
+    
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+async def run_generate_and_post(job: Dict) -> Dict:
+    """Handler for 'generate_and_post' jobs: generate with the chosen model, then publish"""
+    db = get_database()
+    payload = job["payload"]
+    
+    # A previous attempt may have published before its worker died
+    existing = await db[POSTS_COLLECTION].find_one({"source_job_id": job["_id"]})
+    if existing:
+        return post_summary(existing, existing["_id"], payload["model"])
+    
+    result = await generate_blog(
+        payload["idea"],
+        payload["model"],
+        job["user_id"],
+        force_refresh=payload.get("force_refresh", False),
+        mode=payload.get("mode", "single")
+    )
+    if not result.get("success"):
+        status_code = result.get("status_code", 500)
+        raise JobFailed(result.get("error", "Failed to generate blog post"), retryable=status_code >= 500)
+    
+    return await publish_generated_post(result, payload["model"], extra={"source_job_id": job["_id"]})
+
+
+class JobQueue:
+    """
+    Mongo-backed job queue drained by a bounded pool of asyncio workers
+    
+    Jobs are claimed atomically (find_one_and_update) and hold a lease that the
+    running worker renews. Jobs whose lease expires (worker crashed or was
+    killed mid-run) are put back in the queue on startup and periodically.
+    Retryable failures are requeued with an exponential backoff: the job is
+    not claimed again before its next_attempt_at.
+    """
+    
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.handlers = {
+            "generate_and_post": run_generate_and_post,
+        }
+        self._workers: List[asyncio.Task] = []
+        self._reaper: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running: Dict[ObjectId, asyncio.Task] = {}
+        self._cancelled = set()
+        
+        # Metrics
+        self._counters = {"enqueued": 0, "succeeded": 0, "failed": 0, "cancelled": 0, "recovered": 0}
+        self._queue_waits = deque(maxlen=500)
+        self._run_times = deque(maxlen=500)
+        self._finished_at = deque(maxlen=1000)
+    
+    @property
+    def collection(self):
+        return get_database()[JOBS_COLLECTION]
+    
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict,
+        user_id: str,
+        idempotency_key: Optional[str] = None
+    ) -> Dict:
+        """
+        Store a new job and wake a worker
+        
+        Args:
+            kind: Handler name (e.g. "generate_and_post")
+            payload: Handler input
+            user_id: User who submitted the job
+            idempotency_key: Client-supplied key; resubmitting returns the original job
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        
+        now = datetime.utcnow()
+        job = {
+            "kind": kind,
+            "payload": payload,
+            "user_id": user_id,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": settings.AI_JOB_MAX_ATTEMPTS,
+            "result": None,
+            "error": None,
+            "cancel_requested": False,
+            "next_attempt_at": now,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if idempotency_key:
+            job["idempotency_key"] = f"{user_id}:{idempotency_key}"
+        
+        try:
+            inserted = await self.collection.insert_one(job)
+            job["_id"] = inserted.inserted_id
+        except DuplicateKeyError:
+            return await self.collection.find_one({"idempotency_key": job["idempotency_key"]})
+        
+        self._counters["enqueued"] += 1
+        if self._wakeup:
+            self._wakeup.set()
+        return job
+    
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """Fetch a job by id"""
+        if not ObjectId.is_valid(job_id):
+            return None
+        return await self.collection.find_one({"_id": ObjectId(job_id)})
+    
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """Long-poll: return once the job reaches a terminal state or the timeout passes"""
+        deadline = time.monotonic() + timeout
+        job = await self.get(job_id)
+        while job and job["status"] not in TERMINAL_STATUSES and time.monotonic() < deadline:
+            await asyncio.sleep(min(0.5, max(0.0, deadline - time.monotonic())))
+            job = await self.get(job_id)
+        return job
+    
+    async def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a queued job immediately, or ask the worker running it to stop"""
+        if not ObjectId.is_valid(job_id):
+            return None
+        oid = ObjectId(job_id)
+        now = datetime.utcnow()
+        
+        job = await self.collection.find_one_and_update(
+            {"_id": oid, "status": "queued"},
+            {"$set": {"status": "cancelled", "finished_at": now, "updated_at": now}},
+            return_document=ReturnDocument.AFTER
+        )
+        if job:
+            self._counters["cancelled"] += 1
+            return job
+        
+        job = await self.collection.find_one_and_update(
+            {"_id": oid, "status": "running"},
+            {"$set": {"cancel_requested": True, "updated_at": now}},
+            return_document=ReturnDocument.AFTER
+        )
+        if job and oid in self._running:
+            self._cancelled.add(oid)
+            self._running[oid].cancel()
+        
+        return job or await self.get(job_id)
+    
+    async def recover_stale(self) -> int:
+        """Requeue (or fail, once out of attempts) running jobs whose lease has expired"""
+        now = datetime.utcnow()
+        stale = {"status": "running", "lease_expires_at": {"$lt": now}}
+        
+        failed = await self.collection.update_many(
+            {**stale, "$expr": {"$gte": ["$attempts", "$max_attempts"]}},
+            {"$set": {
+                "status": "failed",
+                "error": "Worker stopped while running the job",
+                "finished_at": now,
+                "updated_at": now,
+            }}
+        )
+        requeued = await self.collection.update_many(
+            stale,
+            {
+                "$set": {"status": "queued", "next_attempt_at": now, "updated_at": now},
+                "$unset": {"worker_id": "", "lease_expires_at": ""}
+            }
+        )
+        
+        recovered = failed.modified_count + requeued.modified_count
+        if recovered:
+            self._counters["recovered"] += recovered
+            print(f"♻️  Recovered {recovered} stale job(s)", file=sys.stderr)
+        return recovered
+    
+    async def _claim(self) -> Optional[Dict]:
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            # Retries wait for next_attempt_at (jobs queued before it existed have none)
+            {"status": "queued", "next_attempt_at": {"$not": {"$gt": now}}},
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": self.worker_id,
+                    "started_at": now,
+                    "updated_at": now,
+                    "lease_expires_at": now + timedelta(seconds=settings.AI_JOB_LEASE_SECONDS),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def _renew_lease(self, job_id: ObjectId, task: asyncio.Task):
+        """Keep the lease alive while the job runs and honour cancel requests from other workers"""
+        interval = settings.AI_JOB_LEASE_SECONDS / 3
+        while not task.done():
+            await asyncio.sleep(interval)
+            job = await self.collection.find_one_and_update(
+                {"_id": job_id, "worker_id": self.worker_id},
+                {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=settings.AI_JOB_LEASE_SECONDS)}},
+                projection={"cancel_requested": 1},
+                return_document=ReturnDocument.AFTER
+            )
+            if job is None or job.get("cancel_requested"):
+                self._cancelled.add(job_id)
+                task.cancel()
+    
+    async def _run_handler(self, handler, job: Dict):
+        # Runs in its own task: the job and everything it spawns share one retry budget
+        start_retry_budget()
+        return await handler(job)
+    
+    async def _run(self, job: Dict):
+        job_id = job["_id"]
+        handler = self.handlers[job["kind"]]
+        self._queue_waits.append((job["started_at"] - job["created_at"]).total_seconds())
+        started = time.monotonic()
+        
+        task = asyncio.create_task(self._run_handler(handler, job))
+        self._running[job_id] = task
+        heartbeat = asyncio.create_task(self._renew_lease(job_id, task))
+        
+        update = {}
+        try:
+            result = await task
+            update = {"status": "succeeded", "result": result, "error": None}
+        except asyncio.CancelledError:
+            if job_id not in self._cancelled:
+                # Worker shutting down - leave the job running so its lease expires and it is recovered
+                raise
+            update = {"status": "cancelled", "error": "Cancelled"}
+        except JobFailed as e:
+            retry = e.retryable and job["attempts"] < job["max_attempts"]
+            update = self._failure_update(job, retry, str(e))
+        except Exception as e:
+            print(f"ERROR in job {job_id}: {str(e)}", file=sys.stderr)
+            retry = job["attempts"] < job["max_attempts"]
+            update = self._failure_update(job, retry, str(e))
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job_id, None)
+            self._cancelled.discard(job_id)
+        
+        now = datetime.utcnow()
+        update["updated_at"] = now
+        if update["status"] in TERMINAL_STATUSES:
+            update["finished_at"] = now
+            self._counters[update["status"]] += 1
+            self._run_times.append(time.monotonic() - started)
+            self._finished_at.append(time.time())
+        
+        await self.collection.update_one(
+            {"_id": job_id, "worker_id": self.worker_id},
+            {"$set": update, "$unset": {"lease_expires_at": ""}}
+        )
+    
+    @staticmethod
+    def _failure_update(job: Dict, retry: bool, error: str) -> Dict:
+        """Fail the job, or requeue it after an exponential backoff so a failing upstream is not hammered"""
+        if not retry:
+            return {"status": "failed", "error": error}
+        delay = backoff_delay(
+            job["attempts"],
+            base=settings.AI_JOB_RETRY_BASE_SECONDS,
+            maximum=settings.AI_JOB_RETRY_MAX_SECONDS
+        )
+        return {
+            "status": "queued",
+            "error": error,
+            "next_attempt_at": datetime.utcnow() + timedelta(seconds=delay),
+        }
+    
+    async def _worker_loop(self):
+        while True:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                print(f"ERROR claiming job: {str(e)}", file=sys.stderr)
+                job = None
+            
+            if job is None:
+                # Sleep until a local enqueue or the poll interval (jobs from other workers)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=settings.AI_JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            await self._run(job)
+    
+    async def _reaper_loop(self):
+        while True:
+            await asyncio.sleep(settings.AI_JOB_LEASE_SECONDS)
+            try:
+                await self.recover_stale()
+            except Exception as e:
+                print(f"ERROR recovering jobs: {str(e)}", file=sys.stderr)
+    
+    async def start(self):
+        """Recover stale jobs and start the worker pool"""
+        if self._workers:
+            return
+        self._wakeup = asyncio.Event()
+        await self.recover_stale()
+        self._workers = [
+            asyncio.create_task(self._worker_loop())
+            for _ in range(settings.AI_JOB_WORKERS)
+        ]
+        self._reaper = asyncio.create_task(self._reaper_loop())
+        print(f"✅ Job queue started with {settings.AI_JOB_WORKERS} worker(s)")
+    
+    async def stop(self):
+        """Stop workers; jobs they were running are recovered once their lease expires"""
+        tasks = self._workers + ([self._reaper] if self._reaper else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._reaper = None
+    
+    def get_metrics(self) -> Dict:
+        """Throughput, queue wait and run time statistics for this worker process"""
+        def summarize(values) -> Dict:
+            if not values:
+                return {"count": 0, "avg": None, "p50": None, "p95": None}
+            ordered = sorted(values)
+            return {
+                "count": len(ordered),
+                "avg": round(sum(ordered) / len(ordered), 3),
+                "p50": round(ordered[len(ordered) // 2], 3),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            }
+        
+        now = time.time()
+        return {
+            "worker_id": self.worker_id,
+            "workers": len(self._workers),
+            "running": len(self._running),
+            "counters": dict(self._counters),
+            "throughput_per_minute": sum(1 for t in self._finished_at if now - t <= 60),
+            "queue_wait_seconds": summarize(self._queue_waits),
+            "run_time_seconds": summarize(self._run_times),
+        }
+    
+    async def get_queue_depth(self) -> Dict:
+        """Current number of jobs per status across all workers"""
+        pipeline = [{"$group": {"_id": "$status", "count": {"$sum": 1}}}]
+        depth = {}
+        async for row in self.collection.aggregate(pipeline):
+            depth[row["_id"]] = row["count"]
+        return depth
+
+
+def serialize_job(job: Dict) -> Dict:
+    """API representation of a job document"""
+    def iso(value):
+        return value.isoformat() if value else None
+    
+    return {
+        "job_id": str(job["_id"]),
+        "kind": job["kind"],
+        "status": job["status"],
+        "attempts": job.get("attempts", 0),
+        "payload": job.get("payload"),
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "cancel_requested": job.get("cancel_requested", False),
+        "created_at": iso(job.get("created_at")),
+        "started_at": iso(job.get("started_at")),
+        "next_attempt_at": iso(job.get("next_attempt_at")) if job["status"] == "queued" else None,
+        "finished_at": iso(job.get("finished_at")),
+    }
+
+
+# Singleton instance
+job_queue = JobQueue()
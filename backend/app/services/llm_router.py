@@ -0,0 +1,202 @@
+"""Latency- and error-aware routing between LLM providers"""
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..config import settings
+
+PROVIDERS = ("gpt", "gemini")
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+
+class ProviderStats:
+    """Rolling latency/error window plus a cumulative latency histogram"""
+    
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)  # (latency_seconds, ok)
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.calls = 0
+        self.errors = 0
+        self.cancelled = 0
+    
+    def record(self, latency: float, ok: bool):
+        self.samples.append((latency, ok))
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        for idx, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.histogram[idx] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+    
+    @property
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile of successful calls in the window"""
+        latencies = sorted(latency for latency, ok in self.samples if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    
+    def to_dict(self) -> Dict:
+        labels = [f"<={bound:g}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]:g}s"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "window_samples": len(self.samples),
+            "window_error_rate": round(self.error_rate, 3),
+            "p50_seconds": self.percentile(0.5),
+            "p90_seconds": self.percentile(0.9),
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+
+class LLMRouter:
+    """
+    Picks a provider for model "auto" and optionally hedges slow calls
+    
+    Providers are ranked healthy-first, then by rolling median latency;
+    providers without enough samples rank first so they get measured. With
+    hedging on, the next provider is started once the first one has run past
+    its p90 latency, and whichever returns a successful result first wins.
+    """
+    
+    def __init__(self):
+        self._stats = {name: ProviderStats(settings.LLM_ROUTER_WINDOW) for name in PROVIDERS}
+        self.decisions = deque(maxlen=50)
+    
+    def _enough_samples(self, name: str) -> bool:
+        return len(self._stats[name].samples) >= settings.LLM_ROUTER_MIN_SAMPLES
+    
+    def healthy(self, name: str) -> bool:
+        if not self._enough_samples(name):
+            return True
+        return self._stats[name].error_rate < settings.LLM_ROUTER_MAX_ERROR_RATE
+    
+    def rank(self, names: List[str]) -> List[str]:
+        """Order providers best-first"""
+        def score(name: str):
+            p50 = self._stats[name].percentile(0.5) if self._enough_samples(name) else None
+            return (not self.healthy(name), p50 or 0.0)
+        return sorted(names, key=score)
+    
+    def hedge_delay(self, name: str) -> float:
+        """How long to wait for a provider before starting a backup"""
+        p90 = self._stats[name].percentile(0.9) if self._enough_samples(name) else None
+        if p90 is None:
+            return settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+        return max(settings.LLM_HEDGE_MIN_DELAY_SECONDS, p90)
+    
+    async def call(self, name: str, factory: Callable[[], Awaitable[dict]]) -> dict:
+        """Run one provider call and record its latency and outcome"""
+        stats = self._stats[name]
+        started = time.monotonic()
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            raise
+        except Exception:
+            stats.record(time.monotonic() - started, False)
+            raise
+        stats.record(time.monotonic() - started, bool(result.get("success")))
+        return result
+    
+    async def run(
+        self,
+        candidates: List[Tuple[str, Callable[[], Awaitable[dict]]]],
+        hedge: Optional[bool] = None
+    ) -> dict:
+        """
+        Generate with the best candidate, hedging and failing over as needed
+        
+        Args:
+            candidates: (provider, factory) pairs, best first (see rank)
+            hedge: Start a backup after the primary's p90 (default LLM_HEDGE_ENABLED)
+        
+        Returns:
+            The first successful result, or the first failure if all failed
+        """
+        hedge = settings.LLM_HEDGE_ENABLED if hedge is None else hedge
+        queue = list(candidates)
+        decision = {
+            "at": datetime.utcnow().isoformat(),
+            "ranked": [name for name, _ in candidates],
+            "hedged": False,
+            "winner": None,
+        }
+        pending: Dict[asyncio.Task, str] = {}
+        first_failure = None
+        
+        def launch():
+            name, factory = queue.pop(0)
+            pending[asyncio.create_task(self.call(name, factory))] = name
+        
+        try:
+            launch()
+            primary = decision["ranked"][0]
+            started = time.monotonic()
+            
+            while pending:
+                timeout = None
+                if hedge and queue and not decision["hedged"]:
+                    timeout = max(0.0, self.hedge_delay(primary) - (time.monotonic() - started))
+                
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Primary is slower than usual - race the next provider against it
+                    decision["hedged"] = True
+                    launch()
+                    continue
+                
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is not None:
+                        outcome = {"success": False, "error": str(task.exception()), "status_code": 500}
+                    else:
+                        outcome = task.result()
+                    if outcome.get("success"):
+                        decision["winner"] = name
+                        outcome.setdefault("model", name)
+                        return outcome
+                    first_failure = first_failure or outcome
+                
+                if not pending and queue:
+                    # Everything in flight failed - fail over to the next provider
+                    launch()
+            
+            return first_failure
+        finally:
+            for task in pending:
+                task.cancel()
+            self.decisions.append(decision)
+    
+    def get_stats(self) -> Dict:
+        return {
+            "ranking": self.rank(list(PROVIDERS)),
+            "hedging_enabled": settings.LLM_HEDGE_ENABLED,
+            "providers": {
+                name: {
+                    **stats.to_dict(),
+                    "healthy": self.healthy(name),
+                    "hedge_delay_seconds": self.hedge_delay(name),
+                }
+                for name, stats in self._stats.items()
+            },
+            "recent_decisions": list(self.decisions),
+        }
+
+
+# Singleton instance
+llm_router = LLMRouter()
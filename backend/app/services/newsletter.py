@@ -0,0 +1,339 @@
+"""Newsletter subscribers and new-post fan-out"""
+import asyncio
+import html
+import secrets
+import sys
+from datetime import datetime, timedelta
+from string import Template
+from typing import Dict, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from ..config import settings
+from ..database import get_database, SUBSCRIBERS_COLLECTION, CAMPAIGNS_COLLECTION, EMAIL_OUTBOX_COLLECTION
+from .email_outbox import email_outbox
+
+# Post fields are filled in once per campaign; only $unsubscribe_url is left
+# for the per-recipient pass
+SUBJECT_TEMPLATE = Template("New post: $title")
+
+HTML_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .button { display: inline-block; padding: 12px 30px; background: #667eea; color: white; text-decoration: none; border-radius: 5px; margin: 20px 0; }
+        .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>$title</h1>
+        </div>
+        <div class="content">
+            $image
+            <p>$excerpt</p>
+            <p style="text-align: center;">
+                <a href="$post_url" class="button">Read the post</a>
+            </p>
+        </div>
+        <div class="footer">
+            <p>You are receiving this because you subscribed to new posts.</p>
+            <p><a href="$$unsubscribe_url">Unsubscribe</a></p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+TEXT_TEMPLATE = Template("""
+$title
+
+$excerpt
+
+Read the post: $post_url
+
+--
+You are receiving this because you subscribed to new posts.
+Unsubscribe: $$unsubscribe_url
+""")
+
+
+def _literal(value: str) -> str:
+    """Escape $ so substituted post text survives the per-recipient pass"""
+    return value.replace("$", "$$")
+
+
+def compile_campaign(campaign: Dict) -> Dict[str, Template]:
+    """
+    Render the newsletter templates for one post
+    
+    Returns:
+        subject/html/text templates whose only remaining placeholder is
+        $unsubscribe_url
+    """
+    post_url = f"{settings.FRONTEND_URL}/blog/{campaign['slug']}"
+    title = campaign.get("title") or ""
+    excerpt = campaign.get("excerpt") or ""
+    image = campaign.get("featured_image")
+    
+    html_values = {
+        "title": _literal(html.escape(title)),
+        "excerpt": _literal(html.escape(excerpt)),
+        "post_url": _literal(html.escape(post_url)),
+        "image": _literal(
+            f'<img src="{html.escape(image)}" alt="" style="max-width: 100%; border-radius: 5px;">' if image else ""
+        ),
+    }
+    text_values = {"title": _literal(title), "excerpt": _literal(excerpt), "post_url": _literal(post_url)}
+    
+    return {
+        "subject": Template(SUBJECT_TEMPLATE.substitute(title=_literal(title))),
+        "html": Template(HTML_TEMPLATE.substitute(html_values)),
+        "text": Template(TEXT_TEMPLATE.substitute(text_values)),
+    }
+
+
+def unsubscribe_url(token: str) -> str:
+    return f"{settings.FRONTEND_URL}/unsubscribe?token={token}"
+
+
+class NewsletterService:
+    """
+    Subscriber list and campaign fan-out
+    
+    Publishing a post creates one campaign (unique per post). A background
+    worker claims campaigns with a lease and walks the active subscribers in
+    _id order, NEWSLETTER_BATCH_SIZE at a time: each batch is rendered from
+    the precompiled templates and queued in the email outbox with one
+    insert_many, then the campaign's cursor is saved. A campaign interrupted
+    by a restart resumes from its cursor; the outbox's unique
+    (campaign_id, to) index drops anything queued twice.
+    """
+    
+    def __init__(self):
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+    
+    @property
+    def subscribers(self):
+        return get_database()[SUBSCRIBERS_COLLECTION]
+    
+    @property
+    def campaigns(self):
+        return get_database()[CAMPAIGNS_COLLECTION]
+    
+    async def subscribe(self, email: str) -> Dict:
+        """Add or reactivate a subscriber"""
+        now = datetime.utcnow()
+        return await self.subscribers.find_one_and_update(
+            {"email": email.lower()},
+            {
+                "$set": {"status": "active", "updated_at": now},
+                "$setOnInsert": {"unsubscribe_token": secrets.token_urlsafe(32), "created_at": now},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def unsubscribe(self, token: str) -> bool:
+        result = await self.subscribers.update_one(
+            {"unsubscribe_token": token},
+            {"$set": {"status": "unsubscribed", "updated_at": datetime.utcnow()}}
+        )
+        return result.matched_count > 0
+    
+    async def announce_post(self, post: Dict) -> Optional[ObjectId]:
+        """
+        Create the campaign for a newly published post
+        
+        Never raises - a failed announcement must not fail the publish.
+        
+        Returns:
+            The campaign id, or None if nothing was scheduled
+        """
+        if not post.get("published") or not email_outbox.is_configured():
+            return None
+        
+        campaign = {
+            "post_id": post["_id"],
+            "slug": post["slug"],
+            "title": post.get("title"),
+            "excerpt": post.get("excerpt"),
+            "featured_image": post.get("featured_image"),
+            "status": "queued",
+            "cursor": None,
+            "queued": 0,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            inserted = await self.campaigns.insert_one(campaign)
+        except DuplicateKeyError:
+            return None  # Already announced
+        except Exception as e:
+            print(f"⚠️  Could not schedule newsletter for post {post['_id']}: {str(e)}", file=sys.stderr)
+            return None
+        
+        if self._wakeup:
+            self._wakeup.set()
+        return inserted.inserted_id
+    
+    async def _claim(self) -> Optional[Dict]:
+        now = datetime.utcnow()
+        return await self.campaigns.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "queued"},
+                    {"status": "fanning_out", "lease_expires_at": {"$lt": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": "fanning_out",
+                    "lease_expires_at": now + timedelta(seconds=settings.NEWSLETTER_LEASE_SECONDS),
+                },
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def _fan_out(self, campaign: Dict):
+        templates = compile_campaign(campaign)
+        subject = templates["subject"].substitute()  # No per-recipient fields
+        
+        query = {"status": "active"}
+        if campaign.get("started_at") is None:
+            total = await self.subscribers.count_documents(query)
+            await self.campaigns.update_one(
+                {"_id": campaign["_id"]},
+                {"$set": {"started_at": datetime.utcnow(), "total": total}}
+            )
+        
+        cursor = campaign.get("cursor")
+        while True:
+            batch_query = dict(query, _id={"$gt": cursor}) if cursor else query
+            batch = await self.subscribers.find(
+                batch_query, {"email": 1, "unsubscribe_token": 1}
+            ).sort("_id", 1).limit(settings.NEWSLETTER_BATCH_SIZE).to_list(length=None)
+            if not batch:
+                break
+            
+            messages = []
+            for subscriber in batch:
+                link = unsubscribe_url(subscriber["unsubscribe_token"])
+                messages.append({
+                    "to": subscriber["email"],
+                    "subject": subject,
+                    "html_body": templates["html"].substitute(unsubscribe_url=html.escape(link)),
+                    "text_body": templates["text"].substitute(unsubscribe_url=link),
+                    "extra": {"campaign_id": campaign["_id"]},
+                })
+            queued = await email_outbox.enqueue_many(messages)
+            
+            cursor = batch[-1]["_id"]
+            await self.campaigns.update_one(
+                {"_id": campaign["_id"]},
+                {
+                    "$set": {
+                        "cursor": cursor,
+                        "lease_expires_at": datetime.utcnow() + timedelta(seconds=settings.NEWSLETTER_LEASE_SECONDS),
+                    },
+                    "$inc": {"queued": queued},
+                }
+            )
+        
+        await self.campaigns.update_one(
+            {"_id": campaign["_id"]},
+            {"$set": {"status": "fanned_out", "fanned_out_at": datetime.utcnow()}, "$unset": {"lease_expires_at": ""}}
+        )
+        print(f"✅ Newsletter for '{campaign['slug']}' queued", file=sys.stderr)
+    
+    async def _worker_loop(self):
+        while True:
+            try:
+                campaign = await self._claim()
+                if campaign is not None:
+                    await self._fan_out(campaign)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # The lease expires and the campaign resumes from its cursor
+                print(f"ERROR in newsletter fan-out: {str(e)}", file=sys.stderr)
+            
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.NEWSLETTER_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def start(self):
+        if self._worker is None and email_outbox.is_configured():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.create_task(self._worker_loop())
+    
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+    
+    async def get_campaign(self, campaign_id: str) -> Optional[Dict]:
+        """Campaign with delivery progress from the outbox"""
+        campaign = await self.campaigns.find_one({"_id": ObjectId(campaign_id)})
+        if campaign is None:
+            return None
+        
+        delivery = {
+            row["_id"]: row["count"]
+            async for row in get_database()[EMAIL_OUTBOX_COLLECTION].aggregate([
+                {"$match": {"campaign_id": campaign["_id"]}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ])
+        }
+        return serialize_campaign(campaign, delivery)
+    
+    async def list_campaigns(self, limit: int = 20) -> list:
+        campaigns = await self.campaigns.find().sort("created_at", -1).limit(limit).to_list(length=limit)
+        return [serialize_campaign(campaign) for campaign in campaigns]
+    
+    async def get_subscriber_counts(self) -> Dict:
+        return {
+            row["_id"]: row["count"]
+            async for row in self.subscribers.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+        }
+
+
+def serialize_campaign(campaign: Dict, delivery: Optional[Dict] = None) -> Dict:
+    def iso(value):
+        return value.isoformat() if value else None
+    
+    data = {
+        "id": str(campaign["_id"]),
+        "post_id": str(campaign["post_id"]),
+        "slug": campaign.get("slug"),
+        "title": campaign.get("title"),
+        "status": campaign["status"],
+        "total": campaign.get("total"),
+        "queued": campaign.get("queued", 0),
+        "created_at": iso(campaign.get("created_at")),
+        "started_at": iso(campaign.get("started_at")),
+        "fanned_out_at": iso(campaign.get("fanned_out_at")),
+    }
+    if delivery is not None:
+        data["delivery"] = delivery
+    return data
+
+
+# Singleton instance
+newsletter_service = NewsletterService()
@@ -0,0 +1,129 @@
+"""Process-wide cache of the portfolio document and its serialized sections"""
+import asyncio
+import sys
+from typing import Dict, Optional
+
+from ..config import settings
+from ..database import get_database, PORTFOLIO_COLLECTION
+from ..schemas.portfolio import PortfolioResponse
+
+
+def _json_list(items) -> bytes:
+    return b"[" + b",".join(item.model_dump_json().encode() for item in items) + b"]"
+
+
+class PortfolioCache:
+    """
+    The single portfolio document, validated and serialized once per change
+    
+    GET routes return the pre-serialized JSON bytes without touching Mongo.
+    Every write bumps the document's cache_version and loads the result here
+    (write-through); other worker processes notice the new version with a
+    cheap projected find_one every PORTFOLIO_CACHE_CHECK_SECONDS and reload.
+    """
+    
+    def __init__(self):
+        self.sections: Optional[Dict[str, bytes]] = None
+        self.document_id = None
+        self.version: Optional[int] = None
+        self.loaded = False
+        self._lock = asyncio.Lock()
+        self._poller: Optional[asyncio.Task] = None
+        self._counters = {"hits": 0, "reloads": 0, "remote_changes": 0}
+    
+    @property
+    def collection(self):
+        return get_database()[PORTFOLIO_COLLECTION]
+    
+    def load(self, portfolio: Optional[Dict]):
+        """Install a freshly read (or just written) portfolio document"""
+        if (
+            portfolio is not None
+            and portfolio["_id"] == self.document_id
+            and portfolio.get("cache_version", 0) < (self.version or 0)
+        ):
+            return  # A slower reader lost the race with a write-through
+        if portfolio is None:
+            self.sections = None
+            self.document_id = None
+            self.version = None
+        else:
+            # Stored documents are normalized on write (see migrate_portfolio.py)
+            full = PortfolioResponse(**portfolio)
+            self.sections = {
+                "full": full.model_dump_json().encode(),
+                "info": full.personal_info.model_dump_json().encode(),
+                "skills": _json_list(full.skills),
+                "projects": _json_list(full.projects),
+                "experience": _json_list(full.experience),
+            }
+            self.document_id = portfolio["_id"]
+            self.version = portfolio.get("cache_version", 0)
+        self.loaded = True
+        self._counters["reloads"] += 1
+    
+    async def refresh(self):
+        """Reload the document from Mongo"""
+        async with self._lock:
+            self.load(await self.collection.find_one({}))
+    
+    async def get(self, section: str) -> Optional[bytes]:
+        """
+        Serialized JSON for one section ("full", "info", "skills", "projects", "experience")
+        
+        Returns:
+            None if there is no portfolio document
+        """
+        if not self.loaded:
+            await self.refresh()
+        self._counters["hits"] += 1
+        return self.sections[section] if self.sections else None
+    
+    async def _check_version(self):
+        current = await self.collection.find_one({}, {"cache_version": 1})
+        if current is None:
+            changed = self.document_id is not None
+        else:
+            changed = current["_id"] != self.document_id or current.get("cache_version", 0) != self.version
+        if changed:
+            self._counters["remote_changes"] += 1
+            await self.refresh()
+    
+    async def _poll_loop(self):
+        while True:
+            await asyncio.sleep(settings.PORTFOLIO_CACHE_CHECK_SECONDS)
+            try:
+                await self._check_version()
+            except Exception as e:
+                print(f"ERROR checking portfolio version: {str(e)}", file=sys.stderr)
+    
+    async def start(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            # Not fatal - the first request retries the load
+            self.loaded = False
+            print(f"⚠️  Could not load portfolio cache: {str(e)}", file=sys.stderr)
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll_loop())
+    
+    async def stop(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+    
+    def get_stats(self) -> Dict:
+        return {
+            "loaded": self.loaded,
+            "version": self.version,
+            "sections": {name: len(data) for name, data in (self.sections or {}).items()},
+            **self._counters,
+        }
+
+
+# Singleton instance
+portfolio_cache = PortfolioCache()
@@ -0,0 +1,154 @@
+"""Sectioned generation: outline first, then sections in parallel"""
+import asyncio
+import sys
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ..config import settings
+from ..utils.llm_json import extract_json_object
+from ..utils.resilience import CircuitOpenError, backoff_delay, current_retry_budget
+from .ai_service import validate_and_fix_images, _normalize_list
+
+# complete(prompt, json_output=False, max_tokens=2000) -> text
+CompletionFn = Callable[..., Awaitable[str]]
+
+
+def _outline_prompt(idea: str, sections: int, words: int) -> str:
+    return f"""Plan a blog post about: {idea}
+
+The finished post will be about {words} words, written by Yohans (John), a
+Software Engineer who writes casual, personal tech blogs - conversational,
+short paragraphs, real opinions, no corporate jargon.
+
+Return ONLY a JSON object with this structure:
+{{
+  "title": "Catchy, conversational title",
+  "excerpt": "Hook the reader in 2 sentences",
+  "tags": "tag1, tag2, tag3, tag4, tag5",
+  "category": "Web Development",
+  "featured_image": "https://images.unsplash.com/photo-relevant-id",
+  "sections": [
+    {{"heading": "Section heading", "points": ["what this section covers", "..."]}}
+  ]
+}}
+
+Use between 3 and {sections} sections. The first section is the hook/intro and
+the last one wraps up with a personal thought or question for readers."""
+
+
+def _section_prompt(idea: str, outline: Dict, index: int, words: int) -> str:
+    section = outline["sections"][index]
+    plan = "\n".join(
+        f"{i + 1}. {s.get('heading', '')}" + (" <- WRITE THIS ONE" if i == index else "")
+        for i, s in enumerate(outline["sections"])
+    )
+    points = "\n".join(f"- {point}" for point in section.get("points", []))
+    return f"""You are writing one section of the blog post "{outline.get('title', idea)}" (topic: {idea}).
+
+Full outline:
+{plan}
+
+Write section {index + 1}: "{section.get('heading', '')}"
+Cover:
+{points or '- whatever fits the heading'}
+
+Rules:
+- About {words} words, markdown, short paragraphs, bullet points where useful
+- Personal, conversational tone ("I", "you", "we"), code examples only if relevant
+- Do NOT repeat the section heading and do NOT write other sections
+- Return only the section body - no JSON, no preamble"""
+
+
+async def _write_section(complete: CompletionFn, prompt: str, words: int) -> str:
+    """
+    Generate one section, retrying it on its own if the model returns nothing
+    
+    complete() raises ValueError on empty output; that (or blank text) is
+    retried here, charged to the request's retry budget. Transport errors
+    were already retried by resilient_call and propagate.
+    """
+    attempts = settings.SECTIONED_SECTION_ATTEMPTS
+    error = ValueError("Empty section")
+    for attempt in range(1, attempts + 1):
+        try:
+            text = (await complete(prompt, max_tokens=max(512, words * 3))).strip()
+        except ValueError as e:
+            text, error = "", e
+        if text:
+            return text
+        if attempt == attempts or not current_retry_budget().spend():
+            break
+        print(f"⚠️  Section attempt {attempt} came back empty, retrying", file=sys.stderr)
+        await asyncio.sleep(backoff_delay(attempt))
+    raise error
+
+
+async def generate_sectioned(idea: str, complete: CompletionFn, model: Optional[str] = None) -> dict:
+    """
+    Generate a long post as an outline plus concurrently written sections
+    
+    Args:
+        idea: The topic or idea for the blog post
+        complete: Raw completion function of the chosen provider
+        model: Model identifier to attach to the result (optional)
+    
+    Returns:
+        dict shaped like parse_blog_response's result, or a failure dict with
+        'status_code' if the outline or any section could not be generated
+    """
+    total_words = settings.SECTIONED_TARGET_WORDS
+    try:
+        outline, _ = extract_json_object(await complete(
+            _outline_prompt(idea, settings.SECTIONED_MAX_SECTIONS, total_words),
+            json_output=True
+        ))
+    except CircuitOpenError as e:
+        return {"success": False, "error": str(e), "status_code": 503}
+    except Exception as e:
+        return {"success": False, "error": f"Failed to generate outline: {str(e)}", "status_code": 502}
+    
+    sections: List[Dict] = [
+        s for s in outline.get("sections") or [] if isinstance(s, dict) and s.get("heading")
+    ][:settings.SECTIONED_MAX_SECTIONS]
+    if not sections:
+        return {"success": False, "error": "Outline contained no sections", "status_code": 502}
+    outline["sections"] = sections
+    
+    words = max(150, total_words // len(sections))
+    semaphore = asyncio.Semaphore(settings.SECTIONED_CONCURRENCY)
+    
+    async def run(index: int) -> str:
+        async with semaphore:
+            return await _write_section(complete, _section_prompt(idea, outline, index, words), words)
+    
+    bodies = await asyncio.gather(*(run(i) for i in range(len(sections))), return_exceptions=True)
+    
+    failed = [sections[i]["heading"] for i, body in enumerate(bodies) if isinstance(body, BaseException)]
+    if failed:
+        open_circuit = any(isinstance(body, CircuitOpenError) for body in bodies)
+        return {
+            "success": False,
+            "error": f"Failed to generate section(s): {', '.join(failed)}",
+            "status_code": 503 if open_circuit else 502
+        }
+    
+    content = "\n\n".join(
+        f"## {section['heading']}\n\n{body}" for section, body in zip(sections, bodies)
+    )
+    
+    featured_image, images = await validate_and_fix_images(outline.get("featured_image"), [], idea)
+    
+    result = {
+        "success": True,
+        "title": outline.get("title") or f"Blog Post: {idea[:50]}",
+        "excerpt": outline.get("excerpt", ""),
+        "content": content,
+        "tags": _normalize_list(outline.get("tags", "AI Generated,Blog"), ["AI Generated", "Blog"]),
+        "category": outline.get("category", "general"),
+        "featured_image": featured_image,
+        "images": images,
+        "mode": "sectioned",
+        "sections": len(sections),
+    }
+    if model:
+        result["model"] = model
+    return result
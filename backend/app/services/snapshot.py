@@ -0,0 +1,417 @@
+"""Prebuilt, pre-compressed JSON snapshots of the public read endpoints"""
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+from ..config import settings
+from ..database import get_database, POSTS_COLLECTION
+from ..utils.posts import LIST_PROJECTION
+from ..utils.serializers import dump_posts_list, dump_post
+from .home import compose_home_bundle
+from .portfolio_cache import portfolio_cache
+
+try:
+    import brotli
+except ImportError:  # Snapshots are then written with gzip only
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows - builds of several workers are then not serialized
+    fcntl = None
+
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "build.lock"
+
+# Bump when the rendered post payload changes so entries of older builds are not reused
+RENDER_VERSION = "1"
+
+
+def post_key(slug: str) -> str:
+    return f"post:{slug}"
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _post_version(post: Dict) -> Optional[str]:
+    """Stamp recorded with a rendered post; the post is rendered again once it (or its view count) changes"""
+    updated_at = post.get("updated_at")
+    if updated_at is None:
+        return None
+    return f"{RENDER_VERSION}|{updated_at}|{post.get('views', 0)}"
+
+
+def _write_payload(directory: Path, kind: str, data: bytes, gzip_level: int = 9, brotli_quality: int = 11) -> Dict:
+    """
+    Write one payload as <kind>.<hash>.json plus .gz/.br variants
+    
+    Files are content-addressed, so an unchanged payload is not rewritten or
+    recompressed.
+    """
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    name = f"{kind}.{digest}.json"
+    encodings = {"identity": name, "gzip": f"{name}.gz"}
+    if brotli is not None:
+        encodings["br"] = f"{name}.br"
+    
+    if not (directory / name).exists():
+        _write_atomic(directory / encodings["gzip"], gzip.compress(data, compresslevel=gzip_level, mtime=0))
+        if brotli is not None:
+            _write_atomic(directory / encodings["br"], brotli.compress(data, quality=brotli_quality))
+        _write_atomic(directory / name, data)  # Written last: its presence means the set is complete
+    return {"etag": f'"{digest}"', "files": encodings}
+
+
+class SnapshotStore:
+    """
+    Builds and looks up the public payload snapshots
+    
+    A build renders GET /api/portfolio, GET /api/home, the default first page
+    of GET /api/posts and every published post to SNAPSHOT_DIR. It then swaps
+    in a manifest.json that maps keys ("portfolio", "home", "posts",
+    "post:<slug>") to the content-hashed files. Writes to posts or the
+    portfolio schedule a debounced rebuild. Until it finishes, this worker
+    stops serving snapshots and falls back to Mongo. Other workers on the
+    same disk reload the manifest when its mtime changes.
+    
+    Builds are incremental and shared: workers take a file lock in SNAPSHOT_DIR
+    so only one builds at a time, and each build starts from the newest
+    manifest on disk. A post is only loaded and rendered again when its
+    updated_at or view count differs from the stamp recorded in the manifest,
+    so the workers starting together render the posts once. View flushes
+    trigger a refresh every SNAPSHOT_VIEWS_REFRESH_SECONDS that keeps
+    serving the current snapshot meanwhile. Files rendered by the first
+    build of a process use the highest compression levels, later ones the
+    cheaper SNAPSHOT_REBUILD_* levels.
+    """
+    
+    def __init__(self):
+        self.directory = Path(settings.SNAPSHOT_DIR)
+        self.manifest: Dict[str, Dict] = {}
+        self._previous_files: set = set()
+        self._manifest_mtime = 0.0
+        self._checked_at = 0.0
+        self._dirty = True
+        self._pending: Optional[asyncio.Task] = None
+        self._views_changed = False
+        self._views_refresher: Optional[asyncio.Task] = None
+        self._build_lock = asyncio.Lock()
+        self._counters = {
+            "builds": 0, "hits": 0, "misses": 0, "posts_rendered": 0, "posts_reused": 0, "views_refreshes": 0,
+        }
+        self.last_build_seconds = 0.0
+    
+    async def build(self):
+        """Render changed public payloads and publish a new manifest"""
+        async with self._build_lock, self._disk_lock():
+            started = time.monotonic()
+            self._dirty = False  # Writes during the build mark it dirty again
+            db = get_database()
+            posts_collection = db[POSTS_COLLECTION]
+            page_size = settings.SNAPSHOT_PAGE_SIZE
+            published = {"published": True}
+            
+            portfolio, total, first_page, index, tags, categories = await asyncio.gather(
+                portfolio_cache.get("full"),
+                posts_collection.count_documents(published),
+                posts_collection.find(published, LIST_PROJECTION)
+                .sort("created_at", -1).limit(page_size).to_list(length=page_size),
+                posts_collection.find(published, {"slug": 1, "updated_at": 1, "views": 1}).to_list(length=None),
+                posts_collection.distinct("tags", published),
+                posts_collection.distinct("category", published),
+            )
+            
+            # Start from the newest manifest on disk (another worker may have built it)
+            self._maybe_reload_manifest(force=True)
+            reused = await asyncio.to_thread(self._reusable_entries, index)
+            render_ids = [post["_id"] for post in index if post_key(post["slug"]) not in reused]
+            posts = await posts_collection.find(
+                {"_id": {"$in": render_ids}, **published}
+            ).to_list(length=None) if render_ids else []
+            
+            first_page_json = dump_posts_list(first_page, total, 1, page_size)
+            payloads = {
+                "posts": ("posts", first_page_json),
+                "home": ("home", compose_home_bundle(portfolio, first_page_json, tags, categories)),
+            }
+            if portfolio is not None:
+                payloads["portfolio"] = ("portfolio", portfolio)
+            post_meta = {}
+            for post in posts:
+                payloads[post_key(post["slug"])] = ("post", dump_post(post))
+                post_meta[post_key(post["slug"])] = {"post_id": str(post["_id"]), "version": _post_version(post)}
+            
+            if self._counters["builds"] == 0:
+                levels = (9, 11)
+            else:
+                levels = (settings.SNAPSHOT_REBUILD_GZIP_LEVEL, settings.SNAPSHOT_REBUILD_BROTLI_QUALITY)
+            manifest = await asyncio.to_thread(self._write_all, payloads, post_meta, reused, levels)
+            self._install(manifest)
+            self._counters["builds"] += 1
+            self._counters["posts_rendered"] += len(posts)
+            self._counters["posts_reused"] += len(reused)
+            self.last_build_seconds = time.monotonic() - started
+            print(
+                f"✅ Snapshot built: {len(posts)} posts rendered, {len(reused)} reused "
+                f"in {self.last_build_seconds:.2f}s",
+                file=sys.stderr
+            )
+    
+    @asynccontextmanager
+    async def _disk_lock(self):
+        """Serialize builds of all workers sharing SNAPSHOT_DIR"""
+        if fcntl is None:
+            yield
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle = open(self.directory / LOCK_NAME, "a")
+        try:
+            await asyncio.to_thread(fcntl.flock, handle, fcntl.LOCK_EX)
+            yield
+        finally:
+            handle.close()  # Releases the lock
+    
+    def _reusable_entries(self, index: List[Dict]) -> Dict[str, Dict]:
+        """Manifest entries of posts unchanged since they were rendered (and whose files still exist)"""
+        reused = {}
+        for post in index:
+            key = post_key(post["slug"])
+            entry = self.manifest.get(key)
+            version = _post_version(post)
+            if (
+                entry is not None
+                and version is not None
+                and entry.get("version") == version
+                and entry.get("post_id") == str(post["_id"])
+                and (self.directory / entry["files"]["identity"]).exists()
+            ):
+                reused[key] = entry
+        return reused
+    
+    def _write_all(self, payloads: Dict[str, tuple], post_meta: Dict[str, Dict], reused: Dict[str, Dict],
+                   levels: tuple) -> Dict[str, Dict]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = dict(reused)
+        for key, (kind, data) in payloads.items():
+            entry = _write_payload(self.directory, kind, data, *levels)
+            entry.update(post_meta.get(key, {}))
+            manifest[key] = entry
+        
+        _write_atomic(self.directory / MANIFEST_NAME, json.dumps(manifest).encode())
+        self._remove_stale(manifest)
+        return manifest
+    
+    def _remove_stale(self, manifest: Dict[str, Dict]):
+        """
+        Delete old files no manifest refers to any more
+        
+        Files stay for SNAPSHOT_GRACE_SECONDS after they were written so that
+        workers still on an older manifest (and their clients) can finish.
+        """
+        keep = {name for entry in manifest.values() for name in entry["files"].values()}
+        keep |= self._previous_files
+        keep.update((MANIFEST_NAME, LOCK_NAME))
+        cutoff = time.time() - settings.SNAPSHOT_GRACE_SECONDS
+        for path in self.directory.iterdir():
+            if path.name in keep:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+    
+    def _install(self, manifest: Dict[str, Dict]):
+        self._previous_files = {name for entry in self.manifest.values() for name in entry["files"].values()}
+        self.manifest = manifest
+        try:
+            self._manifest_mtime = (self.directory / MANIFEST_NAME).stat().st_mtime
+        except OSError:
+            pass
+    
+    def _maybe_reload_manifest(self, force: bool = False):
+        """Pick up a manifest written by another worker (checked at most once a second)"""
+        now = time.monotonic()
+        if now - self._checked_at < 1.0 and not force:
+            return
+        self._checked_at = now
+        path = self.directory / MANIFEST_NAME
+        try:
+            mtime = path.stat().st_mtime
+            if mtime != self._manifest_mtime:
+                self._install(json.loads(path.read_bytes()))
+                self._manifest_mtime = mtime
+        except (OSError, ValueError):
+            pass
+    
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Manifest entry for a key, or None if the caller should query Mongo"""
+        if not settings.SNAPSHOT_ENABLED or self._dirty:
+            self._counters["misses"] += 1
+            return None
+        self._maybe_reload_manifest()
+        entry = self.manifest.get(key)
+        self._counters["hits" if entry else "misses"] += 1
+        return entry
+    
+    def files_for(self, name: str) -> Optional[Dict[str, str]]:
+        """Encoded variants of a snapshot file of the current or previous build, by its .json name"""
+        self._maybe_reload_manifest()
+        if not name.endswith(".json"):
+            return None
+        current = {file for entry in self.manifest.values() for file in entry["files"].values()}
+        if name not in current and name not in self._previous_files:
+            return None
+        files = {"identity": name, "gzip": f"{name}.gz"}
+        if brotli is not None:
+            files["br"] = f"{name}.br"
+        return files
+    
+    def urls(self) -> Dict[str, Dict]:
+        """Key -> immutable URL and ETag of the current build"""
+        self._maybe_reload_manifest()
+        return {
+            key: {"url": f"/api/snapshots/{entry['files']['identity']}", "etag": entry["etag"]}
+            for key, entry in self.manifest.items()
+        }
+    
+    def schedule(self):
+        """Rebuild soon; several writes in a row coalesce into one build"""
+        if not settings.SNAPSHOT_ENABLED:
+            return
+        self._dirty = True
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.create_task(self._debounced_build())
+    
+    async def _debounced_build(self):
+        delay = settings.SNAPSHOT_DEBOUNCE_SECONDS
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.build()
+                delay = settings.SNAPSHOT_DEBOUNCE_SECONDS
+            except Exception as e:
+                # Stay dirty (Mongo fallback) and try again later
+                self._dirty = True
+                delay = settings.SNAPSHOT_RETRY_SECONDS
+                print(f"ERROR building snapshot: {str(e)}", file=sys.stderr)
+            if not self._dirty:
+                return
+            # A write arrived while building - go again
+    
+    def views_changed(self):
+        """View counts were written; re-render those posts with the next views refresh"""
+        self._views_changed = True
+    
+    async def _views_loop(self):
+        while True:
+            await asyncio.sleep(settings.SNAPSHOT_VIEWS_REFRESH_SECONDS)
+            if not self._views_changed:
+                continue
+            self._views_changed = False
+            try:
+                # Not marked dirty: the current snapshot is served until the refresh is in
+                await self.build()
+                self._counters["views_refreshes"] += 1
+            except Exception as e:
+                print(f"ERROR refreshing snapshot views: {str(e)}", file=sys.stderr)
+    
+    async def start(self):
+        if settings.SNAPSHOT_ENABLED:
+            self.schedule()
+            if self._views_refresher is None:
+                self._views_refresher = asyncio.create_task(self._views_loop())
+    
+    async def stop(self):
+        for task in (self._pending, self._views_refresher):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._pending = None
+        self._views_refresher = None
+    
+    def get_stats(self) -> Dict:
+        return {
+            "enabled": settings.SNAPSHOT_ENABLED,
+            "dirty": self._dirty,
+            "entries": len(self.manifest),
+            "brotli": brotli is not None,
+            "last_build_seconds": round(self.last_build_seconds, 3),
+            **self._counters,
+        }
+
+
+# Singleton instance
+snapshot_store = SnapshotStore()
+
+
+def _accepted_encodings(header: str) -> set:
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                pass
+        if token and quality > 0:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+def snapshot_response(request: Request, entry: Optional[Dict]) -> Optional[Response]:
+    """
+    Serve a snapshot (a SnapshotStore.lookup entry) in the best encoding the client accepts
+    
+    Returns:
+        None if there is no usable snapshot (query Mongo instead)
+    """
+    if entry is None:
+        return None
+    
+    headers = {
+        "ETag": entry["etag"],
+        "Cache-Control": (
+            f"public, max-age={settings.SNAPSHOT_MAX_AGE_SECONDS}, "
+            f"stale-while-revalidate={settings.SNAPSHOT_STALE_SECONDS}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+    if request.headers.get("if-none-match") == entry["etag"]:
+        return Response(status_code=304, headers=headers)
+    
+    return encoded_file_response(request, entry["files"], headers)
+
+
+def encoded_file_response(request: Request, files: Dict[str, str], headers: Dict[str, str]) -> Optional[Response]:
+    """FileResponse for the best variant in files (encoding -> name), or None if it is gone"""
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    encoding = next((name for name in ("br", "gzip") if name in accepted and name in files), "identity")
+    path = snapshot_store.directory / files[encoding]
+    if not path.exists():
+        return None
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return FileResponse(
+        path,
+        media_type="application/json",
+        headers=headers
+    )
@@ -0,0 +1,130 @@
+"""Cached, single-flight Open Arena token validation"""
+import asyncio
+import hashlib
+import time
+from typing import Dict, Optional
+
+from ..config import settings
+from .ai_service import validate_token
+
+
+class TokenValidationCache:
+    """
+    In-memory cache in front of validate_token
+    
+    Entries are keyed by a SHA-256 of the token, so concurrent requests for the
+    same token share one upstream call and later requests answer from memory.
+    A background refresher re-validates recently used tokens before they expire.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, Dict] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refresher: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+    
+    def _ttl_for(self, result: Dict) -> float:
+        # Definitive answers (valid / rejected) live longer than transient errors
+        error = result.get("error", "")
+        if result.get("valid") or error == "Token is expired or invalid":
+            return settings.TOKEN_VALIDATION_TTL_SECONDS
+        return settings.TOKEN_VALIDATION_ERROR_TTL_SECONDS
+    
+    async def _fetch(self, key: str, token: str) -> Dict:
+        try:
+            result = await validate_token(token)
+            now = time.monotonic()
+            entry = self._entries.get(key, {})
+            self._entries[key] = {
+                "token": token,
+                "result": result,
+                "expires_at": now + self._ttl_for(result),
+                "last_used": entry.get("last_used", now),
+            }
+            return result
+        finally:
+            self._inflight.pop(key, None)
+    
+    async def validate(self, token: str, force: bool = False) -> Dict:
+        """
+        Validate a token, answering from cache when possible
+        
+        Args:
+            token: Open Arena ESSO token
+            force: Skip the cache and re-validate against the API
+        
+        Returns:
+            dict with 'valid' (bool) and 'error' (str if invalid), as validate_token
+        """
+        key = self._key(token)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        
+        if entry:
+            entry["last_used"] = now
+            if not force and entry["expires_at"] > now:
+                self.hits += 1
+                return entry["result"]
+        
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, token))
+            self._inflight[key] = task
+        # Shield so one caller disconnecting doesn't cancel the shared check
+        return await asyncio.shield(task)
+    
+    def invalidate(self, token: str):
+        """Drop a token from the cache (e.g. when it is removed or replaced)"""
+        self._entries.pop(self._key(token), None)
+    
+    async def _refresh_loop(self):
+        interval = settings.TOKEN_VALIDATION_REFRESH_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for key, entry in list(self._entries.items()):
+                if now - entry["last_used"] > settings.TOKEN_VALIDATION_IDLE_SECONDS:
+                    self._entries.pop(key, None)
+                    continue
+                # Refresh anything that would expire before the next pass
+                if entry["expires_at"] - now <= interval and key not in self._inflight:
+                    task = asyncio.create_task(self._fetch(key, entry["token"]))
+                    self._inflight[key] = task
+                    try:
+                        await task
+                    except Exception:
+                        pass
+    
+    async def start(self):
+        """Start the background refresher"""
+        if self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh_loop())
+    
+    async def stop(self):
+        """Stop the background refresher"""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+    
+    def get_stats(self) -> Dict:
+        """Cache hit/miss counters"""
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Singleton instance
+token_validator = TokenValidationCache()
@@ -0,0 +1,73 @@
+"""Buffered post view counting"""
+import asyncio
+import sys
+from collections import Counter
+from typing import Dict, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from ..config import settings
+from ..database import get_database, POSTS_COLLECTION
+from .snapshot import snapshot_store
+
+
+class ViewCounter:
+    """
+    Collects post views in memory and writes them with one bulk_write
+    
+    Post pages can then be served without a Mongo round trip (e.g. from the
+    static snapshot, which re-renders posts whose counts were flushed).
+    Views are flushed every VIEW_FLUSH_SECONDS and on shutdown; a crash
+    loses at most one interval of counts.
+    """
+    
+    def __init__(self):
+        self._pending: Counter = Counter()
+        self._flusher: Optional[asyncio.Task] = None
+        self.flushed = 0
+    
+    def record(self, post_id):
+        self._pending[str(post_id)] += 1
+    
+    async def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, Counter()
+        operations = [
+            UpdateOne({"_id": ObjectId(post_id)}, {"$inc": {"views": count}})
+            for post_id, count in pending.items()
+        ]
+        try:
+            await get_database()[POSTS_COLLECTION].bulk_write(operations, ordered=False)
+            self.flushed += sum(pending.values())
+            snapshot_store.views_changed()
+        except Exception as e:
+            self._pending.update(pending)  # Retry with the next flush
+            print(f"ERROR flushing post views: {str(e)}", file=sys.stderr)
+    
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(settings.VIEW_FLUSH_SECONDS)
+            await self.flush()
+    
+    async def start(self):
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+    
+    def get_stats(self) -> Dict:
+        return {"pending": sum(self._pending.values()), "flushed": self.flushed}
+
+
+# Singleton instance
+view_counter = ViewCounter()
@@ -0,0 +1,235 @@
+"""Helpers for JSON produced by LLMs"""
+import json
+from typing import Optional, Tuple
+
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    '\\': '\\',
+    '/': '/',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+}
+
+
+class StreamingFieldParser:
+    """
+    Incrementally decode one string field of a JSON object as it streams in
+    
+    Feed raw model output chunk by chunk; each call returns the newly decoded
+    text of the target field (e.g. the markdown "content" of a blog envelope),
+    so it can be forwarded to the client before the JSON object is complete.
+    """
+    
+    def __init__(self, field: str = "content"):
+        self.marker = f'"{field}"'
+        self._buffer = ""
+        self._state = "search"  # search -> colon -> value -> done
+        self._pending = ""  # Incomplete escape sequence carried over between chunks
+    
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+    
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk of raw output and return decoded field text (may be empty)"""
+        if self._state == "done" or not chunk:
+            return ""
+        
+        text = self._buffer + chunk
+        self._buffer = ""
+        pos = 0
+        
+        if self._state == "search":
+            idx = text.find(self.marker)
+            if idx == -1:
+                # Keep a tail in case the marker is split across chunks
+                self._buffer = text[-len(self.marker):]
+                return ""
+            pos = idx + len(self.marker)
+            self._state = "colon"
+        
+        if self._state == "colon":
+            while pos < len(text) and text[pos] in ' \t\r\n:':
+                pos += 1
+            if pos >= len(text):
+                return ""
+            if text[pos] != '"':
+                # Field is not a string value; give up on incremental decoding
+                self._state = "done"
+                return ""
+            pos += 1
+            self._state = "value"
+        
+        return self._decode(text[pos:])
+    
+    def _decode(self, text: str) -> str:
+        text = self._pending + text
+        self._pending = ""
+        out = []
+        i = 0
+        length = len(text)
+        
+        while i < length:
+            ch = text[i]
+            if ch == '"':
+                self._state = "done"
+                break
+            if ch != '\\':
+                out.append(ch)
+                i += 1
+                continue
+            
+            # Escape sequence - may be cut off at the end of the chunk
+            if i + 1 >= length:
+                self._pending = text[i:]
+                break
+            esc = text[i + 1]
+            if esc == 'u':
+                if i + 6 > length:
+                    self._pending = text[i:]
+                    break
+                try:
+                    out.append(chr(int(text[i + 2:i + 6], 16)))
+                except ValueError:
+                    out.append(text[i:i + 6])
+                i += 6
+                continue
+            out.append(_SIMPLE_ESCAPES.get(esc, esc))
+            i += 2
+        
+        return "".join(out)
+
+
+def _string_end(text: str, quote: int) -> int:
+    """Index of the quote closing the string opened at `quote`, or -1 if truncated"""
+    j = text.find('"', quote + 1)
+    while j != -1:
+        # A quote is escaped only when preceded by an odd number of backslashes
+        k = j - 1
+        while text[k] == '\\':
+            k -= 1
+        if (j - 1 - k) % 2 == 0:
+            return j
+        j = text.find('"', j + 1)
+    return -1
+
+
+def extract_json_object(text: str) -> Tuple[dict, bool]:
+    """
+    Extract the first JSON object from model output without regexes
+    
+    Well-formed output is handed straight to json.loads. Otherwise a single
+    pass skips any preface text or markdown fences, tracks string/escape state and
+    brace depth to find where the object ends, and tolerates raw control
+    characters inside strings. If the output was cut off (e.g. by a token
+    limit), the open string, key/value and containers are closed so the
+    fields produced so far are kept.
+    
+    Returns:
+        (data, repaired) - repaired is True when the object had to be completed
+        
+    Raises:
+        ValueError: if no JSON object can be recovered
+    """
+    start = text.find('{')
+    if start == -1:
+        raise ValueError("No JSON found in response")
+    
+    # Fast path: the common well-formed case is parsed entirely by the C decoder
+    end = text.rfind('}')
+    if end > start:
+        try:
+            data = json.loads(text[start:end + 1], strict=False)
+            if isinstance(data, dict):
+                return data, False
+        except ValueError:
+            pass
+    
+    # Each frame is [container, expecting] where expecting is one of
+    # key / colon / value / comma
+    stack = []
+    scalar_start = None
+    i = start
+    n = len(text)
+    
+    while i < n:
+        ch = text[i]
+        
+        if scalar_start is not None and ch in ',}] \t\r\n':
+            scalar_start = None
+            stack[-1][1] = 'comma'
+        
+        if ch == '"':
+            end = _string_end(text, i)
+            if end == -1:
+                return _repair(text, start, stack, string_start=i), True
+            top = stack[-1]
+            top[1] = 'colon' if top[0] == '{' and top[1] == 'key' else 'comma'
+            i = end + 1
+            continue
+        
+        if ch == '{' or ch == '[':
+            stack.append([ch, 'key' if ch == '{' else 'value'])
+        elif ch == '}' or ch == ']':
+            stack.pop()
+            if not stack:
+                return json.loads(text[start:i + 1], strict=False), False
+            stack[-1][1] = 'comma'
+        elif ch == ':':
+            stack[-1][1] = 'value'
+        elif ch == ',':
+            stack[-1][1] = 'key' if stack[-1][0] == '{' else 'value'
+        elif ch not in ' \t\r\n' and scalar_start is None:
+            scalar_start = i
+        i += 1
+    
+    return _repair(text, start, stack, scalar_start=scalar_start), True
+
+
+def _repair(text: str, start: int, stack: list, string_start: Optional[int] = None,
+            scalar_start: Optional[int] = None) -> dict:
+    """Close a truncated JSON object and parse it"""
+    body = text[start:]
+    top = stack[-1]
+    
+    if string_start is not None:
+        if top[0] == '{' and top[1] == 'key':
+            # Half-written key - drop it
+            body = body[:string_start - start]
+        else:
+            tail = len(body) - len(body.rstrip('\\'))
+            if tail % 2:
+                body = body[:-1]  # Dangling escape character
+            body += '"'
+            top[1] = 'comma'
+    elif scalar_start is not None:
+        token = text[scalar_start:].strip()
+        try:
+            json.loads(token)
+            top[1] = 'comma'
+        except ValueError:
+            body = body[:scalar_start - start]  # Partial number/true/false/null
+    
+    body = body.rstrip()
+    if top[1] == 'colon':
+        body += ': null'
+    elif top[1] == 'value' and body.endswith(':'):
+        body += ' null'
+    elif body.endswith(','):
+        body = body[:-1]
+    
+    closers = ''.join('}' if frame[0] == '{' else ']' for frame in reversed(stack))
+    try:
+        return json.loads(body + closers, strict=False)
+    except ValueError as e:
+        raise ValueError(f"Could not repair truncated JSON: {e}")
+
+
+def sse_event(event: str, data: Optional[dict] = None) -> str:
+    """Format one Server-Sent Event frame with a JSON payload"""
+    payload = json.dumps(data if data is not None else {}, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
@@ -0,0 +1,45 @@
+"""Portfolio document normalization"""
+from typing import Dict
+
+from bson import ObjectId
+
+# Bump when the stored shape changes, and teach normalize_portfolio the upgrade
+#   1: canonical project images/image
+#   2: stable "id" on every skill category, project and experience entry
+PORTFOLIO_SCHEMA_VERSION = 2
+
+# Array sections whose entries are addressable by id
+ITEM_SECTIONS = ("skills", "projects", "experience")
+
+
+def ensure_item_id(item: Dict) -> Dict:
+    """Give a skill category, project or experience entry a stable id if it has none"""
+    if not item.get("id"):
+        item["id"] = str(ObjectId())
+    return item
+
+
+def normalize_project(project: Dict) -> Dict:
+    """
+    Canonical image fields for a project
+    
+    `images` is the list of non-empty image URLs; `image` is kept for older
+    clients and always mirrors the first entry (or None). Projects saved
+    before multiple images existed only have `image`.
+    """
+    images = [img for img in (project.get("images") or []) if img and str(img).strip()]
+    if not images and project.get("image") and str(project["image"]).strip():
+        images = [project["image"]]
+    
+    project["images"] = images
+    project["image"] = images[0] if images else None
+    return project
+
+
+def normalize_portfolio(portfolio: Dict) -> Dict:
+    """Bring a whole portfolio document to PORTFOLIO_SCHEMA_VERSION (in place)"""
+    portfolio["projects"] = [normalize_project(project) for project in portfolio.get("projects") or []]
+    for section in ITEM_SECTIONS:
+        portfolio[section] = [ensure_item_id(item) for item in portfolio.get(section) or []]
+    portfolio["schema_version"] = PORTFOLIO_SCHEMA_VERSION
+    return portfolio
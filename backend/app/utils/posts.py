@@ -0,0 +1,26 @@
+"""Post document helpers shared by the routes and the snapshot builder"""
+from typing import Dict, Optional
+
+from ..schemas.post import PostResponse
+from .serializers import post_dict
+
+# Fields needed for list items (faster queries than fetching content)
+LIST_PROJECTION = {
+    "_id": 1,
+    "title": 1,
+    "slug": 1,
+    "excerpt": 1,
+    "author": 1,
+    "featured_image": 1,
+    "tags": 1,
+    "category": 1,
+    "published": 1,
+    "views": 1,
+    "read_time": 1,
+    "created_at": 1
+}
+
+
+def post_response(post: Dict, views: Optional[int] = None) -> PostResponse:
+    """Full post as a model (write endpoints); reads use serializers.dump_post"""
+    return PostResponse(**post_dict(post, views=views))
@@ -0,0 +1,42 @@
+"""Async token-bucket rate limiter"""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket shared by all coroutines in a worker
+    
+    Tokens refill continuously at rate_per_minute up to burst; acquire() waits
+    until a token is available, so callers are paced rather than rejected.
+    """
+    
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until the requested number of tokens is available, then take them"""
+        if self.rate <= 0:
+            return
+        # The lock keeps waiters in FIFO order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+    
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
@@ -0,0 +1,277 @@
+"""Circuit breakers and budgeted retries for calls to external services"""
+import asyncio
+import random
+import sys
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from ..config import settings
+
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open"""
+    
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is temporarily unavailable, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Timeouts, connection failures and 429/5xx answers - worth retrying, count against the breaker"""
+    if isinstance(exc, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in TRANSIENT_STATUS_CODES
+    # google.api_core errors carry the HTTP status in .code
+    return getattr(exc, "code", None) in TRANSIENT_STATUS_CODES
+
+
+def is_transient_response(response: httpx.Response) -> bool:
+    return response.status_code in TRANSIENT_STATUS_CODES
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with half-open probing
+    
+    closed -> open after failure_threshold transient failures in a row; calls
+    are rejected with CircuitOpenError for recovery_seconds. Then up to
+    half_open_max_calls probes are let through: a success closes the breaker,
+    a failure opens it again.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        recovery_seconds: Optional[float] = None,
+        half_open_max_calls: Optional[int] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.BREAKER_FAILURE_THRESHOLD
+        self.recovery_seconds = recovery_seconds or settings.BREAKER_RECOVERY_SECONDS
+        self.half_open_max_calls = half_open_max_calls or settings.BREAKER_HALF_OPEN_MAX_CALLS
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+        self.times_opened = 0
+    
+    @property
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.recovery_seconds - time.monotonic())
+    
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be rejected (open and not yet due for a probe)"""
+        return self.state == "open" and self.retry_after > 0
+    
+    def before_call(self):
+        """Reserve a call slot or raise CircuitOpenError"""
+        if self.state == "open":
+            if self.retry_after > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.retry_after)
+            self.state = "half_open"
+            self._probes = 0
+        if self.state == "half_open":
+            if self._probes >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.recovery_seconds)
+            self._probes += 1
+    
+    def release(self):
+        """Give back a probe slot for a call that was cancelled before finishing"""
+        if self.state == "half_open" and self._probes > 0:
+            self._probes -= 1
+    
+    def record_success(self):
+        self._failures = 0
+        if self.state != "closed":
+            print(f"✅ Circuit '{self.name}' closed", file=sys.stderr)
+        self.state = "closed"
+    
+    def record_failure(self):
+        self._failures += 1
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                print(f"⚠️  Circuit '{self.name}' opened after {self._failures} failures", file=sys.stderr)
+            self.state = "open"
+            self._opened_at = time.monotonic()
+    
+    @asynccontextmanager
+    async def guard(self):
+        """Wrap a call that can't be retried (e.g. a stream) in the breaker"""
+        self.before_call()
+        try:
+            yield
+        except Exception as e:
+            if is_transient_error(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            # Cancelled, or the consumer stopped reading a stream
+            self.release()
+            raise
+        self.record_success()
+    
+    def get_stats(self) -> Dict:
+        return {
+            "state": "open" if self.is_open else self.state,
+            "consecutive_failures": self._failures,
+            "retry_after_seconds": round(self.retry_after, 1) if self.state == "open" else 0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class RetryBudget:
+    """Number of retries one request (or job) may still spend across all its upstream calls"""
+    
+    def __init__(self, retries: int):
+        self.remaining = retries
+    
+    def spend(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+_retry_budget: ContextVar[Optional[RetryBudget]] = ContextVar("retry_budget", default=None)
+
+
+def start_retry_budget() -> RetryBudget:
+    """
+    Give the current request or job a fresh RETRY_BUDGET_PER_REQUEST
+    
+    Call it where the request/job starts (RetryBudgetMiddleware, JobQueue):
+    tasks created afterwards copy the context and so share the same budget.
+    """
+    budget = RetryBudget(settings.RETRY_BUDGET_PER_REQUEST)
+    _retry_budget.set(budget)
+    return budget
+
+
+def current_retry_budget() -> RetryBudget:
+    """Budget of the current request or job; calls outside one (background refreshes) get their own"""
+    budget = _retry_budget.get()
+    if budget is None:
+        return RetryBudget(settings.RETRY_BUDGET_PER_REQUEST)
+    return budget
+
+
+def backoff_delay(attempt: int, base: Optional[float] = None, maximum: Optional[float] = None) -> float:
+    """Exponential backoff with full jitter for the given (1-based) attempt (defaults: RETRY_* settings)"""
+    base = settings.RETRY_BASE_DELAY_SECONDS if base is None else base
+    maximum = settings.RETRY_MAX_DELAY_SECONDS if maximum is None else maximum
+    return random.uniform(0, min(maximum, base * (2 ** (attempt - 1))))
+
+
+async def resilient_call(
+    breaker: CircuitBreaker,
+    factory: Callable[[], Awaitable],
+    attempts: Optional[int] = None,
+    retry_result: Optional[Callable] = None,
+    retry_timeouts: bool = True
+):
+    """
+    Call an upstream through its breaker, retrying transient failures
+    
+    Args:
+        breaker: Breaker for the upstream
+        factory: Zero-argument coroutine factory making one attempt
+        attempts: Maximum attempts (default RETRY_MAX_ATTEMPTS); retries also
+            need to fit in the current request's retry budget
+        retry_result: Predicate marking a returned value as a transient failure
+            (e.g. is_transient_response); the last such value is returned
+        retry_timeouts: Set False for long calls where waiting out another
+            full timeout costs more than failing (timeouts still trip the breaker)
+    
+    Raises:
+        CircuitOpenError: if the breaker is open
+    """
+    attempts = attempts or settings.RETRY_MAX_ATTEMPTS
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call()
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            if not is_transient_error(e):
+                breaker.record_success()  # Upstream answered; the error is ours
+                raise
+            breaker.record_failure()
+            timed_out = isinstance(e, (httpx.TimeoutException, asyncio.TimeoutError))
+            if timed_out and not retry_timeouts:
+                raise
+            if attempt >= attempts or breaker.is_open or not current_retry_budget().spend():
+                raise
+        else:
+            if retry_result is None or not retry_result(result):
+                breaker.record_success()
+                return result
+            breaker.record_failure()
+            if attempt >= attempts or breaker.is_open or not current_retry_budget().spend():
+                return result
+        await asyncio.sleep(backoff_delay(attempt))
+
+
+class BreakerRegistry:
+    """
+    Named breakers, created on first use
+    
+    With max_size set, the least recently used closed breakers are dropped
+    once the registry grows past it (open breakers are kept while possible,
+    they are what stops calls to a dead upstream).
+    """
+    
+    def __init__(self, max_size: Optional[int] = None):
+        self._breakers: "OrderedDict[str, CircuitBreaker]" = OrderedDict()
+        self.max_size = max_size
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._breakers)
+    
+    def get(self, name: str, **kwargs) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name, **kwargs)
+            self._evict(keep=name)
+        else:
+            self._breakers.move_to_end(name)
+        return breaker
+    
+    def _evict(self, keep: str):
+        """Drop breakers beyond max_size: oldest closed first, else the oldest; never `keep` (just created)"""
+        while self.max_size is not None and len(self._breakers) > self.max_size:
+            others = [(name, breaker) for name, breaker in self._breakers.items() if name != keep]
+            if not others:
+                return
+            victim = next((name for name, breaker in others if breaker.state == "closed"), others[0][0])
+            del self._breakers[victim]
+            self.evictions += 1
+    
+    def get_stats(self) -> Dict:
+        return {name: breaker.get_stats() for name, breaker in sorted(self._breakers.items())}
+
+
+# Singleton registry - one breaker per upstream
+breakers = BreakerRegistry()
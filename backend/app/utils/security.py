@@ -1,6 +1,7 @@
 """Security utilities for password hashing and JWT tokens"""
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Dict
+import time
 from jose import JWTError, jwt
 import bcrypt
 
@@ -24,14 +25,67 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt directly"""
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password using bcrypt directly with the configured cost factor"""
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
+def get_hash_rounds(hashed_password: str) -> Optional[int]:
+    """Return the bcrypt cost factor encoded in a hash ($2b$<rounds>$...)"""
+    parts = hashed_password.split('$') if hashed_password else []
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a stored hash was made with a different cost than BCRYPT_ROUNDS"""
+    rounds = get_hash_rounds(hashed_password)
+    return rounds is not None and rounds != settings.BCRYPT_ROUNDS
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float = 250.0,
+    min_rounds: int = 10,
+    max_rounds: int = 16,
+    samples: int = 3
+) -> Dict:
+    """
+    Measure bcrypt hashing latency on this machine and pick a cost factor
+    
+    Args:
+        target_ms: Maximum acceptable time for one hash, in milliseconds
+        min_rounds: Lowest cost factor to consider
+        max_rounds: Highest cost factor to consider
+        samples: Number of hashes timed per cost factor (median is used)
+        
+    Returns:
+        dict with 'rounds' (recommended cost) and 'timings' (rounds -> ms)
+    """
+    password = b"calibration-password"
+    timings = {}
+    recommended = min_rounds
+    
+    for rounds in range(min_rounds, max_rounds + 1):
+        durations = []
+        for _ in range(samples):
+            salt = bcrypt.gensalt(rounds=rounds)
+            start = time.perf_counter()
+            bcrypt.hashpw(password, salt)
+            durations.append((time.perf_counter() - start) * 1000)
+        median = sorted(durations)[len(durations) // 2]
+        timings[rounds] = round(median, 1)
+        
+        if median > target_ms:
+            break
+        recommended = rounds
+    
+    return {"rounds": recommended, "timings": timings}
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -0,0 +1,86 @@
+"""
+Fast JSON serialization for read endpoints
+
+Mongo documents are turned straight into JSON bytes, without building
+Pydantic models or running FastAPI's response_model validation. The field
+lists mirror PostListItem, PostResponse and PostsListResponse, which stay as
+the response_model of the routes for the OpenAPI docs.
+"""
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # Same output, slower
+    orjson = None
+
+
+def dumps(data: Any) -> bytes:
+    """Compact UTF-8 JSON, as model_dump_json produces it"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def json_response(content: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Return already serialized JSON (bypasses response_model validation)"""
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def post_list_item_dict(post: Dict) -> Dict:
+    """PostListItem fields of a post document (LIST_PROJECTION is enough)"""
+    return {
+        "_id": str(post["_id"]),
+        "title": post["title"],
+        "slug": post["slug"],
+        "excerpt": post["excerpt"],
+        "author": post["author"],
+        "featured_image": post.get("featured_image"),
+        "images": post.get("images") or [],
+        "tags": post["tags"],
+        "category": post["category"],
+        "published": post["published"],
+        "views": post["views"],
+        "read_time": post["read_time"],
+        "created_at": post["created_at"].isoformat(),
+    }
+
+
+def post_dict(post: Dict, views: Optional[int] = None) -> Dict:
+    """PostResponse fields of a post document; views overrides the stored count"""
+    return {
+        "_id": str(post["_id"]),
+        "title": post["title"],
+        "slug": post["slug"],
+        "excerpt": post["excerpt"],
+        "content": post["content"],
+        "author": post["author"],
+        "featured_image": post.get("featured_image"),
+        "images": post.get("images") or [],
+        "tags": post["tags"],
+        "category": post["category"],
+        "published": post["published"],
+        "views": post["views"] if views is None else views,
+        "read_time": post["read_time"],
+        "created_at": post["created_at"].isoformat(),
+        "updated_at": post["updated_at"].isoformat(),
+    }
+
+
+def dump_posts_list(posts: List[Dict], total: int, page: int, page_size: int) -> bytes:
+    """PostsListResponse JSON for one page of post documents"""
+    return dumps({
+        "posts": [post_list_item_dict(post) for post in posts],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": math.ceil(total / page_size),
+    })
+
+
+def dump_post(post: Dict, views: Optional[int] = None) -> bytes:
+    """PostResponse JSON for a post document"""
+    return dumps(post_dict(post, views=views))
@@ -0,0 +1,121 @@
+"""Compare CPU per request of GZipMiddleware and CompressionMiddleware
+
+Drives a minimal ASGI app that returns synthetic post list, post and
+portfolio JSON bodies, and measures process CPU time per request and the
+compressed size for:
+  - starlette GZipMiddleware(minimum_size=1000) (previous setup, gzip level 9)
+  - CompressionMiddleware with its cache disabled (every request compresses)
+  - CompressionMiddleware with its cache (repeat requests for the same body)
+for each encoding available here (br needs brotli, zstd needs zstandard).
+
+Usage (from backend/):
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --requests 500
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from starlette.middleware.gzip import GZipMiddleware
+
+from app.middleware.compression import CompressionMiddleware, ResponseCompressor, available_encodings
+
+
+def make_payloads(rng: random.Random) -> dict:
+    words = ["docker", "python", "async", "cache", "latency", "mongo", "fastapi", "deploy", "index", "query"]
+    
+    def sentence(n):
+        return " ".join(rng.choice(words) for _ in range(n))
+    
+    def list_item(i):
+        return {
+            "_id": f"{i:024x}", "title": sentence(6), "slug": f"post-{i}", "excerpt": sentence(30),
+            "author": "admin", "featured_image": f"https://images.unsplash.com/photo-{i}",
+            "tags": rng.sample(words, 3), "category": rng.choice(words), "published": True,
+            "views": rng.randint(0, 5000), "read_time": rng.randint(2, 15), "created_at": "2025-01-01T00:00:00",
+        }
+    
+    post = dict(list_item(0), content="\n\n".join(f"## {sentence(4)}\n\n{sentence(120)}" for _ in range(25)))
+    portfolio = {
+        "personal_info": {"name": "Yohans", "title": sentence(4), "bio": sentence(80), "email": "me@example.com"},
+        "skills": [{"id": str(i), "category": sentence(2), "items": rng.sample(words, 6)} for i in range(8)],
+        "projects": [
+            {"id": str(i), "title": sentence(4), "description": sentence(60), "technologies": rng.sample(words, 5),
+             "images": [f"https://images.unsplash.com/p-{i}"], "image": f"https://images.unsplash.com/p-{i}"}
+            for i in range(12)
+        ],
+        "experience": [{"id": str(i), "company": sentence(2), "description": sentence(50)} for i in range(6)],
+    }
+    return {
+        "posts page_size=10": {"posts": [list_item(i) for i in range(10)], "total": 120, "page": 1},
+        "posts page_size=50": {"posts": [list_item(i) for i in range(50)], "total": 120, "page": 1},
+        "single post": post,
+        "portfolio": portfolio,
+    }
+
+
+def json_app(body: bytes):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def measure(app, encoding: str, requests: int):
+    """Returns (CPU ms per request, body bytes sent)"""
+    scope = {
+        "type": "http", "method": "GET", "path": "/api/bench", "query_string": b"",
+        "headers": [(b"accept-encoding", encoding.encode())],
+    }
+    sent = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        if message["type"] == "http.response.body":
+            sent.append(len(message.get("body", b"")))
+    
+    started = time.process_time()
+    for _ in range(requests):
+        await app(scope, receive, send)
+    elapsed = time.process_time() - started
+    return elapsed * 1000 / requests, sent[-1]
+
+
+async def run(requests: int):
+    payloads = make_payloads(random.Random(7))
+    for name, data in payloads.items():
+        body = json.dumps(data).encode()
+        inner = json_app(body)
+        print(f"\n{name}: {len(body)} bytes")
+        print(f"  {'setup':<38} {'encoding':<8} {'CPU ms/req':>10} {'bytes':>8}")
+        
+        cpu_ms, size = await measure(GZipMiddleware(inner, minimum_size=1000), "gzip", requests)
+        print(f"  {'GZipMiddleware (level 9)':<38} {'gzip':<8} {cpu_ms:>10.3f} {size:>8}")
+        
+        for encoding in available_encodings():
+            uncached = CompressionMiddleware(inner, compressor=ResponseCompressor(cache_max_bytes=0))
+            cpu_ms, size = await measure(uncached, encoding, requests)
+            print(f"  {'CompressionMiddleware, no cache':<38} {encoding:<8} {cpu_ms:>10.3f} {size:>8}")
+            
+            cached = CompressionMiddleware(inner, compressor=ResponseCompressor())
+            cpu_ms, size = await measure(cached, encoding, requests)
+            print(f"  {'CompressionMiddleware, cached':<38} {encoding:<8} {cpu_ms:>10.3f} {size:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per setup and payload")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Load-test POST /api/ai/generate-and-post at a fixed concurrency
+
+Run the backend against benchmarks/fake_llm_server.py (see its docstring) and
+a scratch database - every successful request publishes a post. For
+--model gpt the admin needs a saved Open Arena token; against the fake server
+any value other than "expired" validates.
+
+Usage (from backend/):
+    python -m benchmarks.bench_generate_and_post --email admin@example.com --password secret
+    python -m benchmarks.bench_generate_and_post --token <JWT> --model gemini --concurrency 16 --requests 200
+
+Prints latency percentiles, throughput and a breakdown by status code.
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+        token = args.token or await login(client, args.email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        latencies = []
+        statuses = Counter()
+        counter = iter(range(args.requests))
+        
+        async def worker():
+            for idx in counter:
+                body = {
+                    "idea": args.idea if args.allow_cache else f"{args.idea} #{idx}",
+                    "model": args.model,
+                    "force_refresh": not args.allow_cache,
+                }
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/api/ai/generate-and-post", json=body, headers=headers)
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    print(f"requests:    {args.requests} at concurrency {args.concurrency} ({args.model})")
+    print(f"wall time:   {elapsed:.2f}s  throughput: {args.requests / elapsed:.2f} req/s")
+    print(
+        f"latency:     p50 {percentile(latencies, 0.5) * 1000:.0f}ms  "
+        f"p90 {percentile(latencies, 0.9) * 1000:.0f}ms  "
+        f"p99 {percentile(latencies, 0.99) * 1000:.0f}ms  "
+        f"max {max(latencies, default=0) * 1000:.0f}ms"
+    )
+    print("statuses:    " + ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items(), key=str)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/ai/generate-and-post")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", help="Admin access token (skips login)")
+    parser.add_argument("--email", help="Admin email used to log in")
+    parser.add_argument("--password", help="Admin password used to log in")
+    parser.add_argument("--model", default="gpt", choices=["gpt", "gemini", "auto"])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--idea", default="Benchmarking async Python services")
+    parser.add_argument("--allow-cache", action="store_true", help="Repeat one idea so requests can hit the generation cache")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args()
+    
+    if not args.token and not (args.email and args.password):
+        parser.error("pass --token or --email and --password")
+    
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
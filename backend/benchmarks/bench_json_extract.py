@@ -0,0 +1,123 @@
+"""Compare the legacy regex JSON fallback chain with extract_json_object
+
+Builds a synthetic corpus of model outputs (clean JSON, fenced blocks, preface
+text, raw newlines inside strings, truncated outputs, very large posts) and
+reports parse success rate and time per document for both approaches.
+
+Usage (from backend/):
+    python -m benchmarks.bench_json_extract
+    python -m benchmarks.bench_json_extract --repeat 50
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from app.utils.llm_json import extract_json_object
+
+REQUIRED_FIELDS = ("title", "excerpt", "content")
+
+
+def legacy_extract(text: str) -> dict:
+    """The fallback chain previously used by parse_blog_response"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        json_match = re.search(r'```json\s*(\{.*\})\s*```', text, re.DOTALL)
+        if json_match:
+            json_str = json_match.group(1)
+        elif "{" in text and "}" in text:
+            start = text.find("{")
+            end = text.rfind("}") + 1
+            json_str = text[start:end]
+        else:
+            raise ValueError("No JSON found in response")
+        return json.loads(json_str.strip())
+
+
+def new_extract(text: str) -> dict:
+    data, _ = extract_json_object(text)
+    return data
+
+
+def make_post(rng: random.Random, paragraphs: int) -> dict:
+    words = ["docker", "python", "async", "cache", "latency", "{braces}", "[list]", 'a "quote"', "path\\to"]
+    body = "\n\n".join(
+        "## Section {}\n\n{}".format(i, " ".join(rng.choice(words) for _ in range(80)))
+        for i in range(paragraphs)
+    )
+    return {
+        "title": "Post about " + rng.choice(words),
+        "excerpt": "A short summary.",
+        "content": body,
+        "tags": "tag1, tag2, tag3",
+        "category": "technology",
+        "featured_image": "https://images.unsplash.com/photo-1",
+        "images": ["https://images.unsplash.com/photo-2"],
+    }
+
+
+def build_corpus(seed: int = 7) -> list:
+    """Return a list of (kind, text) samples"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(20):
+        doc = json.dumps(make_post(rng, rng.randint(3, 12)), ensure_ascii=False)
+        corpus.append(("clean", doc))
+        corpus.append(("fenced", f"```json\n{doc}\n```"))
+        corpus.append(("preface", f"Sure! Here is your post:\n\n{doc}\n\nLet me know if you want changes {{or edits}}."))
+        # Models sometimes emit literal newlines inside strings
+        corpus.append(("raw_newlines", doc.replace("\\n", "\n")))
+        cut = rng.randint(len(doc) // 2, len(doc) - 5)
+        corpus.append(("truncated", doc[:cut]))
+        corpus.append(("truncated_fenced", f"```json\n{doc[:cut]}"))
+    for _ in range(3):
+        corpus.append(("large", json.dumps(make_post(rng, 400), ensure_ascii=False)))
+    return corpus
+
+
+def run(extract, corpus: list, repeat: int) -> dict:
+    stats = {}
+    for kind, text in corpus:
+        entry = stats.setdefault(kind, {"ok": 0, "total": 0, "seconds": 0.0})
+        ok = False
+        started = time.perf_counter()
+        for _ in range(repeat):
+            try:
+                data = extract(text)
+                ok = isinstance(data, dict) and all(data.get(f) for f in REQUIRED_FIELDS)
+            except ValueError:
+                ok = False
+        entry["seconds"] += time.perf_counter() - started
+        entry["total"] += 1
+        entry["ok"] += ok
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Parses per sample")
+    args = parser.parse_args()
+    
+    corpus = build_corpus()
+    results = {
+        "legacy": run(legacy_extract, corpus, args.repeat),
+        "single-pass": run(new_extract, corpus, args.repeat),
+    }
+    
+    print(f"{'kind':<18}{'approach':<14}{'success':>10}{'us/doc':>12}")
+    for kind in results["legacy"]:
+        for name, stats in results.items():
+            entry = stats[kind]
+            per_doc = entry["seconds"] / (entry["total"] * args.repeat) * 1e6
+            print(f"{kind:<18}{name:<14}{entry['ok']:>5}/{entry['total']:<4}{per_doc:>12.1f}")
+    
+    for name, stats in results.items():
+        ok = sum(e["ok"] for e in stats.values())
+        total = sum(e["total"] for e in stats.values())
+        print(f"{name}: {ok}/{total} parsed ({ok / total:.0%})")
+
+
+if __name__ == "__main__":
+    main()
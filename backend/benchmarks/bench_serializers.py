@@ -0,0 +1,139 @@
+"""Compare per-request CPU of the model-based and the fast get_posts response path
+
+Mounts two versions of the GET /api/posts handler body on a FastAPI app and
+calls it through ASGI (no network, no Mongo: the page of documents is built
+in memory), so the numbers include FastAPI's response handling:
+  - models: PostListItem(...) per post, PostsListResponse(...), then
+    response_model validation and the stdlib JSON encoder (previous code)
+  - fast:   app.utils.serializers.dump_posts_list straight to bytes
+Both outputs are checked to decode to the same JSON.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serializers
+    python -m benchmarks.bench_serializers --page-size 50 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi import FastAPI
+
+from app.schemas.post import PostListItem, PostsListResponse
+from app.utils import serializers
+from app.utils.serializers import json_response, dump_posts_list
+
+
+def make_documents(count: int) -> list:
+    rng = random.Random(7)
+    words = ["docker", "python", "async", "cache", "latency", "mongo", "fastapi", "deploy"]
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "title": " ".join(rng.choice(words) for _ in range(6)),
+            "slug": f"post-{i}",
+            "excerpt": " ".join(rng.choice(words) for _ in range(30)),
+            "author": "admin",
+            "featured_image": f"https://images.unsplash.com/photo-{i}",
+            "tags": rng.sample(words, 3),
+            "category": rng.choice(words),
+            "published": True,
+            "views": rng.randint(0, 5000),
+            "read_time": rng.randint(2, 15),
+            "created_at": now - timedelta(days=i),
+        }
+        for i in range(count)
+    ]
+
+
+def build_app(posts: list, total: int) -> FastAPI:
+    app = FastAPI()
+    page_size = len(posts)
+    
+    @app.get("/models", response_model=PostsListResponse)
+    async def models_path():
+        post_items = [
+            PostListItem(
+                _id=str(post["_id"]),
+                title=post["title"],
+                slug=post["slug"],
+                excerpt=post["excerpt"],
+                author=post["author"],
+                featured_image=post.get("featured_image"),
+                tags=post["tags"],
+                category=post["category"],
+                published=post["published"],
+                views=post["views"],
+                read_time=post["read_time"],
+                created_at=post["created_at"].isoformat()
+            )
+            for post in posts
+        ]
+        return PostsListResponse(
+            posts=post_items,
+            total=total,
+            page=1,
+            page_size=page_size,
+            total_pages=math.ceil(total / page_size)
+        )
+    
+    @app.get("/fast", response_model=PostsListResponse)
+    async def fast_path():
+        return json_response(dump_posts_list(posts, total, 1, page_size))
+    
+    return app
+
+
+async def call(app, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    body = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+    
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def run(page_size: int, requests: int):
+    posts = make_documents(page_size)
+    app = build_app(posts, total=page_size * 10)
+    
+    models_body, fast_body = await call(app, "/models"), await call(app, "/fast")
+    assert json.loads(models_body) == json.loads(fast_body), "Outputs differ"
+    
+    print(f"get_posts page_size={page_size}, {requests} requests, orjson={'yes' if serializers.orjson else 'no'}")
+    print(f"  {'path':<8} {'CPU us/req':>11} {'bytes':>8}")
+    for path in ("/models", "/fast"):
+        for _ in range(50):  # Warm up
+            await call(app, path)
+        started = time.process_time()
+        for _ in range(requests):
+            body = await call(app, path)
+        elapsed = time.process_time() - started
+        print(f"  {path[1:]:<8} {elapsed * 1e6 / requests:>11.1f} {len(body):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.page_size, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Load-test the single uvicorn process against the gunicorn multi-worker setup
+
+Starts each server setup in turn on a local port, waits for /health, runs
+the same fixed-duration load against the read endpoints and stops it again:
+  - single:   uvicorn app.main:app (previous Dockerfile command)
+  - gunicorn: gunicorn app.main:app -c gunicorn.conf.py
+The backend needs its usual environment (.env with MONGODB_URI etc.); use a
+seeded scratch database. Add a slow endpoint to --paths to see how one
+expensive request holds up everything else on a single event loop.
+
+Usage (from backend/):
+    python -m benchmarks.bench_server
+    python -m benchmarks.bench_server --concurrency 64 --duration 30 --workers 4
+    python -m benchmarks.bench_server --setups gunicorn --paths /api/home,/api/posts?page=2
+
+Prints throughput, latency percentiles and status codes per setup. The load
+generator is one asyncio process; run it on another machine (--base-url
+with --no-spawn) if it saturates a core before the server does.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+SETUPS = {
+    "single": [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", "{port}"],
+    "gunicorn": [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py", "--bind", "127.0.0.1:{port}"],
+}
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def wait_until_healthy(base_url: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"{base_url} did not become healthy within {timeout:.0f}s")
+
+
+async def load(base_url: str, paths: list, concurrency: int, duration: float) -> dict:
+    latencies = []
+    statuses = Counter()
+    next_path = itertools.cycle(paths)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        # Warm up (caches, snapshots, connection pools)
+        for path in paths:
+            await client.get(path, headers={"Accept-Encoding": "br, gzip"})
+        
+        deadline = time.perf_counter() + duration
+        
+        async def worker():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(next(next_path), headers={"Accept-Encoding": "br, gzip"})
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    return {"elapsed": elapsed, "latencies": latencies, "statuses": statuses}
+
+
+def start_server(setup: str, port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, PORT=str(port))
+    if workers:
+        env["WEB_CONCURRENCY"] = str(workers)
+    command = [part.format(port=port) for part in SETUPS[setup]]
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_server(process: subprocess.Popen):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def report(setup: str, result: dict):
+    latencies = result["latencies"]
+    total = sum(result["statuses"].values())
+    print(
+        f"{setup:<9} {total / result['elapsed']:>9.1f} "
+        f"{percentile(latencies, 0.5) * 1000:>7.1f} {percentile(latencies, 0.9) * 1000:>7.1f} "
+        f"{percentile(latencies, 0.99) * 1000:>7.1f} {max(latencies, default=0) * 1000:>8.1f}   "
+        + ", ".join(f"{code}: {count}" for code, count in sorted(result["statuses"].items(), key=str))
+    )
+
+
+async def run(args):
+    paths = [path.strip() for path in args.paths.split(",") if path.strip()]
+    results = {}
+    for setup in args.setups.split(","):
+        if args.no_spawn:
+            base_url, process = args.base_url, None
+        else:
+            base_url, process = f"http://127.0.0.1:{args.port}", start_server(setup, args.port, args.workers)
+        try:
+            await wait_until_healthy(base_url, args.startup_timeout)
+            results[setup] = await load(base_url, paths, args.concurrency, args.duration)
+        finally:
+            if process is not None:
+                stop_server(process)
+    
+    print(f"\n{len(paths)} paths, concurrency {args.concurrency}, {args.duration:.0f}s per setup")
+    print(f"{'setup':<9} {'req/s':>9} {'p50 ms':>7} {'p90 ms':>7} {'p99 ms':>7} {'max ms':>8}   statuses")
+    for setup, result in results.items():
+        report(setup, result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--setups", default="single,gunicorn", help="Comma-separated: single, gunicorn")
+    parser.add_argument("--paths", default="/health,/api/home,/api/posts,/api/portfolio,/api/posts?page=2")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=0, help="Override the gunicorn worker count (WEB_CONCURRENCY)")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--no-spawn", action="store_true", help="Load an already running server at --base-url")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Local stand-in for the Open Arena and Gemini APIs
+
+Lets the AI routes run offline for load tests and profiling. Start it, then
+point the backend at it:
+
+    python -m benchmarks.fake_llm_server --port 8100 --latency-ms 800 --jitter 0.5
+    OPEN_ARENA_BASE_URL=http://127.0.0.1:8100 \\
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8100 GOOGLE_AI_API=fake \\
+    uvicorn app.main:app
+
+Emulated endpoints:
+    GET  /v1/user                                        token validation
+    POST /v1/inference                                   Open Arena (JSON or SSE when "stream": true)
+    POST /v1beta/models/{model}:generateContent          Gemini REST
+    POST /v1beta/models/{model}:streamGenerateContent    Gemini REST streaming
+    HEAD /images/{name}                                  image URLs used in generated posts
+    GET/POST /_config                                    read or change the scenario at runtime
+
+Failure injection (rates are probabilities per request): --error-401,
+--error-429, --error-5xx, --malformed (preface text, truncated or non-JSON
+output). Latency is log-normal around --latency-ms with spread --jitter.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+OPEN_ARENA_MODEL_KEY = "openai_gpt-4-turbo"
+
+scenario = {
+    "latency_ms": 800.0,
+    "jitter": 0.5,
+    "chunk_delay_ms": 20.0,
+    "chunks": 40,
+    "error_401": 0.0,
+    "error_429": 0.0,
+    "error_5xx": 0.0,
+    "malformed": 0.0,
+    "paragraphs": 6,
+}
+
+stats = {"requests": 0, "errors": 0, "malformed": 0}
+
+app = FastAPI(title="Fake LLM provider")
+
+
+def sample_latency() -> float:
+    """Log-normal latency in seconds (median = latency_ms)"""
+    median = scenario["latency_ms"] / 1000.0
+    if median <= 0:
+        return 0.0
+    return median * math.exp(random.gauss(0, scenario["jitter"]))
+
+
+def injected_error() -> Optional[Response]:
+    """Maybe return a 401/429/5xx response, per the configured rates"""
+    roll = random.random()
+    for status_code, key in ((401, "error_401"), (429, "error_429"), (503, "error_5xx")):
+        if roll < scenario[key]:
+            stats["errors"] += 1
+            headers = {"Retry-After": "1"} if status_code == 429 else None
+            return JSONResponse({"error": f"injected {status_code}"}, status_code=status_code, headers=headers)
+        roll -= scenario[key]
+    return None
+
+
+def extract_idea(prompt: str) -> str:
+    match = re.search(r"Write a blog post about:\s*(.+)", prompt)
+    return match.group(1).strip()[:120] if match else "something interesting"
+
+
+def blog_text(idea: str, base_url: str) -> str:
+    """Blog envelope as the model would return it (possibly malformed)"""
+    sections = "\n\n".join(
+        f"## Part {i + 1}\n\nHonestly? {idea} taught me a lot. " + "Here's what I learned the hard way. " * 12
+        for i in range(scenario["paragraphs"])
+    )
+    text = json.dumps({
+        "title": f"Let's talk about {idea}",
+        "excerpt": f"My take on {idea}, without the corporate jargon.",
+        "content": sections,
+        "tags": "fake, benchmark, testing",
+        "category": "Technology",
+        "featured_image": f"{base_url}images/featured.jpg",
+        "images": [f"{base_url}images/1.jpg", f"{base_url}images/2.jpg"],
+    })
+    
+    if random.random() < scenario["malformed"]:
+        stats["malformed"] += 1
+        kind = random.choice(("preface", "truncated", "garbage"))
+        if kind == "preface":
+            return f"Sure! Here's your post:\n```json\n{text}\n```"
+        if kind == "truncated":
+            return text[:random.randint(len(text) // 3, len(text) - 1)]
+        return f"I'm sorry, I can't write about {idea} right now."
+    return text
+
+
+def split_chunks(text: str) -> list:
+    size = max(1, math.ceil(len(text) / max(1, scenario["chunks"])))
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@app.get("/v1/user")
+async def open_arena_user(request: Request):
+    stats["requests"] += 1
+    token = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+    if not token or token == "expired":
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    error = injected_error()
+    if error:
+        return error
+    return {"user": {"id": "fake-user", "email": "fake@example.com"}}
+
+
+@app.post("/v1/inference")
+async def open_arena_inference(request: Request):
+    stats["requests"] += 1
+    error = injected_error()
+    if error:
+        return error
+    
+    payload = await request.json()
+    text = blog_text(extract_idea(payload.get("query", "")), str(request.base_url))
+    await asyncio.sleep(sample_latency())
+    
+    if not payload.get("stream"):
+        return {"result": {"answer": {OPEN_ARENA_MODEL_KEY: text}}}
+    
+    async def events():
+        # Open Arena sends the cumulative answer in each event
+        answer = ""
+        for chunk in split_chunks(text):
+            answer += chunk
+            yield f"data: {json.dumps({'result': {'answer': {OPEN_ARENA_MODEL_KEY: answer}}})}\n\n"
+            await asyncio.sleep(scenario["chunk_delay_ms"] / 1000.0)
+        yield "data: [DONE]\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def gemini_chunk(text: str, final: bool) -> dict:
+    candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if final:
+        candidate["finishReason"] = "STOP"
+    return {"candidates": [candidate], "usageMetadata": {"promptTokenCount": 500, "candidatesTokenCount": len(text) // 4}}
+
+
+@app.post("/{version}/models/{model_action}")
+async def gemini_generate(version: str, model_action: str, request: Request):
+    stats["requests"] += 1
+    error = injected_error()
+    if error:
+        return error
+    
+    _, _, action = model_action.partition(":")
+    body = await request.json()
+    prompt = "".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+    text = blog_text(extract_idea(prompt), str(request.base_url))
+    await asyncio.sleep(sample_latency())
+    
+    if action == "generateContent":
+        return gemini_chunk(text, final=True)
+    if action != "streamGenerateContent":
+        return JSONResponse({"error": f"Unsupported action {action}"}, status_code=404)
+    
+    chunks = split_chunks(text)
+    sse = request.query_params.get("alt") == "sse"
+    
+    async def stream():
+        # The REST client without alt=sse expects one streamed JSON array
+        if not sse:
+            yield "["
+        for idx, chunk in enumerate(chunks):
+            data = json.dumps(gemini_chunk(chunk, final=idx == len(chunks) - 1))
+            if sse:
+                yield f"data: {data}\n\n"
+            else:
+                yield ("," if idx else "") + data
+            await asyncio.sleep(scenario["chunk_delay_ms"] / 1000.0)
+        if not sse:
+            yield "]"
+    
+    return StreamingResponse(stream(), media_type="text/event-stream" if sse else "application/json")
+
+
+@app.api_route("/images/{name}", methods=["GET", "HEAD"])
+async def image(name: str):
+    return Response(b"", media_type="image/jpeg")
+
+
+@app.get("/_config")
+async def get_config():
+    return {"scenario": scenario, "stats": stats}
+
+
+@app.post("/_config")
+async def update_config(changes: dict):
+    """Change the scenario at runtime, e.g. {"error_5xx": 0.2} (unknown keys are ignored)"""
+    for key, value in changes.items():
+        if key in scenario:
+            scenario[key] = type(scenario[key])(value)
+    return {"scenario": scenario}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Open Arena / Gemini server for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=scenario["latency_ms"], help="Median response latency")
+    parser.add_argument("--jitter", type=float, default=scenario["jitter"], help="Log-normal sigma of the latency")
+    parser.add_argument("--chunk-delay-ms", type=float, default=scenario["chunk_delay_ms"])
+    parser.add_argument("--chunks", type=int, default=scenario["chunks"], help="Chunks per streamed answer")
+    parser.add_argument("--error-401", type=float, default=0.0)
+    parser.add_argument("--error-429", type=float, default=0.0)
+    parser.add_argument("--error-5xx", type=float, default=0.0)
+    parser.add_argument("--malformed", type=float, default=0.0, help="Share of answers with broken JSON")
+    parser.add_argument("--paragraphs", type=int, default=scenario["paragraphs"], help="Sections per post")
+    args = parser.parse_args()
+    
+    for key in scenario:
+        scenario[key] = getattr(args, key)
+    
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
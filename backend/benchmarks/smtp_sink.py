@@ -0,0 +1,147 @@
+"""Local SMTP sink for exercising the email outbox without a real mail server
+
+Accepts any login, swallows every message and reports throughput, so the
+outbox worker's session reuse, retries and dead-lettering can be observed
+offline. Start it, then point the backend at it:
+
+    python -m benchmarks.smtp_sink --port 1025 --delay-ms 50 --fail-rate 0.1
+    SMTP_HOST=127.0.0.1 SMTP_PORT=1025 SMTP_USE_TLS=false \\
+    SMTP_USER=blog@example.com SMTP_PASSWORD=sink \\
+    uvicorn app.main:app
+
+--fail-rate answers DATA with a transient 451 (retried by the outbox),
+--reject-rate with a permanent 550 (dead-lettered). --drop-after closes a
+connection after that many messages to exercise reconnects. --save-dir
+writes every accepted message as an .eml file.
+
+Needs only the standard library (smtpd was removed in Python 3.12).
+"""
+import argparse
+import asyncio
+import random
+import time
+from pathlib import Path
+
+stats = {"connections": 0, "messages": 0, "transient_failures": 0, "rejected": 0, "started": 0.0}
+
+
+def report():
+    elapsed = max(time.monotonic() - stats["started"], 1e-9)
+    print(
+        f"connections: {stats['connections']}  messages: {stats['messages']}  "
+        f"451: {stats['transient_failures']}  550: {stats['rejected']}  "
+        f"rate: {stats['messages'] / elapsed:.1f} msg/s",
+        flush=True
+    )
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, args):
+    stats["connections"] += 1
+    accepted = 0
+    
+    async def reply(line: str):
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+    
+    await reply("220 smtp-sink ESMTP ready")
+    try:
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                break
+            command = raw.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            
+            if verb == "EHLO":
+                writer.write(b"250-smtp-sink\r\n250-AUTH PLAIN LOGIN\r\n250-8BITMIME\r\n250 SMTPUTF8\r\n")
+                await writer.drain()
+            elif verb == "HELO":
+                await reply("250 smtp-sink")
+            elif verb == "AUTH":
+                parts = command.split()
+                if len(parts) == 2 and parts[1].upper() == "LOGIN":
+                    # Username and password prompts (base64 "Username:" / "Password:")
+                    await reply("334 VXNlcm5hbWU6")
+                    await reader.readline()
+                    await reply("334 UGFzc3dvcmQ6")
+                    await reader.readline()
+                await reply("235 2.7.0 Authentication successful")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                await reply("250 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = await reader.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                
+                if args.delay_ms:
+                    await asyncio.sleep(args.delay_ms / 1000.0)
+                roll = random.random()
+                if roll < args.reject_rate:
+                    stats["rejected"] += 1
+                    await reply("550 5.1.1 Mailbox unavailable (injected)")
+                elif roll < args.reject_rate + args.fail_rate:
+                    stats["transient_failures"] += 1
+                    await reply("451 4.3.0 Try again later (injected)")
+                else:
+                    stats["messages"] += 1
+                    accepted += 1
+                    if args.save_dir:
+                        path = Path(args.save_dir) / f"{int(time.time() * 1000)}-{stats['messages']}.eml"
+                        path.write_bytes(b"".join(lines))
+                    await reply("250 2.0.0 Queued")
+                    if args.drop_after and accepted >= args.drop_after:
+                        break  # Simulate the server closing the session
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Command not implemented")
+    finally:
+        writer.close()
+
+
+async def periodic_report(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        report()
+
+
+async def serve(args):
+    if args.save_dir:
+        Path(args.save_dir).mkdir(parents=True, exist_ok=True)
+    server = await asyncio.start_server(lambda r, w: handle(r, w, args), args.host, args.port)
+    stats["started"] = time.monotonic()
+    print(f"SMTP sink listening on {args.host}:{args.port}", flush=True)
+    reporter = asyncio.create_task(periodic_report(args.report_every))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        reporter.cancel()
+        report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SMTP sink for the email outbox")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Latency added to every DATA reply")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of messages answered with 451")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="Share of messages answered with 550")
+    parser.add_argument("--drop-after", type=int, default=0, help="Close each connection after N messages")
+    parser.add_argument("--save-dir", help="Write accepted messages here as .eml files")
+    parser.add_argument("--report-every", type=float, default=10.0, help="Seconds between stats lines")
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Calibrate the bcrypt cost factor for this machine
+
+Usage:
+    python calibrate_bcrypt.py                 # print recommended BCRYPT_ROUNDS
+    python calibrate_bcrypt.py --target-ms 400 # allow slower logins
+    python calibrate_bcrypt.py --write         # store the result in .env
+"""
+import argparse
+import os
+import re
+
+from app.utils.security import calibrate_bcrypt_rounds
+from app.config import settings
+
+ENV_FILE = ".env"
+
+
+def write_env_setting(key: str, value: str, env_file: str = ENV_FILE):
+    """Set KEY=value in the .env file, replacing an existing entry"""
+    lines = []
+    if os.path.exists(env_file):
+        with open(env_file) as f:
+            lines = f.read().splitlines()
+    
+    pattern = re.compile(rf"^\s*{re.escape(key)}\s*=")
+    replaced = False
+    for idx, line in enumerate(lines):
+        if pattern.match(line):
+            lines[idx] = f"{key}={value}"
+            replaced = True
+    if not replaced:
+        lines.append(f"{key}={value}")
+    
+    with open(env_file, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bcrypt latency and pick BCRYPT_ROUNDS")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Max hashing time per login (ms)")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--write", action="store_true", help=f"Write BCRYPT_ROUNDS to {ENV_FILE}")
+    args = parser.parse_args()
+    
+    print(f"⏱️  Calibrating bcrypt (target: {args.target_ms:.0f} ms per hash)...")
+    result = calibrate_bcrypt_rounds(
+        target_ms=args.target_ms,
+        min_rounds=args.min_rounds,
+        max_rounds=args.max_rounds,
+        samples=args.samples
+    )
+    
+    for rounds, ms in result["timings"].items():
+        marker = " ←" if rounds == result["rounds"] else ""
+        print(f"   rounds={rounds:<3} {ms:>8.1f} ms{marker}")
+    
+    print(f"\n✅ Recommended: BCRYPT_ROUNDS={result['rounds']} (current: {settings.BCRYPT_ROUNDS})")
+    
+    if args.write:
+        write_env_setting("BCRYPT_ROUNDS", str(result["rounds"]))
+        print(f"📝 Saved to {ENV_FILE}. Existing hashes are upgraded on next login.")
+
+
+if __name__ == "__main__":
+    main()
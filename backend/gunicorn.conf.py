@@ -0,0 +1,88 @@
+"""
+Production server configuration
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+Runs several UvicornWorker processes so one slow request cannot pin the only
+event loop. uvicorn[standard] provides uvloop and httptools; the worker
+picks them up automatically. Every setting can be overridden with the
+environment variables below (WEB_CONCURRENCY is the usual worker count
+override on PaaS hosts).
+"""
+import asyncio
+import math
+import os
+import sys
+
+
+def _cpu_limit() -> float:
+    """CPUs this container may use (cgroup quota, else CPU affinity)"""
+    try:
+        quota, period = open("/sys/fs/cgroup/cpu.max").read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _memory_limit_mb() -> float:
+    """Memory this container may use (cgroup limit, else available RAM)"""
+    try:
+        limit = open("/sys/fs/cgroup/memory.max").read().strip()
+        if limit != "max":
+            return int(limit) / (1024 * 1024)
+    except (OSError, ValueError):
+        pass
+    try:
+        for line in open("/proc/meminfo"):
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return float("inf")
+
+
+def _default_workers() -> int:
+    """Two workers per CPU (async, but bcrypt/compression/JSON are CPU bound), capped by memory"""
+    by_cpu = max(2, math.ceil(2 * _cpu_limit()))
+    by_memory = max(1, int(_memory_limit_mb() // int(os.getenv("GUNICORN_WORKER_MEMORY_MB", "256"))))
+    return min(by_cpu, by_memory)
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY") or _default_workers())
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master; workers fork with the modules already loaded.
+# Connections (Mongo, HTTP pool, SMTP) are opened per worker in the lifespan.
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# AI generation requests can take a while; on restart give in-flight requests time to finish
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers now and then; jitter keeps them from restarting together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    print(
+        f"✅ gunicorn ready: {workers} workers ({_cpu_limit():g} CPUs, {_memory_limit_mb():.0f} MB), "
+        f"preload={preload_app}",
+        file=sys.stderr
+    )
+
+
+def post_worker_init(worker):
+    loop = type(asyncio.get_event_loop_policy()).__module__.split(".")[0]
+    print(f"✅ Worker {worker.pid} started (event loop: {loop})", file=sys.stderr)
@@ -0,0 +1,97 @@
+"""Normalize stored portfolio documents to the current schema version
+
+Older documents have projects with only `image`, empty strings in `images`,
+or `image` out of sync with `images` (version 1), and skill categories,
+projects and experience entries without the stable ids used by the per-item
+endpoints (version 2). The API normalizes on write, so run this once after
+deploying.
+
+Usage:
+    python migrate_portfolio.py --dry-run        # report what would change
+    python migrate_portfolio.py                  # migrate in batches
+    python migrate_portfolio.py --batch-size 50
+
+Each update is conditional on the document's cache_version, so an admin edit
+made while the migration runs is never overwritten - the document is picked
+up again on the next pass. Bumping cache_version also makes running API
+workers reload their portfolio cache.
+"""
+import argparse
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.database import PORTFOLIO_COLLECTION
+from app.utils.portfolio import PORTFOLIO_SCHEMA_VERSION, ITEM_SECTIONS, normalize_portfolio
+
+MAX_PASSES = 5
+
+
+async def migrate_pass(collection, batch_size: int, dry_run: bool) -> tuple:
+    """One pass over all outdated documents; returns (seen, migrated)"""
+    query = {
+        "$or": [
+            {"schema_version": {"$exists": False}},
+            {"schema_version": {"$lt": PORTFOLIO_SCHEMA_VERSION}},
+        ]
+    }
+    seen = migrated = 0
+    last_id = None
+    
+    while True:
+        batch_query = {"$and": [query, {"_id": {"$gt": last_id}}]} if last_id else query
+        batch = await collection.find(batch_query).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+        seen += len(batch)
+        
+        operations = []
+        for document in batch:
+            normalized = normalize_portfolio(dict(document))
+            if dry_run:
+                counts = ", ".join(f"{len(normalized[section])} {section}" for section in ITEM_SECTIONS)
+                print(f"  {document['_id']} (version {document.get('schema_version', 0)}): {counts}")
+                continue
+            changes = {section: normalized[section] for section in ITEM_SECTIONS}
+            changes["schema_version"] = PORTFOLIO_SCHEMA_VERSION
+            operations.append(UpdateOne(
+                {"_id": document["_id"], "cache_version": document.get("cache_version")},
+                {"$set": changes, "$inc": {"cache_version": 1}}
+            ))
+        
+        if operations:
+            result = await collection.bulk_write(operations, ordered=False)
+            migrated += result.modified_count
+    
+    return seen, migrated
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Normalize portfolio documents")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    collection = client[settings.DATABASE_NAME][PORTFOLIO_COLLECTION]
+    
+    try:
+        for attempt in range(1, MAX_PASSES + 1):
+            seen, migrated = await migrate_pass(collection, args.batch_size, args.dry_run)
+            if args.dry_run:
+                print(f"🔍 {seen} document(s) below schema version {PORTFOLIO_SCHEMA_VERSION}")
+                return
+            print(f"✅ Pass {attempt}: migrated {migrated} of {seen} outdated document(s)")
+            if migrated == seen:
+                return
+            # The rest changed under us - retry them with fresh reads
+        print("⚠️  Some documents kept changing; run the migration again")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
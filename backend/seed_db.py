@@ -149,6 +149,10 @@ async def seed_portfolio():
         "experience": []
     }
     
+    # Store the canonical project image fields and schema_version
+    from app.utils.portfolio import normalize_portfolio
+    normalize_portfolio(portfolio_data)
+    
     result = await portfolio_collection.insert_one(portfolio_data)
     print(f"✅ Portfolio data seeded successfully! ID: {result.inserted_id}")
     
@@ -0,0 +1,11 @@
+"""
+Shared test setup
+
+Run from backend/:
+    python -m pytest -q
+"""
+import os
+
+# Settings are read at import time; tests never reach a real database or provider
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
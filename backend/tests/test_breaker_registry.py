@@ -0,0 +1,25 @@
+"""Bounded BreakerRegistry eviction"""
+from app.utils.resilience import BreakerRegistry
+
+
+def test_new_breaker_stays_registered_when_all_others_are_open():
+    registry = BreakerRegistry(max_size=2)
+    for host in ("a", "b"):
+        registry.get(host).state = "open"
+    
+    created = registry.get("c")
+    
+    assert registry.get("c") is created
+    assert len(registry) == 2
+    assert registry.get_stats().keys() == {"b", "c"}  # The oldest open breaker made room
+
+
+def test_closed_breakers_are_evicted_before_open_ones():
+    registry = BreakerRegistry(max_size=2)
+    registry.get("a").state = "open"
+    registry.get("b")
+    
+    registry.get("c")
+    
+    assert registry.get_stats().keys() == {"a", "c"}
+    assert registry.evictions == 1
@@ -0,0 +1,114 @@
+"""Gemini generation must leave the event loop free while the model works"""
+import asyncio
+import json
+import time
+
+from app.services import ai_service
+from app.services.ai_service import GeminiBlogGenerator
+from app.utils.rate_limit import TokenBucket
+
+MODEL_SECONDS = 0.5
+TICK_SECONDS = 0.01
+MAX_LAG_SECONDS = 0.1
+
+BLOG_JSON = json.dumps({
+    "title": "Docker in five minutes",
+    "excerpt": "Why I stopped fighting my deploys.",
+    "content": "## Hook\n\nShort post.",
+    "tags": "docker, devops",
+    "category": "DevOps",
+    "featured_image": "",
+    "images": [],
+})
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class SlowAsyncModel:
+    """Stands in for genai.GenerativeModel; answers after MODEL_SECONDS without blocking"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(MODEL_SECONDS)
+        return _Response(BLOG_JSON)
+
+
+async def max_loop_lag(coro):
+    """Run coro while a ticker measures how late the loop wakes it (seconds)"""
+    lag = 0.0
+    done = asyncio.Event()
+    
+    async def ticker():
+        nonlocal lag
+        while not done.is_set():
+            started = time.monotonic()
+            await asyncio.sleep(TICK_SECONDS)
+            lag = max(lag, time.monotonic() - started - TICK_SECONDS)
+    
+    probe = asyncio.create_task(ticker())
+    await asyncio.sleep(0)  # Let the ticker start before the work does
+    try:
+        result = await coro
+    finally:
+        done.set()
+        await probe
+    return result, lag
+
+
+def make_generator(monkeypatch) -> GeminiBlogGenerator:
+    async def no_image_checks(featured_image, images, user_idea):
+        return featured_image, images
+    
+    monkeypatch.setattr(ai_service, "GEMINI_USE_REST", False)
+    monkeypatch.setattr(ai_service, "validate_and_fix_images", no_image_checks)
+    # Pacing is not under test; a zero rate disables it
+    monkeypatch.setitem(ai_service.provider_rate_limits, "gemini", TokenBucket(0, 1))
+    
+    generator = GeminiBlogGenerator()
+    generator.available = True
+    generator.google_api_key = "test-key"
+    generator.model = SlowAsyncModel()
+    return generator
+
+
+def test_probe_detects_blocking_calls():
+    async def blocking():
+        time.sleep(0.3)
+    
+    _, lag = asyncio.run(max_loop_lag(blocking()))
+    assert lag >= 0.25
+
+
+def test_generation_does_not_block_event_loop(monkeypatch):
+    generator = make_generator(monkeypatch)
+    
+    result, lag = asyncio.run(max_loop_lag(generator.generate_blog_post("docker deploys")))
+    
+    assert result["success"], result
+    assert result["title"] == "Docker in five minutes"
+    assert generator.model.calls == 1
+    assert lag < MAX_LAG_SECONDS, f"event loop stalled for {lag * 1000:.0f} ms"
+
+
+def test_concurrent_generations_overlap(monkeypatch):
+    generator = make_generator(monkeypatch)
+    
+    async def two_generations():
+        started = time.monotonic()
+        results = await asyncio.gather(
+            generator.generate_blog_post("docker deploys"),
+            generator.generate_blog_post("python async"),
+        )
+        return results, time.monotonic() - started
+    
+    (results, elapsed), lag = asyncio.run(max_loop_lag(two_generations()))
+    
+    assert all(result["success"] for result in results)
+    assert elapsed < 2 * MODEL_SECONDS  # Served side by side, not one after the other
+    assert lag < MAX_LAG_SECONDS
@@ -0,0 +1,36 @@
+"""The /api/home bundle is built once per content change"""
+import asyncio
+
+from app.services import home
+from app.services.home import HomeBundleCache
+from app.services.portfolio_cache import portfolio_cache
+
+
+def test_bundle_is_reused_until_invalidated(monkeypatch):
+    builds = []
+    
+    async def fake_build():
+        builds.append(1)
+        await asyncio.sleep(0.01)
+        return b'{"n":%d}' % len(builds)
+    
+    monkeypatch.setattr(home, "build_home_bundle", fake_build)
+    cache = HomeBundleCache()
+    
+    async def scenario():
+        first = await asyncio.gather(*(cache.get() for _ in range(5)))
+        again = await cache.get()
+        cache.invalidate()
+        after_post_write = await cache.get()
+        monkeypatch.setattr(portfolio_cache, "version", (portfolio_cache.version or 0) + 1)
+        after_portfolio_write = await cache.get()
+        return first, again, after_post_write, after_portfolio_write
+    
+    first, again, after_post_write, after_portfolio_write = asyncio.run(scenario())
+    
+    assert {body for body, _ in first} == {b'{"n":1}'}  # Concurrent misses share one build
+    assert again == first[0]
+    assert after_post_write[0] == b'{"n":2}'
+    assert after_portfolio_write[0] == b'{"n":3}'
+    assert after_portfolio_write[1] != after_post_write[1]  # New ETag
+    assert len(builds) == 3
@@ -0,0 +1,23 @@
+"""Failed jobs are retried after a backoff, not immediately"""
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.services.job_queue import JobQueue
+
+
+def test_retry_is_scheduled_with_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "AI_JOB_RETRY_BASE_SECONDS", 10.0)
+    monkeypatch.setattr(settings, "AI_JOB_RETRY_MAX_SECONDS", 300.0)
+    before = datetime.utcnow()
+    
+    update = JobQueue._failure_update({"attempts": 3}, retry=True, error="upstream 503")
+    
+    assert update["status"] == "queued"
+    assert update["error"] == "upstream 503"
+    assert before <= update["next_attempt_at"] <= datetime.utcnow() + timedelta(seconds=40)
+
+
+def test_final_failure_is_not_rescheduled():
+    update = JobQueue._failure_update({"attempts": 2}, retry=False, error="bad request")
+    
+    assert update == {"status": "failed", "error": "bad request"}
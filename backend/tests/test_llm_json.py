@@ -0,0 +1,59 @@
+"""Success rate of extract_json_object over the benchmark corpus"""
+import json
+
+import pytest
+
+from app.utils.llm_json import extract_json_object
+from benchmarks.bench_json_extract import build_corpus, legacy_extract, new_extract, run
+
+CORPUS = build_corpus()
+
+
+def _rates(stats: dict) -> dict:
+    return {kind: entry["ok"] / entry["total"] for kind, entry in stats.items()}
+
+
+def test_corpus_covers_every_kind():
+    kinds = {kind for kind, _ in CORPUS}
+    assert kinds == {"clean", "fenced", "preface", "raw_newlines", "truncated", "truncated_fenced", "large"}
+
+
+def test_every_sample_parses_with_required_fields():
+    stats = run(new_extract, CORPUS, repeat=1)
+    
+    assert sum(entry["total"] for entry in stats.values()) == len(CORPUS)
+    assert _rates(stats) == {kind: 1.0 for kind in stats}
+
+
+def test_accounting_records_failures():
+    # The old regex chain cannot recover these kinds - they must show up as failures
+    stats = run(legacy_extract, CORPUS, repeat=1)
+    rates = _rates(stats)
+    
+    assert rates["clean"] == 1.0
+    for kind in ("preface", "raw_newlines", "truncated", "truncated_fenced"):
+        assert stats[kind]["ok"] == 0 and stats[kind]["total"] > 0, kind
+
+
+@pytest.mark.parametrize("kind", ["clean", "fenced", "preface", "raw_newlines", "large"])
+def test_complete_output_is_not_marked_repaired(kind):
+    for sample_kind, text in CORPUS:
+        if sample_kind == kind:
+            _, repaired = extract_json_object(text)
+            assert not repaired
+
+
+def test_truncated_output_keeps_written_fields():
+    doc = {"title": "T", "excerpt": "E", "content": "Some \"quoted\" text that goes on"}
+    text = json.dumps(doc)
+    
+    data, repaired = extract_json_object(text[:-10])
+    
+    assert repaired
+    assert data["title"] == "T" and data["excerpt"] == "E"
+    assert doc["content"].startswith(data["content"])
+
+
+def test_output_without_object_is_rejected():
+    with pytest.raises(ValueError):
+        extract_json_object("Sorry, I can't help with that.")
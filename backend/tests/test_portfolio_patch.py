@@ -0,0 +1,74 @@
+"""PATCH bodies must never leave the stored portfolio unreadable"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.routes import portfolio as portfolio_routes
+from app.schemas.portfolio import ExperiencePatch, ExperienceResponse, ProjectPatch, SkillCategoryPatch
+
+EXPERIENCE = {
+    "id": "exp1",
+    "company": "Acme",
+    "role": "Engineer",
+    "type": "Full-time",
+    "duration": "2022 - now",
+    "location": "Remote",
+    "description": "Built things",
+    "achievements": ["Shipped"],
+    "technologies": ["Python"],
+}
+
+
+class FakePortfolioCollection:
+    def __init__(self, document):
+        self.document = document
+        self.updates = []
+    
+    async def find_one(self, query, projection=None):
+        section, _ = next(iter(query)).split(".")
+        items = [item for item in self.document[section] if item["id"] == query[f"{section}.id"]]
+        return {"_id": self.document["_id"], section: items} if items else None
+    
+    async def find_one_and_update(self, query, update, return_document=None):
+        self.updates.append(update)
+        return None
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = FakePortfolioCollection({"_id": "p1", "experience": [dict(EXPERIENCE)]})
+    monkeypatch.setattr(portfolio_routes, "get_database", lambda: {portfolio_routes.PORTFOLIO_COLLECTION: collection})
+    return collection
+
+
+@pytest.mark.parametrize("model, field", [
+    (ExperiencePatch, "company"),
+    (ProjectPatch, "title"),
+    (SkillCategoryPatch, "skills"),
+])
+def test_explicit_null_is_rejected(model, field):
+    with pytest.raises(ValidationError):
+        model(**{field: None})
+
+
+def test_omitted_fields_are_not_sent():
+    assert ExperiencePatch(role="Lead").model_dump(exclude_unset=True) == {"role": "Lead"}
+    assert ProjectPatch(demo_url=None).model_dump(exclude_unset=True) == {"demo_url": None}
+
+
+def test_invalid_merged_item_is_rejected_before_writing(collection):
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(portfolio_routes._patch_item("experience", "exp1", {"achievements": "Shipped"}, ExperienceResponse))
+    
+    assert raised.value.status_code == 422
+    assert collection.updates == []
+
+
+def test_unknown_item_is_404(collection):
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(portfolio_routes._patch_item("experience", "missing", {"role": "Lead"}, ExperienceResponse))
+    
+    assert raised.value.status_code == 404
+    assert collection.updates == []
@@ -0,0 +1,69 @@
+"""A failed section is retried on its own instead of failing the post"""
+import asyncio
+import json
+
+from app.services import sectioned_generation
+from app.services.sectioned_generation import generate_sectioned
+from app.utils.resilience import start_retry_budget
+
+OUTLINE = json.dumps({
+    "title": "Caching, honestly",
+    "excerpt": "What I got wrong about caches.",
+    "tags": "cache, python",
+    "category": "Backend",
+    "featured_image": "",
+    "sections": [{"heading": "Intro"}, {"heading": "The bug"}, {"heading": "Wrap-up"}],
+})
+
+
+class FlakyModel:
+    """Outline first; the section about `flaky_heading` fails `failures` times"""
+    
+    def __init__(self, flaky_heading: str, failures: int):
+        self.flaky_heading = flaky_heading
+        self.failures = failures
+        self.section_calls = 0
+    
+    async def complete(self, prompt, json_output=False, max_tokens=2000):
+        if json_output:
+            return OUTLINE
+        self.section_calls += 1
+        if f'"{self.flaky_heading}"' in prompt and self.failures:
+            self.failures -= 1
+            raise ValueError("No response from AI")
+        return "Body text."
+
+
+def _run(model: FlakyModel, monkeypatch) -> dict:
+    async def no_image_checks(featured_image, images, user_idea):
+        return featured_image, images
+    
+    monkeypatch.setattr(sectioned_generation, "validate_and_fix_images", no_image_checks)
+    monkeypatch.setattr(sectioned_generation, "backoff_delay", lambda attempt: 0)
+    
+    async def request():
+        start_retry_budget()
+        return await generate_sectioned("caching", model.complete)
+    
+    return asyncio.run(request())
+
+
+def test_section_that_fails_once_is_retried(monkeypatch):
+    model = FlakyModel("The bug", failures=1)
+    
+    result = _run(model, monkeypatch)
+    
+    assert result["success"], result
+    assert result["sections"] == 3
+    assert "## The bug\n\nBody text." in result["content"]
+    assert model.section_calls == 4  # Three sections plus one retry
+
+
+def test_section_retries_stop_when_budget_is_spent(monkeypatch):
+    model = FlakyModel("The bug", failures=10)
+    
+    result = _run(model, monkeypatch)
+    
+    assert not result["success"]
+    assert result["status_code"] == 502
+    assert "The bug" in result["error"]
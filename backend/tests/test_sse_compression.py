@@ -0,0 +1,65 @@
+"""Server-Sent Events pass through the compression middleware untouched"""
+import asyncio
+
+from fastapi.responses import Response
+
+from app.middleware.compression import CompressionMiddleware
+from app.routes.ai_blog import _sse_response
+from app.utils.llm_json import sse_event
+
+EVENTS = [sse_event("chunk", {"text": "x" * 2000}), sse_event("done")]
+
+
+async def _events():
+    for event in EVENTS:
+        yield event
+
+
+def _call(app, headers):
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/ai/generate/stream",
+        "query_string": b"",
+        "headers": headers,
+    }
+    sent = []
+    
+    async def receive():
+        return {"type": "http.disconnect"}
+    
+    async def send(message):
+        sent.append(message)
+    
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def test_sse_response_does_not_claim_an_encoding():
+    response = _sse_response(_events())
+    
+    assert response.media_type == "text/event-stream"
+    assert "content-encoding" not in response.headers
+
+
+def test_sse_stream_bypasses_compression():
+    sent = _call(CompressionMiddleware(_sse_response(_events())), [(b"accept-encoding", b"gzip, br")])
+    
+    start = sent[0]
+    header_names = {name.lower() for name, _ in start["headers"]}
+    assert b"content-encoding" not in header_names
+    
+    bodies = [message["body"] for message in sent[1:] if message.get("body")]
+    assert bodies == [event.encode() for event in EVENTS]  # Forwarded event by event, uncompressed
+
+
+def test_event_stream_content_type_alone_skips_compression():
+    # One complete body would normally be compressed; the content type must prevent it
+    body = "".join(EVENTS)
+    sent = _call(
+        CompressionMiddleware(Response(body, media_type="text/event-stream")),
+        [(b"accept-encoding", b"gzip")]
+    )
+    
+    assert b"content-encoding" not in {name.lower() for name, _ in sent[0]["headers"]}
+    assert sent[1]["body"] == body.encode()